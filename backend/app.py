@@ -1,11 +1,11 @@
 from flask_cors import CORS
 from flask import Flask, jsonify
-import os, sqlite3, warnings
+import os, sqlite3, warnings, threading
 from routes import register_routes
 from sockets import register_sockets
-import config, db
+import config, db, disk
 from flask_socketio import SocketIO
-from services import Downloader
+from services import Downloader, Resolver, YtDlpClient
 
 def create_app(db_conn: sqlite3.Connection | None = None) -> tuple[Flask, SocketIO]:
   """Sets up and creates the application and returns it.
@@ -52,6 +52,10 @@ def create_app(db_conn: sqlite3.Connection | None = None) -> tuple[Flask, Socket
 
 if __name__ == "__main__":
   app, socketio = create_app()
+  # warmed in the background so the server isn't held up, anything that runs before it's done builds its own instances
+  threading.Thread(target=YtDlpClient.warm_up, daemon=True).start()
+  disk.AlbumCoverIndex.instance().build()
   Downloader.resume_loop()
   Downloader.start(True)
+  Resolver.start()
   socketio.run(app, host="127.0.0.1", port=8888, allow_unsafe_werkzeug=True, debug=False, use_reloader=False)
\ No newline at end of file
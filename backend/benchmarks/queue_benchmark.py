@@ -0,0 +1,111 @@
+"""Benchmarks enqueuing downloads through `Downloader.queue` against the previous row-by-row path.
+
+Usage (from the backend directory):
+  python benchmarks/queue_benchmark.py [track_count ...]
+"""
+
+import os, sys, tempfile, time
+
+os.environ.setdefault("APP_ENV", "development")
+os.environ.setdefault("APP_NAME", "Sharktooth")
+os.environ["USER_DATA_DIR"] = tempfile.mkdtemp()
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import db
+from services import Downloader
+from sockets import DownloadsSocket
+from user_types import NewDownload, TrackArtistNames, TrackCodec, TrackBitrate
+
+class StubSocket:
+  """Stands in for the downloads socket, counting emitted events instead of sending them.
+  """
+
+  def __init__(self):
+    self.emits = 0
+
+  def send_download_update(self, update):
+    self.emits += 1
+
+  def send_downloads_added(self, downloads):
+    self.emits += 1
+
+# END class StubSocket
+
+
+def make_tracks(count: int) -> list[NewDownload]:
+  tracks = []
+
+  for i in range(count):
+    track = NewDownload()
+    track.artist_names = TrackArtistNames(["Queen", "David Bowie", "Freddie Mercury"])
+    track.track_name = f"Track {i}"
+    track.album_name = "Album"
+    track.codec = TrackCodec.MP3
+    track.bitrate = TrackBitrate._192
+    track.track_number = i % 20 + 1
+    track.disc_number = 1
+    track.release_date = None
+    track.url = f"https://www.youtube.com/watch?v={i}"
+    track.download_dir = "/tmp/music"
+    track.album_cover_path = None
+    track.genre = None
+    track.album_artist = None
+    track.filename = f"track_{i}"
+    tracks.append(track)
+
+  return tracks
+# END make_tracks
+
+
+def row_by_row_queue(tracks: list[NewDownload], socket: StubSocket):
+  """The enqueue path before batching: one commit per row and one socket event per track.
+  """
+
+  conn = db.connect()
+
+  for track in tracks:
+    artist_ids = [db.models.Artist(conn).upsert_many([n])[0] for n in track.artist_names.get_other_artists()]
+    metadata_id = db.models.Metadata(conn).insert({
+      "track_name": track.track_name,
+      "main_artist": track.artist_names.get_main_artist(),
+      "album_name": track.album_name
+    })
+
+    for artist_id in artist_ids:
+      db.models.MetadataArtist(conn).insert({ "metadata_id": metadata_id, "artist_id": artist_id })
+
+    db.models.Download(conn).insert_as_queued({
+      "url": track.url,
+      "codec": track.codec.value,
+      "bitrate": track.bitrate.value,
+      "metadata_id": metadata_id,
+      "download_dir": track.download_dir,
+      "filename": track.filename
+    })
+    socket.send_download_update(None)
+
+  conn.close()
+# END row_by_row_queue
+
+
+def run(label: str, queue_fn, count: int):
+  socket = StubSocket()
+  DownloadsSocket._instance = socket
+  tracks = make_tracks(count)
+
+  start = time.perf_counter()
+  queue_fn(tracks, socket)
+  elapsed = time.perf_counter() - start
+
+  print(f"{label:<12} {count:>6} tracks  {elapsed:8.3f}s  {elapsed / count * 1000 * 1000:8.1f}ms per 1k  {socket.emits:>6} emits")
+# END run
+
+
+if __name__ == "__main__":
+  counts = [int(c) for c in sys.argv[1:]] or [1000, 2000]
+  db.setup(db.get_connection())
+
+  for count in counts:
+    run("row-by-row", row_by_row_queue, count)
+    run("batched", lambda tracks, _: Downloader.queue(tracks), count)
@@ -0,0 +1,77 @@
+"""Benchmarks the YoutubeDL setup cost of a search or download with a fresh instance per call against pooled, warmed up instances.
+
+Only the work done before yt-dlp touches the network is measured (building the instance and finding and initializing the extractor for the URL), so no network access is needed.
+
+Usage (from the backend directory):
+  python benchmarks/ydl_benchmark.py [call_count ...]
+"""
+
+import os, sys, tempfile, time
+
+os.environ.setdefault("APP_ENV", "development")
+os.environ.setdefault("APP_NAME", "Sharktooth")
+os.environ["USER_DATA_DIR"] = tempfile.mkdtemp()
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import yt_dlp
+from yt_dlp.extractor import gen_extractor_classes
+from services import YtDlpClient
+
+SEARCH_URL = "ytsearch5:Queen Radio Ga Ga"
+# matched once up front, the pattern matching costs the same with either kind of instance
+SEARCH_IE_KEY = next(ie.ie_key() for ie in gen_extractor_classes() if ie.suitable(SEARCH_URL))
+
+
+def prepare_extractor(ydl: yt_dlp.YoutubeDL):
+  """Gets and initializes the extractor for the search URL, the way `extract_info` does before extracting.
+  """
+
+  ydl.get_info_extractor(SEARCH_IE_KEY).initialize()
+# END prepare_extractor
+
+
+def fresh_call():
+  """The path before pooling: a new instance per call, closed afterwards.
+  """
+
+  with yt_dlp.YoutubeDL(YtDlpClient.YDL_OPTS["search"]) as ydl:
+    prepare_extractor(ydl)
+# END fresh_call
+
+
+def pooled_call():
+  with YtDlpClient._acquire_ydl("search") as ydl:
+    prepare_extractor(ydl)
+# END pooled_call
+
+
+def run(label: str, call_fn, count: int):
+  start = time.perf_counter()
+  call_fn()
+  first = time.perf_counter() - start
+
+  start = time.perf_counter()
+
+  for _ in range(count - 1):
+    call_fn()
+
+  rest = (time.perf_counter() - start) / max(count - 1, 1)
+
+  print(f"{label:<8} {count:>5} calls  first {first * 1000:8.1f}ms  then {rest * 1000:8.1f}ms per call")
+# END run
+
+
+if __name__ == "__main__":
+  counts = [int(c) for c in sys.argv[1:]] or [20]
+
+  for count in counts:
+    # the first fresh call also pays for importing the extractor modules, which is process-wide
+    run("fresh", fresh_call, count)
+
+    start = time.perf_counter()
+    YtDlpClient._ydl_pools = {}
+    YtDlpClient.warm_up()
+    print(f"warm-up  {(time.perf_counter() - start) * 1000:8.1f}ms")
+
+    run("pooled", pooled_call, count)
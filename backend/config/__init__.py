@@ -1 +1,7 @@
-from .cors import CORS_ALLOWED_ORIGINS
\ No newline at end of file
+from .cors import CORS_ALLOWED_ORIGINS
+from .downloader import DOWNLOAD_WORKER_COUNT, TRANSCODE_WORKER_COUNT, TAGGING_WORKER_COUNT
+from .search_cache import SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL, SEARCH_CACHE_PERSIST_DELAY
+from .search import SEARCH_WORKER_COUNT
+from .cover_cache import COVER_CACHE_MAX_BYTES, COVER_CACHE_MAX_ENTRIES
+from .cover import COVER_NORMALIZE_MIN_BYTES, COVER_MAX_DIMENSION, COVER_PREFETCH_WORKER_COUNT
+from .spotify import SPOTIFY_PAGE_CONCURRENCY
\ No newline at end of file
@@ -0,0 +1,10 @@
+import os
+
+# covers larger than this many bytes are converted to a size-capped JPEG once before being embedded in tracks
+COVER_NORMALIZE_MIN_BYTES = max(0, int(os.getenv("COVER_NORMALIZE_MIN_BYTES") or 300 * 1024))
+
+# the maximum width and height in pixels of converted covers
+COVER_MAX_DIMENSION = max(1, int(os.getenv("COVER_MAX_DIMENSION") or 1000))
+
+# the number of album covers downloaded concurrently by the cover prefetcher, downloads are network-bound
+COVER_PREFETCH_WORKER_COUNT = max(1, int(os.getenv("COVER_PREFETCH_WORKER_COUNT") or 4))
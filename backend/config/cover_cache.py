@@ -0,0 +1,7 @@
+import os
+
+# the maximum total size in bytes of the album covers kept in memory for tagging, 0 disables the cache
+COVER_CACHE_MAX_BYTES = max(0, int(os.getenv("COVER_CACHE_MAX_BYTES") or 64 * 1024 * 1024))
+
+# the maximum number of album covers kept in memory for tagging
+COVER_CACHE_MAX_ENTRIES = max(0, int(os.getenv("COVER_CACHE_MAX_ENTRIES") or 128))
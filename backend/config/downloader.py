@@ -0,0 +1,10 @@
+import os
+
+# the number of download worker threads the downloader runs concurrently
+DOWNLOAD_WORKER_COUNT = max(1, int(os.getenv("DOWNLOAD_WORKER_COUNT") or 3))
+
+# the number of downloads that are transcoded concurrently, ffmpeg is CPU-bound so this defaults to the core count
+TRANSCODE_WORKER_COUNT = max(1, int(os.getenv("TRANSCODE_WORKER_COUNT") or os.cpu_count() or 1))
+
+# the number of downloads that have their metadata set concurrently, tagging may rewrite whole files so it is mostly disk-bound
+TAGGING_WORKER_COUNT = max(1, int(os.getenv("TAGGING_WORKER_COUNT") or 2))
\ No newline at end of file
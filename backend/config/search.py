@@ -0,0 +1,4 @@
+import os
+
+# the number of YouTube searches run concurrently for batch searches, searches are network-bound
+SEARCH_WORKER_COUNT = max(1, int(os.getenv("SEARCH_WORKER_COUNT") or 4))
@@ -0,0 +1,10 @@
+import os
+
+# the number of distinct searches whose results are kept, 0 disables the cache
+SEARCH_CACHE_SIZE = max(0, int(os.getenv("SEARCH_CACHE_SIZE") or 256))
+
+# how long search results are reused for in seconds, YouTube results change slowly so this defaults to a day
+SEARCH_CACHE_TTL = max(0, int(os.getenv("SEARCH_CACHE_TTL") or 24 * 60 * 60))
+
+# how long in seconds after a search is cached the cache is written to disk, searches cached meanwhile are written together
+SEARCH_CACHE_PERSIST_DELAY = max(0, float(os.getenv("SEARCH_CACHE_PERSIST_DELAY") or 5))
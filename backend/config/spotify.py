@@ -0,0 +1,4 @@
+import os
+
+# the number of pages of a Spotify playlist or library fetched concurrently
+SPOTIFY_PAGE_CONCURRENCY = max(1, int(os.getenv("SPOTIFY_PAGE_CONCURRENCY") or 8))
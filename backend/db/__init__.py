@@ -1,3 +1,3 @@
-from .connect import connect, PATH
+from .connect import connect, get_connection, Connection, PATH
 from .setup import setup
 from . import models
\ No newline at end of file
@@ -1,19 +1,189 @@
-import sqlite3, os
+import sqlite3, os, threading
+from contextlib import contextmanager
+from typing import Generator, Self, Callable
 
 PATH = os.path.join(os.getenv("USER_DATA_DIR"), "db.sqlite")
 
-def connect(path: str = PATH) -> sqlite3.Connection:
-  """Establishes a connection to the application's SQLite database.
+# pragmas stored in the database file, so they're applied once per database rather than on every connection; WAL lets the socket's readers run alongside the downloader's writers
+DATABASE_PRAGMAS = {
+  "journal_mode": "WAL"
+}
+
+# pragmas that only last as long as the connection, applied to every connection
+PRAGMAS = {
+  "synchronous": "NORMAL",
+  "busy_timeout": 5000,
+  "cache_size": -16000, # negative means KiB, so 16 MiB
+  "mmap_size": 128 * 1024 * 1024,
+  "temp_store": "MEMORY"
+}
+
+_local = threading.local()
+
+# the databases the database pragmas have been applied to
+_configured_paths: set[str] = set()
+_configured_paths_lock = threading.Lock()
+
+
+class Connection(sqlite3.Connection):
+  """A SQLite connection to the application's database that supports explicit transactions.
+
+  Attributes:
+    path (str | None): The absolute path of the database file, None for an in-memory database.
+    _transaction_depth (int): The number of `transaction` contexts currently entered on the connection.
+    _after_commit (list[Callable[[], None]]): The callbacks to run once the outermost `transaction` context commits.
+  """
+
+  path: str | None = None
+  _transaction_depth: int = 0
+  _after_commit: list[Callable[[], None]]
+
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self._after_commit = []
+  # END __init__
+
+
+  @contextmanager
+  def transaction(self) -> Generator[Self, None, None]:
+    """Context manager that runs everything inside it in a single transaction, committing on exit or rolling back on an exception.
+
+    Calls to `commit` inside the context are deferred to the end of the outermost transaction, so model methods that commit after each statement can be batched. Transactions may be nested.
+
+    Returns:
+      Generator[Self, None, None]: Yields the connection.
+    """
+
+    is_outermost = self._transaction_depth == 0
+
+    if is_outermost and not self.in_transaction:
+      self.execute("BEGIN IMMEDIATE")
+
+    self._transaction_depth += 1
+
+    try:
+      yield self
+    except BaseException:
+      self._transaction_depth -= 1
+
+      if is_outermost:
+        self._after_commit.clear()
+        self.rollback()
+
+      raise
+
+    self._transaction_depth -= 1
+
+    if is_outermost:
+      try:
+        self.commit()
+      except BaseException:
+        self._after_commit.clear()
+        raise
+
+      callbacks, self._after_commit = self._after_commit, []
+
+      for callback in callbacks:
+        callback()
+  # END transaction
+
+
+  def call_after_commit(self, callback: Callable[[], None]):
+    """Runs a callback once the changes made so far are committed, e.g to update an in-memory cache only with rows that can't be rolled back.
+
+    The callback is dropped if the transaction is rolled back, and runs straight away outside a `transaction` context.
+
+    Args:
+      callback (Callable[[], None]): The callback.
+    """
+
+    if self._transaction_depth == 0:
+      callback()
+      return
+
+    self._after_commit.append(callback)
+  # END call_after_commit
+
+
+  def commit(self):
+    """Commits the current transaction unless inside a `transaction` context, in which case the outermost context commits.
+    """
+
+    if self._transaction_depth > 0:
+      return
+
+    super().commit()
+  # END commit
+
+# END class Connection
+
+
+class _ThreadConnections(dict[str, Connection]):
+  """The pooled connections of a thread by database path, closed when the thread exits and its thread-local data is released.
+  """
+
+  def __del__(self):
+    for conn in self.values():
+      try:
+        conn.close()
+      except sqlite3.Error:
+        pass
+  # END __del__
+
+# END class _ThreadConnections
+
+
+def connect(path: str = PATH) -> Connection:
+  """Establishes a new connection to the application's SQLite database.
 
   Args:
     path (str): The path to the databse file.
 
   Returns:
-    sqlite3.Connection: The database connection.
+    Connection: The database connection.
   """
-  
-  conn = sqlite3.connect(path)
+
+  conn = sqlite3.connect(path, factory=Connection)
   conn.row_factory = sqlite3.Row
-  
+  conn.path = None if path == ":memory:" else os.path.abspath(path)
+
+  with _configured_paths_lock:
+    if path not in _configured_paths:
+      for pragma, value in DATABASE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+
+      # in-memory databases are private to their connection so each one needs them
+      if path != ":memory:":
+        _configured_paths.add(path)
+
+  for pragma, value in PRAGMAS.items():
+    conn.execute(f"PRAGMA {pragma} = {value}")
+
   return conn
-# END connect
\ No newline at end of file
+# END connect
+
+
+def get_connection(path: str = PATH) -> Connection:
+  """Gets the calling thread's pooled connection to the application's SQLite database, establishing it on first use.
+
+  Pooled connections are owned by the pool and should not be closed by callers, they're closed when their thread exits.
+
+  Args:
+    path (str): The path to the databse file.
+
+  Returns:
+    Connection: The database connection.
+  """
+
+  conns: _ThreadConnections | None = getattr(_local, "conns", None)
+
+  if conns is None:
+    conns = _ThreadConnections()
+    _local.conns = conns
+
+  if path not in conns:
+    conns[path] = connect(path)
+
+  return conns[path]
+# END get_connection
@@ -5,18 +5,18 @@ class Model:
   """A base model class representing a database model/table.
 
   Attributes:
-    _conn (sqlite3.Connection): A connection to the application database.
+    _conn (db.Connection): A connection to the application database.
     _cur (sqlite3.Cursor): The connection's cursor.
     TABLE (str): The name of the model's table in the database. Should be set by subclasses.
   """
 
-  _conn: sqlite3.Connection
+  _conn: "db.Connection"
   _cur: sqlite3.Cursor
   TABLE: str
 
 
-  def __init__(self, conn: sqlite3.Connection | None):
-    self._conn = conn if conn is not None else db.connect()
+  def __init__(self, conn: "db.Connection | None"):
+    self._conn = conn if conn is not None else db.get_connection()
     self._cur = self._conn.cursor()
   # END __init__
     
@@ -44,4 +44,37 @@ class Model:
     return self._cur.lastrowid
   # END insert
 
+
+  def insert_many(self, data: list[dict]) -> list[int]:
+    """Inserts several rows into the model's table with a single `executemany` in one transaction.
+
+    The rows are given consecutive IDs after the current highest one, which holds since the transaction keeps the write lock for the duration of the insert.
+
+    Args:
+      data (list[dict]): A list of dicts (key-value pairs) representing the column names and values to insert for them; all dicts should have the same keys.
+
+    Returns:
+      list[int]: The IDs of the rows that were inserted, in the same order as the data.
+    """
+
+    if not data:
+      return []
+
+    keys = list(data[0].keys())
+    fields = ", ".join(keys)
+    placeholders = ", ".join("?" * len(keys))
+    params = [tuple(d[k] for k in keys) for d in data]
+
+    with self._conn.transaction():
+      self._cur.execute(f"SELECT COALESCE(MAX(rowid), 0) AS max_id FROM {self.TABLE}")
+      first_id = self._cur.fetchone()["max_id"] + 1
+
+      self._cur.executemany(
+        f"INSERT INTO {self.TABLE} ({fields}) VALUES ({placeholders})",
+        params
+      )
+
+    return list(range(first_id, first_id + len(data)))
+  # END insert_many
+
 # END class Model
\ No newline at end of file
@@ -1,4 +1,5 @@
 from .artist import Artist
 from .metadata import Metadata
 from .metadata_artist import MetadataArtist
-from .download import Download
\ No newline at end of file
+from .download import Download
+from .output import Output
\ No newline at end of file
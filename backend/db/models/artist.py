@@ -1,11 +1,27 @@
-import sqlite3
+import sqlite3, threading
+from collections import OrderedDict
 from ..model import Model
 
 class Artist(Model):
   """A database model representing the artists table.
+
+  Artist names are unique so a row is shared by every download that features the artist. The IDs of recently upserted names are kept in a bounded in-memory cache per database file, which is invalidated when artists are deleted.
+
+  Attributes:
+    CHUNK_SIZE (int): The maximum number of names looked up per query, keeps queries under SQLite's variable limit.
+    ID_CACHE_SIZE (int): The maximum number of artist IDs cached.
+    _id_cache (OrderedDict[tuple[str, str], int]): The cached artist IDs by database path and name, least recently used first.
+    _id_cache_version (int): Incremented whenever cached IDs are invalidated, so that IDs looked up before can't be cached after.
+    _id_cache_lock (threading.Lock): Guards the cache.
   """
   
   TABLE = "artists"
+  CHUNK_SIZE = 500
+  ID_CACHE_SIZE = 10_000
+
+  _id_cache: OrderedDict[tuple[str, str], int] = OrderedDict()
+  _id_cache_version: int = 0
+  _id_cache_lock: threading.Lock = threading.Lock()
 
 
   def __init__(self, conn: sqlite3.Connection | None = None):
@@ -13,24 +29,149 @@ class Artist(Model):
   # END __init__
 
 
-  def insert_many(self, data: list[dict]) -> list[int]:
-    """Inserts several rows into the table.
+  def upsert_many(self, names: list[str]) -> list[int]:
+    """Inserts any artist names that don't exist yet and gets the IDs of all the names, serving names from the cache where possible.
 
     Args:
-      data (list[dict]): A list of dicts (key-value pairs) representing the column names and values to insert for them.
+      names (list[str]): The artist names, may contain duplicates.
 
     Returns:
-      list[int]: A list of the integer IDs of the rows that were inserted.
+      list[int]: The artist IDs, in the same order as the names.
     """
-    
-    ids: list[int] = []
-    
-    for d in data:
-      id = self.insert(d)
-      ids.append(id)
 
-    return ids
-  # END insert_many
+    unique_names = list(dict.fromkeys(names))
+
+    if not unique_names:
+      return []
+
+    with self._conn.transaction():
+      # looked up inside the transaction so that artists deleted by another connection are invalidated first
+      version, ids_by_name = self._get_cached_ids(unique_names)
+      missing_names = [name for name in unique_names if name not in ids_by_name]
+      fetched_ids: dict[str, int] = {}
+
+      self._cur.executemany(
+        f"INSERT INTO {self.TABLE} (name) VALUES (?) ON CONFLICT (name) DO NOTHING",
+        [(name,) for name in missing_names]
+      )
+
+      for i in range(0, len(missing_names), self.CHUNK_SIZE):
+        chunk = missing_names[i:i + self.CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+
+        self._cur.execute(f"SELECT id, name FROM {self.TABLE} WHERE name IN ({placeholders})", tuple(chunk))
+        fetched_ids.update({ row["name"]: row["id"] for row in self._cur.fetchall() })
+
+      ids_by_name.update(fetched_ids)
+
+      # new rows are only cached once they can't be rolled back
+      if fetched_ids:
+        self._conn.call_after_commit(lambda: self._cache_ids(fetched_ids, version))
+
+    return [ids_by_name[name] for name in names]
+  # END upsert_many
+
+
+  def _get_cached_ids(self, names: list[str]) -> tuple[int, dict[str, int]]:
+    """Gets the cached IDs of artist names in this connection's database.
+
+    Args:
+      names (list[str]): The artist names.
+
+    Returns:
+      tuple[int, dict[str, int]]: The version of the cache and the IDs of the names that were cached.
+    """
+
+    cls = type(self)
+    path = self._conn.path
+    ids_by_name = {}
+
+    with cls._id_cache_lock:
+      if path is not None:
+        for name in names:
+          artist_id = cls._id_cache.get((path, name))
+
+          if artist_id is not None:
+            cls._id_cache.move_to_end((path, name))
+            ids_by_name[name] = artist_id
+
+      return cls._id_cache_version, ids_by_name
+  # END _get_cached_ids
+
+
+  def _cache_ids(self, ids_by_name: dict[str, int], version: int):
+    """Caches the IDs of artist names in this connection's database, evicting the least recently used if full.
+
+    Args:
+      ids_by_name (dict[str, int]): The IDs by artist name.
+      version (int): The version of the cache when the IDs were looked up, nothing is cached if IDs were invalidated since.
+    """
+
+    cls = type(self)
+    path = self._conn.path
+
+    if path is None:
+      return
+
+    with cls._id_cache_lock:
+      if version != cls._id_cache_version:
+        return
+
+      for name, artist_id in ids_by_name.items():
+        cls._id_cache[(path, name)] = artist_id
+        cls._id_cache.move_to_end((path, name))
+
+      while len(cls._id_cache) > cls.ID_CACHE_SIZE:
+        cls._id_cache.popitem(last=False)
+  # END _cache_ids
+
+
+  def _invalidate_cached_ids(self, names: list[str]):
+    """Drops artist names in this connection's database from the cache.
+
+    Args:
+      names (list[str]): The names of the deleted artists.
+    """
+
+    cls = type(self)
+    path = self._conn.path
+
+    with cls._id_cache_lock:
+      cls._id_cache_version += 1
+
+      for name in names:
+        cls._id_cache.pop((path, name), None)
+  # END _invalidate_cached_ids
+
+
+  def delete_unreferenced(self, ids: list[int]) -> int:
+    """Deletes the given artists that are no longer referenced by any metadata.
+
+    Args:
+      ids (list[int]): The IDs of the artists/rows to delete if unreferenced.
+
+    Returns:
+      int: The number of artists/rows deleted.
+    """
+
+    from .metadata_artist import MetadataArtist
+
+    placeholders = ", ".join("?" * len(ids))
+    sql = f"""
+DELETE FROM {self.TABLE}
+WHERE id IN ({placeholders})
+  AND NOT EXISTS (SELECT 1 FROM {MetadataArtist.TABLE} ma WHERE ma.artist_id = {self.TABLE}.id)
+RETURNING name
+"""
+    params = tuple(ids)
+
+    self._cur.execute(sql, params)
+    deleted_names = [row["name"] for row in self._cur.fetchall()]
+    self._invalidate_cached_ids(deleted_names)
+    self._conn.commit()
+
+    return len(deleted_names)
+  # END delete_unreferenced
 
 
   def delete_many(self, ids: list[int]) -> int:
@@ -44,13 +185,15 @@ class Artist(Model):
     """
     
     placeholders = ", ".join("?" * len(ids))
-    sql = f"DELETE FROM {self.TABLE} WHERE id IN ({placeholders})"
+    sql = f"DELETE FROM {self.TABLE} WHERE id IN ({placeholders}) RETURNING name"
     params = tuple(ids)
     
     self._cur.execute(sql, params)
+    deleted_names = [row["name"] for row in self._cur.fetchall()]
+    self._invalidate_cached_ids(deleted_names)
     self._conn.commit()
 
-    return self._cur.rowcount
+    return len(deleted_names)
   # END delete_many
 
 # END class Artist
\ No newline at end of file
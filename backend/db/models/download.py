@@ -1,6 +1,6 @@
 from ..model import Model
 import json, sqlite3
-from user_types import DownloadStatus
+from user_types import DownloadStatus, TrackCodec
 from datetime import datetime
 from .metadata import Metadata
 from .metadata_artist import MetadataArtist
@@ -8,9 +8,13 @@ from .artist import Artist
 
 class Download(Model):
   """A database model representing the downloads table.
+
+  Attributes:
+    ACTIVE_STATUSES (tuple[DownloadStatus, ...]): The statuses of downloads that are being worked on by the downloader.
   """
   
   TABLE = "downloads"
+  ACTIVE_STATUSES = (DownloadStatus.DOWNLOADING, DownloadStatus.TRANSCODING, DownloadStatus.TAGGING)
 
 
   def __init__(self, conn: sqlite3.Connection | None = None):
@@ -92,9 +96,143 @@ GROUP BY d.id
   # END get_all_downloads
 
 
+  def get_page(
+    self,
+    statuses: list[DownloadStatus] | None = None,
+    codecs: list[TrackCodec] | None = None,
+    created_from: str | None = None,
+    created_to: str | None = None,
+    after: tuple[str, int] | None = None,
+    limit: int = 50,
+    descending: bool = True
+  ) -> list[dict]:
+    """Selects a page of downloads ordered by creation time then ID, aggregating metadata.
+
+    Pages are keyset paginated, the downloads are selected and limited before their metadata is joined so only the page's rows are aggregated.
+
+    Args:
+      statuses (list[DownloadStatus] | None): The statuses to filter by, all if empty.
+      codecs (list[TrackCodec] | None): The codecs to filter by, all if empty.
+      created_from (str | None): The earliest creation timestamp to include.
+      created_to (str | None): The latest creation timestamp to include.
+      after (tuple[str, int] | None): The creation timestamp and ID of the last download of the previous page, None for the first page.
+      limit (int): The maximum number of downloads to select.
+      descending (bool): Whether to order from newest to oldest.
+
+    Returns:
+      list[dict]: The list of rows.
+    """
+
+    where_clauses = []
+    params = []
+
+    if statuses:
+      status_placeholders = ", ".join("?" * len(statuses))
+      where_clauses.append(f"status IN ({status_placeholders})")
+      params.extend(s.value for s in statuses)
+
+    if codecs:
+      codec_placeholders = ", ".join("?" * len(codecs))
+      where_clauses.append(f"codec IN ({codec_placeholders})")
+      params.extend(c.value for c in codecs)
+
+    if created_from:
+      where_clauses.append("created_at >= ?")
+      params.append(created_from)
+
+    if created_to:
+      where_clauses.append("created_at <= ?")
+      params.append(created_to)
+
+    if after:
+      operator = "<" if descending else ">"
+      where_clauses.append(f"(created_at, id) {operator} (?, ?)")
+      params.extend(after)
+
+    where = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+    direction = "DESC" if descending else "ASC"
+    params.append(limit)
+
+    query = f"""
+WITH page AS (
+  SELECT id
+  FROM {self.TABLE}
+  {where}
+  ORDER BY created_at {direction}, id {direction}
+  LIMIT ?
+)
+SELECT 
+  d.id AS download_id,
+  d.url,
+  d.codec,
+  d.bitrate,
+  d.status,
+  d.download_dir,
+  d.filename,
+  d.downloaded_bytes,
+  d.total_bytes,
+  d.speed,
+  d.eta,
+  d.terminated_at,
+  d.status_msg,
+  d.created_at,
+  m.id AS metadata_id,
+  m.track_name,
+  m.main_artist,
+  m.album_name,
+  m.track_number,
+  m.disc_number,
+  m.release_date,
+  m.album_cover_path,
+  m.genre,
+  m.album_artist,
+  json_group_array(a.name) AS other_artists
+FROM page
+JOIN {self.TABLE} d ON d.id = page.id
+LEFT JOIN {Metadata.TABLE} m ON d.metadata_id = m.id
+LEFT JOIN {MetadataArtist.TABLE} ma ON m.id = ma.metadata_id
+LEFT JOIN {Artist.TABLE} a ON ma.artist_id = a.id
+GROUP BY d.id
+ORDER BY d.created_at {direction}, d.id {direction}
+"""
+
+    self._cur.execute(query, tuple(params))
+    results = []
+
+    for row in self._cur.fetchall():
+      result = dict(row)
+      self._load_other_artists(result)
+      results.append(result)
+
+    return results
+  # END get_page
+
+
+  def count_by_status(self) -> dict[str, int]:
+    """Counts the downloads of each status.
+
+    Returns:
+      dict[str, int]: The number of downloads keyed by status, every status is included.
+    """
+
+    self._cur.execute(f"SELECT status, COUNT(*) AS count FROM {self.TABLE} GROUP BY status")
+    counts = { s.value: 0 for s in DownloadStatus }
+
+    for row in self._cur.fetchall():
+      counts[row["status"]] = row["count"]
+
+    return counts
+  # END count_by_status
+
+
   def get_next(self, status: DownloadStatus) -> dict | None:
     """Selects the earliest created download based on the status, aggregating all metadata.
 
+    Downloads created at the same time are ordered by ID.
+
+    Args:
+      status (DownloadStatus): The status of the download to select.
+
     Returns:
       dict | None: A dict with the row's data if a row was found, None otherwise.
     """
@@ -124,12 +262,13 @@ FROM {self.TABLE} d
 LEFT JOIN {Metadata.TABLE} m ON d.metadata_id = m.id
 LEFT JOIN {MetadataArtist.TABLE} ma ON m.id = ma.metadata_id
 LEFT JOIN {Artist.TABLE} a ON ma.artist_id = a.id
-WHERE d.status = :status
-  AND d.created_at = (
-    SELECT MIN(created_at) 
-    FROM {self.TABLE}
-    WHERE status = :status
-  ) 
+WHERE d.id = (
+  SELECT id
+  FROM {self.TABLE}
+  WHERE status = :status
+  ORDER BY created_at, id
+  LIMIT 1
+)
 GROUP BY d.id
 """
     self._cur.execute(query, { "status": status.value })
@@ -145,6 +284,47 @@ GROUP BY d.id
   # END get_next
 
 
+  def claim_next(self, status_msg: str | None = None) -> dict | None:
+    """Atomically sets the earliest created queued download to downloading in a single statement and selects it, aggregating all metadata.
+
+    Since the claim is a single statement, concurrent callers never claim the same download.
+
+    Args:
+      status_msg (str | None): The status message to set on the claimed download.
+
+    Returns:
+      dict | None: A dict with the claimed row's data if a queued row was found, None otherwise.
+    """
+
+    sql = f"""
+UPDATE {self.TABLE}
+SET status = :downloading, status_msg = :status_msg
+WHERE id = (
+  SELECT id
+  FROM {self.TABLE}
+  WHERE status = :queued
+  ORDER BY created_at, id
+  LIMIT 1
+)
+RETURNING id
+"""
+    params = {
+      "downloading": DownloadStatus.DOWNLOADING.value,
+      "queued": DownloadStatus.QUEUED.value,
+      "status_msg": status_msg
+    }
+
+    self._cur.execute(sql, params)
+    rows = self._cur.fetchall()
+    self._conn.commit()
+
+    if not rows:
+      return None
+
+    return self.get_download(rows[0]["id"])
+  # END claim_next
+
+
   def get_download(self, download_id: int) -> dict | None:
     """Selects a download/row.
 
@@ -203,6 +383,67 @@ GROUP BY d.id
   # END get_download
 
 
+  def get_downloads(self, download_ids: list[int]) -> list[dict]:
+    """Selects several downloads/rows, aggregating metadata.
+
+    Args:
+      download_ids (list[int]): The IDs of the downloads.
+
+    Returns:
+      list[dict]: The list of rows that were found.
+    """
+
+    if not download_ids:
+      return []
+
+    placeholders = ", ".join("?" * len(download_ids))
+    query = f"""
+SELECT 
+  d.id AS download_id,
+  d.url,
+  d.codec,
+  d.bitrate,
+  d.status,
+  d.download_dir,
+  d.filename,
+  d.downloaded_bytes,
+  d.total_bytes,
+  d.speed,
+  d.eta,
+  d.terminated_at,
+  d.status_msg,
+  d.created_at,
+  m.id AS metadata_id,
+  m.track_name,
+  m.main_artist,
+  m.album_name,
+  m.track_number,
+  m.disc_number,
+  m.release_date,
+  m.album_cover_path,
+  m.genre,
+  m.album_artist,
+  json_group_array(a.name) AS other_artists
+FROM {self.TABLE} d
+LEFT JOIN {Metadata.TABLE} m ON d.metadata_id = m.id
+LEFT JOIN {MetadataArtist.TABLE} ma ON m.id = ma.metadata_id
+LEFT JOIN {Artist.TABLE} a ON ma.artist_id = a.id
+WHERE d.id IN ({placeholders})
+GROUP BY d.id
+"""
+
+    self._cur.execute(query, tuple(download_ids))
+    results = []
+
+    for row in self._cur.fetchall():
+      result = dict(row)
+      self._load_other_artists(result)
+      results.append(result)
+
+    return results
+  # END get_downloads
+
+
   def insert_as_queued(self, data: dict) -> int:
     """Inserts a row into the table with the `status` column set to queued.
 
@@ -215,6 +456,27 @@ GROUP BY d.id
 
     return self.insert({ **data, "status": DownloadStatus.QUEUED.value })
   # END insert_as_queued
+
+
+  def insert_many_as_queued(self, data: list[dict]) -> list[int]:
+    """Inserts several rows into the table in one transaction with the `status` column set to queued, or resolving for rows without a URL.
+
+    Args:
+      data (list[dict]): A list of dicts (key-value pairs) representing the column names and values to insert for them.
+
+    Returns:
+      list[int]: The integer IDs of the rows that were inserted, in the same order as the data.
+    """
+
+    return self.insert_many([
+      {
+        **d,
+        "url": d.get("url") or "",
+        "status": (DownloadStatus.QUEUED if d.get("url") else DownloadStatus.RESOLVING).value
+      }
+      for d in data
+    ])
+  # END insert_many_as_queued
   
 
   def set_completed(self, download_id: int, terminated_at: str | None = None):
@@ -263,7 +525,7 @@ WHERE id = ?
 
 
   def requeue(self, download_ids: list[int]) -> int:
-    """Sets rows/downloads to queued in the table if they are not downloading, essentially requeueing the downloads.
+    """Sets rows/downloads to queued in the table if they are not active, essentially requeueing the downloads.
     
     Args:
       download_ids (list[int]): The IDs of the rows/downloads.
@@ -273,41 +535,149 @@ WHERE id = ?
     """
 
     download_id_placeholders = ", ".join("?" * len(download_ids))
+    active_status_placeholders = ", ".join("?" * len(self.ACTIVE_STATUSES))
     
+    # downloads that never had a source found go back to be resolved
     sql = f"""
 UPDATE {self.TABLE} 
-SET status = ?, terminated_at = ?, status_msg = ? 
-WHERE id IN ({download_id_placeholders}) AND status != ?
+SET status = CASE WHEN url = '' THEN ? ELSE ? END, terminated_at = ?, status_msg = ? 
+WHERE id IN ({download_id_placeholders}) AND status NOT IN ({active_status_placeholders})
 """
 
-    params = (DownloadStatus.QUEUED.value, None, None, *download_ids, DownloadStatus.DOWNLOADING.value)
+    params = (
+      DownloadStatus.RESOLVING.value,
+      DownloadStatus.QUEUED.value,
+      None,
+      None,
+      *download_ids,
+      *(s.value for s in self.ACTIVE_STATUSES)
+    )
 
     self._cur.execute(sql, params)
     self._conn.commit()
 
     return self._cur.rowcount
   # END requeue
+
+
+
+  def get_ids_by_status(self, status: DownloadStatus, limit: int | None = None) -> list[int]:
+    """Selects the IDs of the earliest created downloads of a status, in queue order.
+
+    Args:
+      status (DownloadStatus): The status of the downloads.
+      limit (int | None): The maximum number of IDs to select, None to select all.
+
+    Returns:
+      list[int]: The IDs.
+    """
+
+    # a negative limit means no limit in SQLite
+    sql = f"SELECT id FROM {self.TABLE} WHERE status = ? ORDER BY created_at, id LIMIT ?"
+
+    self._cur.execute(sql, (status.value, limit if limit is not None else -1))
+
+    return [row["id"] for row in self._cur.fetchall()]
+  # END get_ids_by_status
+
+
+  def get_ids_in_dir(self, directory: str, status: DownloadStatus) -> list[int]:
+    """Selects the IDs of the downloads of a status saved in a directory or any of its subdirectories.
+
+    Args:
+      directory (str): The path of the directory, as downloads' directories are given.
+      status (DownloadStatus): The status of the downloads.
+
+    Returns:
+      list[int]: The IDs, in creation order.
+    """
+
+    # matched with and without trailing separators, and by prefix for subdirectories; compared with substr rather than LIKE, which has wildcards and ignores ASCII case
+    stripped = directory.rstrip("/\\")
+    prefixes = (stripped + "/", stripped + "\\")
+    sql = f"""
+SELECT id FROM {self.TABLE}
+WHERE status = ? AND (
+  download_dir IN (?, ?)
+  OR substr(download_dir, 1, ?) = ?
+  OR substr(download_dir, 1, ?) = ?
+)
+ORDER BY created_at, id
+"""
+    params = (status.value, directory, stripped, len(prefixes[0]), prefixes[0], len(prefixes[1]), prefixes[1])
+
+    self._cur.execute(sql, params)
+
+    return [row["id"] for row in self._cur.fetchall()]
+  # END get_ids_in_dir
+
+
+  def set_resolved(self, download_id: int, url: str) -> bool:
+    """Sets the URL of a resolving row/download and queues it.
+
+    Args:
+      download_id (int): The ID of the row/download.
+      url (str): The URL of the source that was found.
+
+    Returns:
+      bool: True if the download was still resolving and got queued, False otherwise, e.g if it was deleted in the meantime.
+    """
+
+    sql = f"UPDATE {self.TABLE} SET url = ?, status = ?, status_msg = ? WHERE id = ? AND status = ?"
+    params = (url, DownloadStatus.QUEUED.value, None, download_id, DownloadStatus.RESOLVING.value)
+
+    self._cur.execute(sql, params)
+    self._conn.commit()
+
+    return self._cur.rowcount > 0
+  # END set_resolved
+
+
+  def requeue_interrupted(self, exclude_ids: list[int] | None = None) -> list[int]:
+    """Sets all rows/downloads that are marked as active back to queued and clears their status message, e.g downloads that were interrupted when the application last exited.
+
+    Args:
+      exclude_ids (list[int] | None): The IDs of active downloads to leave alone, e.g downloads that were resumed at the stage they were interrupted at.
+
+    Returns:
+      list[int]: The IDs of the downloads requeued.
+    """
+
+    exclude_ids = exclude_ids or []
+    placeholders = ", ".join("?" * len(self.ACTIVE_STATUSES))
+    exclude_placeholders = ", ".join("?" * len(exclude_ids))
+    sql = f"UPDATE {self.TABLE} SET status = ?, status_msg = NULL WHERE status IN ({placeholders}) AND id NOT IN ({exclude_placeholders}) RETURNING id"
+    params = (DownloadStatus.QUEUED.value, *(s.value for s in self.ACTIVE_STATUSES), *exclude_ids)
+
+    self._cur.execute(sql, params)
+    download_ids = [row["id"] for row in self._cur.fetchall()]
+    self._conn.commit()
+
+    return download_ids
+  # END requeue_interrupted
     
   
-  def delete_many(self, download_ids: list[int]):
-    """Deletes several rows/downloads from the table based on the given IDs.
+  def delete_many(self, download_ids: list[int]) -> list[int]:
+    """Deletes several rows/downloads from the table based on the given IDs, skipping downloads that are being worked on by the downloader.
 
     Args:
       download_ids (list[int]): The IDs of the rows/downloads to delete.
 
     Returns:
-      int: The number of downloads deleted.
+      list[int]: The IDs of the downloads that were deleted.
     """
     
     placeholders = ", ".join("?" * len(download_ids))
-    sql = f"DELETE FROM {self.TABLE} WHERE id IN ({placeholders})"
-    params = tuple(download_ids)
+    active_status_placeholders = ", ".join("?" * len(self.ACTIVE_STATUSES))
+    sql = f"DELETE FROM {self.TABLE} WHERE id IN ({placeholders}) AND status NOT IN ({active_status_placeholders}) RETURNING id"
+    params = (*download_ids, *(s.value for s in self.ACTIVE_STATUSES))
 
     self._cur.execute(sql, params)
+    deleted_ids = [row["id"] for row in self._cur.fetchall()]
     self._conn.commit()
 
-    return self._cur.rowcount
-  # END delete
+    return deleted_ids
+  # END delete_many
 
 
   def get_metadata_ids(self, download_ids: list[int]) -> list[int]:
@@ -321,8 +691,9 @@ WHERE id IN ({download_id_placeholders}) AND status != ?
     """
     
     placeholders = ", ".join("?" * len(download_ids))
-    sql = f"SELECT metadata_id FROM {self.TABLE} WHERE id IN ({placeholders}) AND status != ?"
-    params = (*download_ids, DownloadStatus.DOWNLOADING.value)
+    active_status_placeholders = ", ".join("?" * len(self.ACTIVE_STATUSES))
+    sql = f"SELECT metadata_id FROM {self.TABLE} WHERE id IN ({placeholders}) AND status NOT IN ({active_status_placeholders})"
+    params = (*download_ids, *(s.value for s in self.ACTIVE_STATUSES))
 
     self._cur.execute(sql, params)
     rows = self._cur.fetchall()
@@ -1,5 +1,4 @@
 from ..model import Model
-from typing import cast
 import sqlite3
 
 class MetadataArtist(Model):
@@ -14,45 +13,45 @@ class MetadataArtist(Model):
   # END __init__
 
 
-  def insert_many(self, data: list[dict]) -> list[int]:
-    """
-    Inserts several rows into the table.
+  def get_many_artist_ids(self, metadata_ids: list[int]) -> list[int]:
+    """Gets several artist IDs from the table based on metadata IDs.
 
     Args:
-      data (list[dict]): A list of dicts (key-value pairs) representing the column names and values to insert for them.
+      metadata_ids (list[int]): The IDs of the metadata.
 
     Returns:
-      list[int]: A list of the integer IDs of the rows that were inserted.
+      list[int]: The artist IDs.
     """
     
-    ids = []
-    
-    for d in data:
-      id = cast(int, self.insert(d))
-      ids.append(id)
+    placeholders = ", ".join("?" * len(metadata_ids))
+    sql = f"SELECT artist_id FROM {self.TABLE} WHERE metadata_id IN ({placeholders})"
+    params = tuple(metadata_ids)
 
-    return ids
-  # END insert_many
+    self._cur.execute(sql, params)
+    rows = self._cur.fetchall()
 
+    return [row["artist_id"] for row in rows]
+  # END get_artist_ids
 
-  def get_many_artist_ids(self, metadata_ids: list[int]) -> list[int]:
-    """Gets several artist IDs from the table based on metadata IDs.
+
+  def delete_many_by_metadata_ids(self, metadata_ids: list[int]) -> int:
+    """Deletes the rows linking the given metadata to their artists.
 
     Args:
       metadata_ids (list[int]): The IDs of the metadata.
 
     Returns:
-      list[int]: The artist IDs.
+      int: The number of rows deleted.
     """
-    
+
     placeholders = ", ".join("?" * len(metadata_ids))
-    sql = f"SELECT artist_id FROM {self.TABLE} WHERE metadata_id IN ({placeholders})"
+    sql = f"DELETE FROM {self.TABLE} WHERE metadata_id IN ({placeholders})"
     params = tuple(metadata_ids)
 
     self._cur.execute(sql, params)
-    rows = self._cur.fetchall()
+    self._conn.commit()
 
-    return [row["artist_id"] for row in rows]
-  # END get_artist_ids
+    return self._cur.rowcount
+  # END delete_many_by_metadata_ids
 
 # END class MetadataArtist
\ No newline at end of file
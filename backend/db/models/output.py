@@ -0,0 +1,79 @@
+from ..model import Model
+import sqlite3
+
+class Output(Model):
+  """A database model representing the outputs table, an index of completed output files by source video, codec and bitrate.
+  """
+
+  TABLE = "outputs"
+
+
+  def __init__(self, conn: sqlite3.Connection | None = None):
+    super().__init__(conn)
+  # END __init__
+
+
+  def upsert(self, data: dict) -> int | None:
+    """Inserts an output, replacing the output at the same path if there is one.
+
+    Args:
+      data (dict): Key-value pairs representing the column names and values to insert for them, must include `path`.
+
+    Returns:
+      int | None: The ID of the row that was inserted or updated.
+    """
+
+    fields = ", ".join(data.keys())
+    placeholders = ", ".join("?" * len(data))
+    set_clauses = ", ".join(f"{k} = excluded.{k}" for k in data.keys() if k != "path")
+    sql = f"""
+INSERT INTO {self.TABLE} ({fields}) VALUES ({placeholders})
+ON CONFLICT (path) DO UPDATE SET {set_clauses}
+RETURNING id
+"""
+
+    self._cur.execute(sql, tuple(data.values()))
+    row = self._cur.fetchone()
+    self._conn.commit()
+
+    return row["id"] if row else None
+  # END upsert
+
+
+  def get_by_source(self, source_id: str, codec: str, bitrate: str) -> list[dict]:
+    """Selects the outputs of a source video in a format, most recently indexed first.
+
+    Args:
+      source_id (str): The ID of the source video.
+      codec (str): The codec of the outputs.
+      bitrate (str): The bitrate of the outputs.
+
+    Returns:
+      list[dict]: The rows that were found.
+    """
+
+    sql = f"SELECT * FROM {self.TABLE} WHERE source_id = ? AND codec = ? AND bitrate = ? ORDER BY id DESC"
+
+    self._cur.execute(sql, (source_id, codec, bitrate))
+
+    return [dict(row) for row in self._cur.fetchall()]
+  # END get_by_source
+
+
+  def delete(self, id: int) -> int:
+    """Deletes a row in the table, e.g when its file no longer matches what was indexed.
+
+    Args:
+      id (int): The ID of the output/row to delete.
+
+    Returns:
+      int: The number of rows deleted.
+    """
+
+    self._cur.execute(f"DELETE FROM {self.TABLE} WHERE id = ?", (id,))
+    self._conn.commit()
+
+    return self._cur.rowcount
+  # END delete
+
+# END class Output
@@ -17,11 +17,20 @@ CREATE TABLE IF NOT EXISTS downloads (
   FOREIGN KEY (metadata_id) REFERENCES metadata(id) ON DELETE CASCADE
 );
 
+-- covers picking the next download of a status in queue order, the rowid (id) is implicitly included
+CREATE INDEX IF NOT EXISTS idx_downloads_status_created_at ON downloads (status, created_at);
+
+-- covers listing pages of downloads by creation time when not filtering by status
+CREATE INDEX IF NOT EXISTS idx_downloads_created_at ON downloads (created_at);
+
 CREATE TABLE IF NOT EXISTS artists (
   id INTEGER PRIMARY KEY,
   name TEXT NOT NULL
 );
 
+-- artists are shared across downloads, one row per name
+CREATE UNIQUE INDEX IF NOT EXISTS idx_artists_name ON artists (name);
+
 CREATE TABLE IF NOT EXISTS metadata (
   id INTEGER PRIMARY KEY,
   track_name TEXT NOT NULL,
@@ -41,4 +50,25 @@ CREATE TABLE IF NOT EXISTS metadata_artists (
   FOREIGN KEY (metadata_id) REFERENCES metadata(id) ON DELETE CASCADE,
   FOREIGN KEY (artist_id) REFERENCES artists(id) ON DELETE CASCADE,
   PRIMARY KEY (metadata_id, artist_id)
-);
\ No newline at end of file
+);
+
+-- lets an artist's remaining references be checked when downloads are deleted
+CREATE INDEX IF NOT EXISTS idx_metadata_artists_artist_id ON metadata_artists (artist_id);
+
+-- completed output files, so that downloading the same video in the same format again can reuse a file instead of downloading and transcoding
+CREATE TABLE IF NOT EXISTS outputs (
+  id INTEGER PRIMARY KEY,
+  source_id TEXT NOT NULL,
+  codec TEXT NOT NULL,
+  bitrate TEXT NOT NULL,
+  path TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  mtime REAL NOT NULL,
+  content_hash TEXT NOT NULL
+);
+
+-- a path holds one output, a newer output at the same path replaces the old one
+CREATE UNIQUE INDEX IF NOT EXISTS idx_outputs_path ON outputs (path);
+
+-- covers looking up the outputs of a source video in a format
+CREATE INDEX IF NOT EXISTS idx_outputs_source ON outputs (source_id, codec, bitrate);
\ No newline at end of file
@@ -16,7 +16,60 @@ def setup(conn: sqlite3.Connection = connect()):
   with open(schema_path, "r", encoding="utf-8") as f:
     schema = f.read()
 
+  if _has_duplicate_artists(conn):
+    _dedupe_artists(conn)
+
   cur = conn.cursor()
   cur.executescript(schema)
   conn.commit()
-# END setup
\ No newline at end of file
+# END setup
+
+
+def _has_duplicate_artists(conn: sqlite3.Connection) -> bool:
+  """Checks whether the database predates unique artist names, i.e the artists table exists without its unique index.
+
+  Args:
+    conn (sqlite3.Connection): A connection to the application's database.
+
+  Returns:
+    bool: True if the artists table may contain duplicate names, False otherwise.
+  """
+
+  cur = conn.cursor()
+  cur.execute("SELECT name FROM sqlite_master WHERE name IN ('artists', 'idx_artists_name')")
+  names = { row[0] for row in cur.fetchall() }
+
+  return "artists" in names and "idx_artists_name" not in names
+# END _has_duplicate_artists
+
+
+def _dedupe_artists(conn: sqlite3.Connection):
+  """Merges duplicate artist rows into the row with the lowest ID per name so that the unique index on artist names can be created.
+
+  Args:
+    conn (sqlite3.Connection): A connection to the application's database.
+  """
+
+  cur = conn.cursor()
+  cur.executescript("""
+BEGIN;
+
+CREATE TEMP TABLE artist_merges AS
+SELECT a.id AS old_id, k.keep_id AS new_id
+FROM artists a
+JOIN (SELECT name, MIN(id) AS keep_id FROM artists GROUP BY name) k ON a.name = k.name
+WHERE a.id != k.keep_id;
+
+UPDATE OR IGNORE metadata_artists
+SET artist_id = (SELECT new_id FROM artist_merges WHERE old_id = metadata_artists.artist_id)
+WHERE artist_id IN (SELECT old_id FROM artist_merges);
+
+-- references that could not be repointed already exist for the kept artist
+DELETE FROM metadata_artists WHERE artist_id IN (SELECT old_id FROM artist_merges);
+DELETE FROM artists WHERE id IN (SELECT old_id FROM artist_merges);
+
+DROP TABLE artist_merges;
+
+COMMIT;
+""")
+# END _dedupe_artists
\ No newline at end of file
@@ -1,3 +1,7 @@
 from .track import Track
 from .metadata import Metadata
-from .settings import Settings
\ No newline at end of file
+from .settings import Settings
+from .search_cache import SearchCache
+from .album_cover_cache import AlbumCoverCache
+from .spotify_cache import SpotifyCache
+from .album_cover_index import AlbumCoverIndex
\ No newline at end of file
@@ -1,34 +1,50 @@
-import os, mimetypes
+import os, mimetypes, hashlib, shutil, subprocess, threading
 from .cache import Cache
+from .album_cover_cache import AlbumCoverCache
+from .album_cover_index import AlbumCoverIndex
 from typing import Any
+from utils import get_bin_dir
+import config
 
 class AlbumCover:
   """A model class for interfacing with album cover files on disk
 
   Attributes:
     DIR (str): The path of the directory where album covers ares saved.
+    NORMALIZED_DIR (str): The path of the directory where size-capped JPEG variants of album covers are saved.
+    CONVERT_TIMEOUT (float): The maximum number of seconds a cover conversion may take.
     path (str): The path to an album cover file.
+    _normalize_locks (dict[str, tuple[threading.Lock, int]]): The lock of each variant being converted and the number of threads using it, keeps the tracks of an album that are tagged concurrently from converting the same cover more than once while different covers are converted in parallel.
+    _normalize_locks_lock (threading.Lock): Guards the locks of the variants being converted.
   """
   
   DIR = os.path.join(Cache.DIR, "covers")
+  NORMALIZED_DIR = os.path.join(DIR, "normalized")
+  CONVERT_TIMEOUT = 30
 
   path: str
+  _normalize_locks: dict[str, tuple[threading.Lock, int]] = {}
+  _normalize_locks_lock: threading.Lock = threading.Lock()
 
 
   def __init__(self, path = None):
     self.path = path
-
-    self._safe_create_dir()
   # END __init__
 
 
-  @classmethod
-  def _safe_create_dir(cls):
-    """Safely creates the directory where album covers are saved if it doesn't exist yet.
+  @staticmethod
+  def find(album_id: str) -> str | None:
+    """Finds the cover of an album saved in the album cover directory from the album cover index.
+
+    Args:
+      album_id (str): The ID of the album the cover is saved under.
+
+    Returns:
+      str | None: The path of the cover, or None if there is none.
     """
 
-    os.makedirs(cls.DIR, exist_ok=True)
-  # END _safe_create_dir
+    return AlbumCoverIndex.instance().get(album_id)
+  # END find
 
 
   def read(self) -> bytes:
@@ -41,28 +57,174 @@ class AlbumCover:
     with open(self.path, "rb") as img:
       return img.read()
   # END read
+
+
+  def read_cached(self) -> tuple[bytes, str | None]:
+    """Gets the contents and mimetype of the album cover file from the album cover cache, reading the file only if it isn't cached or has changed.
+
+    Returns:
+      tuple[bytes, str | None]: The contents of the album cover file and its mimetype if it could be guessed.
+
+    Raises:
+      OSError: If the file could not be read.
+    """
+
+    return AlbumCoverCache.instance().get(self.path)
+  # END read_cached
   
 
+  def normalize(self) -> str:
+    """Gets the path of a JPEG variant of the album cover that is at most `config.COVER_MAX_DIMENSION` pixels wide and high, converting the cover the first time, so that large covers aren't embedded in every track verbatim.
+
+    Variants are keyed by the cover's path, modification time and size, so a replaced cover is converted again. Covers of at most `config.COVER_NORMALIZE_MIN_BYTES` bytes are used as they are.
+
+    Returns:
+      str: The path of the variant, or of the cover itself if it's small enough or couldn't be converted.
+
+    Raises:
+      OSError: If the cover doesn't exist.
+    """
+
+    stat = os.stat(self.path)
+
+    if stat.st_size <= config.COVER_NORMALIZE_MIN_BYTES:
+      return self.path
+
+    key = f"{os.path.abspath(self.path)}:{stat.st_mtime_ns}:{stat.st_size}:{config.COVER_MAX_DIMENSION}"
+    normalized_path = os.path.join(self.NORMALIZED_DIR, hashlib.sha1(key.encode()).hexdigest() + ".jpg")
+
+    if os.path.exists(normalized_path):
+      return normalized_path
+
+    lock = self._acquire_normalize_lock(normalized_path)
+
+    try:
+      with lock:
+        if os.path.exists(normalized_path) or self._convert(normalized_path, stat.st_size):
+          return normalized_path
+    finally:
+      self._release_normalize_lock(normalized_path)
+
+    return self.path
+  # END normalize
+
+
+  @classmethod
+  def _acquire_normalize_lock(cls, normalized_path: str) -> threading.Lock:
+    """Gets the lock of a variant being converted, creating it if no other thread is using it.
+
+    Args:
+      normalized_path (str): The path of the variant.
+
+    Returns:
+      threading.Lock: The lock, to be released with `_release_normalize_lock` once done with.
+    """
+
+    with cls._normalize_locks_lock:
+      lock, user_count = cls._normalize_locks.get(normalized_path, (None, 0))
+
+      if lock is None:
+        lock = threading.Lock()
+
+      cls._normalize_locks[normalized_path] = (lock, user_count + 1)
+
+      return lock
+  # END _acquire_normalize_lock
+
+
+  @classmethod
+  def _release_normalize_lock(cls, normalized_path: str):
+    """Stops using the lock of a variant, removing it once no other thread is using it.
+
+    Args:
+      normalized_path (str): The path of the variant.
+    """
+
+    with cls._normalize_locks_lock:
+      lock, user_count = cls._normalize_locks[normalized_path]
+
+      if user_count == 1:
+        del cls._normalize_locks[normalized_path]
+      else:
+        cls._normalize_locks[normalized_path] = (lock, user_count - 1)
+  # END _release_normalize_lock
+
+
+  def _convert(self, output_path: str, max_size: int) -> bool:
+    """Uses ffmpeg to convert the album cover to a size-capped JPEG.
+
+    Args:
+      output_path (str): The path to save the JPEG to.
+      max_size (int): The size in bytes the JPEG must be smaller than to be kept.
+
+    Returns:
+      bool: True if the JPEG was saved, False if ffmpeg is unavailable, failed or didn't make the cover any smaller.
+    """
+
+    ffmpeg = shutil.which("ffmpeg", path=get_bin_dir()) or shutil.which("ffmpeg")
+
+    if ffmpeg is None:
+      return False
+
+    os.makedirs(self.NORMALIZED_DIR, exist_ok=True)
+    # written next to the output first so that a partial file is never used, the extension tells ffmpeg the format
+    tmp_path = output_path[:-len(".jpg")] + f".{threading.get_ident()}.tmp.jpg"
+    dimension = config.COVER_MAX_DIMENSION
+
+    try:
+      subprocess.run([
+        ffmpeg, "-nostdin", "-loglevel", "error", "-y",
+        "-i", self.path,
+        "-vf", f"scale='min(iw,{dimension})':'min(ih,{dimension})':force_original_aspect_ratio=decrease",
+        "-frames:v", "1",
+        "-pix_fmt", "yuvj420p",
+        "-q:v", "3",
+        tmp_path
+      ], check=True, capture_output=True, timeout=self.CONVERT_TIMEOUT)
+
+      if os.path.getsize(tmp_path) >= max_size:
+        os.remove(tmp_path)
+        return False
+
+      os.replace(tmp_path, output_path)
+    except (OSError, subprocess.SubprocessError):
+      try:
+        os.remove(tmp_path)
+      except OSError:
+        pass
+
+      return False
+
+    return True
+  # END _convert
+
+
   def write(self, buffer: Any):    
-    """Writes a readable buffer to the album cover file.
+    """Writes a readable buffer to the album cover file, adding it to the album cover index if it's saved in the album cover directory.
 
     Args:
       buffer (Any): A readable buffer.
     """
     
+    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
     with open(self.path, "wb") as file:
       file.write(buffer)
+
+    AlbumCoverIndex.instance().add(self.path)
   # END write
 
 
   def exists(self) -> bool:
-    """Checks whether the album cover file exists.
+    """Checks whether the album cover file exists, from the album cover index if it's saved in the album cover directory.
 
     Returns:
       bool: True if it exists, false otherwise.
     """
+
+    indexed = AlbumCoverIndex.instance().contains(self.path)
     
-    return os.path.exists(self.path)
+    return indexed if indexed is not None else os.path.exists(self.path)
   # END exists
   
 
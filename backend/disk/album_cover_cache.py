@@ -0,0 +1,142 @@
+import os, mimetypes, threading
+from collections import OrderedDict
+from typing import Self
+import config
+
+class AlbumCoverCache:
+  """A least-recently-used cache of album cover file contents bounded by total size, shared by the threads that tag tracks so that a cover shared by an album's tracks is read from disk once.
+
+  Entries are keyed by path and checked against the file's modification time and size on every lookup, so a replaced cover is read again.
+
+  Attributes:
+    hits (int): The number of lookups that were served from the cache.
+    misses (int): The number of lookups that read the file.
+    _instance (AlbumCoverCache | None): The singleton instance used throughout the app.
+    _instance_lock (threading.Lock): Guards creating the singleton instance, so that threads using it for the first time at once share one cache.
+    _max_bytes (int): The maximum total size of the cached covers in bytes.
+    _max_entries (int): The maximum number of cached covers.
+    _entries (OrderedDict[str, tuple[int, int, bytes, str | None]]): The modification time, size, contents and mimetype per path, least recently used first.
+    _size (int): The total size of the cached covers in bytes.
+    _lock (threading.Lock): Guards the entries and counters.
+  """
+
+  hits: int
+  misses: int
+  _instance: Self | None = None
+  _instance_lock: threading.Lock = threading.Lock()
+  _max_bytes: int
+  _max_entries: int
+  _entries: OrderedDict[str, tuple[int, int, bytes, str | None]]
+  _size: int
+  _lock: threading.Lock
+
+
+  def __init__(self, max_bytes: int = config.COVER_CACHE_MAX_BYTES, max_entries: int = config.COVER_CACHE_MAX_ENTRIES):
+    """Initializes an empty cache.
+
+    Args:
+      max_bytes (int): The maximum total size of the cached covers in bytes.
+      max_entries (int): The maximum number of cached covers.
+    """
+
+    self.hits = 0
+    self.misses = 0
+    self._max_bytes = max_bytes
+    self._max_entries = max_entries
+    self._entries = OrderedDict()
+    self._size = 0
+    self._lock = threading.Lock()
+  # END __init__
+
+
+  @classmethod
+  def instance(cls) -> Self:
+    """Gets the singleton instance, creating it on first use.
+
+    Returns:
+      AlbumCoverCache: The instance.
+    """
+
+    if cls._instance is None:
+      with cls._instance_lock:
+        if cls._instance is None:
+          cls._instance = cls()
+
+    return cls._instance
+  # END instance
+
+
+  def get(self, path: str) -> tuple[bytes, str | None]:
+    """Gets the contents and mimetype of an album cover file, reading it if it isn't cached or has changed.
+
+    Args:
+      path (str): The path to the album cover file.
+
+    Returns:
+      tuple[bytes, str | None]: The contents of the file and its mimetype if it could be guessed.
+
+    Raises:
+      OSError: If the file could not be read.
+    """
+
+    stat = os.stat(path)
+
+    with self._lock:
+      entry = self._entries.get(path)
+
+      if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return entry[2], entry[3]
+
+      self.misses += 1
+
+    with open(path, "rb") as img:
+      data = img.read()
+
+    mimetype, _ = mimetypes.guess_type(path)
+    self._set(path, (stat.st_mtime_ns, stat.st_size, data, mimetype))
+
+    return data, mimetype
+  # END get
+
+
+  def _set(self, path: str, entry: tuple[int, int, bytes, str | None]):
+    """Caches the contents of a file, evicting the least recently used covers to stay within the bounds.
+
+    Args:
+      path (str): The path to the album cover file.
+      entry (tuple[int, int, bytes, str | None]): The modification time, size, contents and mimetype of the file.
+    """
+
+    # a cover that can't fit on its own would only evict everything else
+    if len(entry[2]) > self._max_bytes or self._max_entries == 0:
+      return
+
+    with self._lock:
+      previous = self._entries.pop(path, None)
+
+      if previous is not None:
+        self._size -= len(previous[2])
+
+      self._entries[path] = entry
+      self._size += len(entry[2])
+
+      while self._size > self._max_bytes or len(self._entries) > self._max_entries:
+        _, evicted = self._entries.popitem(last=False)
+        self._size -= len(evicted[2])
+  # END _set
+
+
+  def get_stats(self) -> dict:
+    """Gets the cache's counters.
+
+    Returns:
+      dict: The number of `hits`, `misses`, cached covers (`size`) and cached bytes (`bytes`).
+    """
+
+    with self._lock:
+      return { "hits": self.hits, "misses": self.misses, "size": len(self._entries), "bytes": self._size }
+  # END get_stats
+
+# END class AlbumCoverCache
@@ -0,0 +1,200 @@
+import os, threading
+from typing import Self
+
+class AlbumCoverIndex:
+  """An in-memory index of the album covers saved in a directory as `<album_id><ext>`, so that finding an album's cover doesn't touch the disk.
+
+  The directory is scanned once, the first time the index is used, and the index is updated as covers are written. Covers added to or removed from the directory by other processes aren't seen until the index is rebuilt.
+
+  Attributes:
+    _instance (AlbumCoverIndex | None): The singleton instance used throughout the app, indexing the album cover directory.
+    _instance_lock (threading.Lock): Guards creating the singleton instance, so that threads using it for the first time at once share one index.
+    dir (str): The path of the indexed directory.
+    _paths (dict[str, str] | None): The paths of the covers by album ID, None until the directory is scanned.
+    _lock (threading.Lock): Guards the index.
+  """
+
+  _instance: Self | None = None
+  _instance_lock: threading.Lock = threading.Lock()
+  dir: str
+  _paths: dict[str, str] | None
+  _lock: threading.Lock
+
+
+  def __init__(self, dir: str):
+    """Initializes an index of a directory that is yet to be scanned.
+
+    Args:
+      dir (str): The path of the directory.
+    """
+
+    self.dir = dir
+    self._paths = None
+    self._lock = threading.Lock()
+  # END __init__
+
+
+  @classmethod
+  def instance(cls) -> Self:
+    """Gets the singleton instance, creating it on first use.
+
+    Returns:
+      AlbumCoverIndex: The instance.
+    """
+
+    if cls._instance is None:
+      from .album_cover import AlbumCover
+
+      with cls._instance_lock:
+        if cls._instance is None:
+          cls._instance = cls(AlbumCover.DIR)
+
+    return cls._instance
+  # END instance
+
+
+  @staticmethod
+  def get_album_id(path: str) -> str | None:
+    """Gets the album ID a cover file is saved under.
+
+    Args:
+      path (str): The path of the cover file.
+
+    Returns:
+      str | None: The album ID, or None if the file isn't a cover, e.g a temporary file.
+    """
+
+    album_id, ext = os.path.splitext(os.path.basename(path))
+
+    if not album_id or not ext or ext == ".tmp":
+      return None
+
+    return album_id
+  # END get_album_id
+
+
+  def _scan(self) -> dict[str, str]:
+    """Scans the directory for covers.
+
+    Returns:
+      dict[str, str]: The paths of the covers by album ID.
+    """
+
+    paths = {}
+
+    try:
+      with os.scandir(self.dir) as entries:
+        for entry in entries:
+          album_id = self.get_album_id(entry.name)
+
+          if album_id is not None and entry.is_file():
+            paths[album_id] = entry.path
+    except FileNotFoundError:
+      pass
+
+    return paths
+  # END _scan
+
+
+  def build(self) -> int:
+    """Scans the directory, replacing the index.
+
+    Returns:
+      int: The number of covers indexed.
+    """
+
+    # scanned under the lock so that covers written meanwhile aren't dropped from the index
+    with self._lock:
+      self._paths = self._scan()
+
+      return len(self._paths)
+  # END build
+
+
+  def _get_paths_unlocked(self) -> dict[str, str]:
+    """Gets the index, scanning the directory on first use, the caller must hold the lock.
+
+    Returns:
+      dict[str, str]: The paths of the covers by album ID.
+    """
+
+    if self._paths is None:
+      self._paths = self._scan()
+
+    return self._paths
+  # END _get_paths_unlocked
+
+
+  def get(self, album_id: str) -> str | None:
+    """Gets the path of an album's cover.
+
+    Args:
+      album_id (str): The ID of the album.
+
+    Returns:
+      str | None: The path of the cover, or None if there is none.
+    """
+
+    with self._lock:
+      return self._get_paths_unlocked().get(album_id)
+  # END get
+
+
+  def _is_in_dir(self, path: str) -> bool:
+    """Checks whether a file is directly in the indexed directory.
+
+    Args:
+      path (str): The path of the file.
+
+    Returns:
+      bool: True if it is, False otherwise.
+    """
+
+    return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.dir)
+  # END _is_in_dir
+
+
+  def contains(self, path: str) -> bool | None:
+    """Checks whether a cover file is indexed.
+
+    Args:
+      path (str): The path of the cover file.
+
+    Returns:
+      bool | None: Whether the file is indexed, or None if it isn't in the indexed directory and the index can't tell.
+    """
+
+    album_id = self.get_album_id(path)
+
+    if album_id is None or not self._is_in_dir(path):
+      return None
+
+    with self._lock:
+      indexed_path = self._get_paths_unlocked().get(album_id)
+
+    return indexed_path is not None and os.path.abspath(indexed_path) == os.path.abspath(path)
+  # END contains
+
+
+  def add(self, path: str) -> bool:
+    """Indexes a cover file that was written to the indexed directory.
+
+    Args:
+      path (str): The path of the cover file.
+
+    Returns:
+      bool: True if the file was indexed, False if it isn't a cover in the indexed directory.
+    """
+
+    album_id = self.get_album_id(path)
+
+    if album_id is None or not self._is_in_dir(path):
+      return False
+
+    with self._lock:
+      self._get_paths_unlocked()[album_id] = path
+
+    return True
+  # END add
+
+# END class AlbumCoverIndex
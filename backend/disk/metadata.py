@@ -1,8 +1,9 @@
-from mutagen.id3 import ID3, APIC, TIT2, TPE1, TALB, TRCK, TPOS, TYER, TDAT, TCON, TPE2
+from mutagen.id3 import ID3, ID3NoHeaderError, Frame, APIC, TIT2, TPE1, TALB, TRCK, TPOS, TYER, TDAT, TCON, TPE2
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC, Picture
 from .album_cover import AlbumCover
 from user_types import TrackArtistNames, TrackReleaseDate
+from collections import Counter
 
 class Metadata:
   """A model class that interfaces with metadata of a music file on disk
@@ -30,108 +31,215 @@ class Metadata:
   genre: str | None
   
 
-  def set_on_mp3(self, file_path: str):
-    """Sets the metadata onto an MP3 file.
+  def _get_cover(self) -> tuple[bytes, str | None] | None:
+    """Gets the contents and mimetype of the album cover to embed, a size-capped variant for large covers.
 
-    Args:
-      file_path (str): The path to the MP3 file.
+    Returns:
+      tuple[bytes, str | None] | None: The contents of the cover and its mimetype if it could be guessed, or None if there is no cover or it couldn't be read.
     """
-    
-    audio = MP3(file_path)
-    audio.tags = ID3()
 
-    audio.tags.add(TIT2(encoding=3, text=self.track_name))
-    audio.tags.add(TPE1(encoding=3, text=self.artist_names.data))
+    if not self.album_cover_path:
+      return None
+
+    try:
+      return AlbumCover(AlbumCover(self.album_cover_path).normalize()).read_cached()
+    except OSError:
+      return None
+  # END _get_cover
+
+
+  def _get_id3_frames(self) -> list[Frame]:
+    """Gets the ID3 frames that hold the metadata in MP3 files.
+
+    Returns:
+      list[Frame]: The frames.
+    """
+
+    frames = [
+      TIT2(encoding=3, text=self.track_name),
+      TPE1(encoding=3, text=self.artist_names.data)
+    ]
 
     if self.album_name:
-      audio.tags.add(TALB(encoding=3, text=self.album_name))
+      frames.append(TALB(encoding=3, text=self.album_name))
 
     if self.album_artist:
-      audio.tags.add(TPE2(encoding=3, text=self.album_artist))
+      frames.append(TPE2(encoding=3, text=self.album_artist))
 
     if self.genre:
-      audio.tags.add(TCON(encoding=3, text=self.genre))
+      frames.append(TCON(encoding=3, text=self.genre))
 
     if self.track_number is not None:
-      audio.tags.add(TRCK(encoding=3, text=str(self.track_number)))
+      frames.append(TRCK(encoding=3, text=str(self.track_number)))
 
     if self.disc_number is not None:
-      audio.tags.add(TPOS(encoding=3, text=str(self.disc_number)))
+      frames.append(TPOS(encoding=3, text=str(self.disc_number)))
 
     if self.release_date is not None:
-      audio.tags.add(TYER(encoding=3, text=str(self.release_date.year)))
+      frames.append(TYER(encoding=3, text=str(self.release_date.year)))
 
       if self.release_date.month is not None and self.release_date.day is not None:
         tdat_value = str(self.release_date.day).zfill(2) + str(self.release_date.month).zfill(2)
-        audio.tags.add(TDAT(encoding=3, text=tdat_value))
-
-    if self.album_cover_path:
-      cover = AlbumCover(self.album_cover_path)
-      mimetype = cover.get_mimetype()
-
-      if cover.exists():
-        audio.tags.add(
-          APIC(
-            encoding=3,
-            mime=mimetype,
-            type=3,
-            desc="",
-            data=cover.read()
-          )
+        frames.append(TDAT(encoding=3, text=tdat_value))
+
+    cover = self._get_cover()
+
+    if cover is not None:
+      frames.append(
+        APIC(
+          encoding=3,
+          mime=cover[1],
+          type=3,
+          desc="",
+          data=cover[0]
         )
+      )
+
+    return frames
+  # END _get_id3_frames
+
+
+  @staticmethod
+  def _get_id3_frame_key(frame: Frame) -> tuple:
+    """Gets a comparable form of an ID3 frame that is the same before and after it's saved as ID3v2.3.
+
+    Args:
+      frame (Frame): The frame.
+
+    Returns:
+      tuple: The comparable form.
+    """
+
+    if isinstance(frame, APIC):
+      return (frame.HashKey, frame.mime, frame.type, frame.desc, frame.data)
+
+    # ID3v2.3 joins multiple values with slashes
+    return (frame.HashKey, "/".join(str(t) for t in frame.text))
+  # END _get_id3_frame_key
+
+
+  def set_on_mp3(self, file_path: str):
+    """Sets the metadata onto an MP3 file.
+
+    Args:
+      file_path (str): The path to the MP3 file.
+    """
+    
+    audio = MP3(file_path)
+    audio.tags = ID3()
+
+    for frame in self._get_id3_frames():
+      audio.tags.add(frame)
   
     # need to add try catch here
     audio.save(v2_version=3)
   # END set_on_mp3
 
 
-  def set_on_flac(self, file_path: str):
-    """Sets the metadata onto a FLAC file.
+  def is_set_on_mp3(self, file_path: str) -> bool:
+    """Checks whether an MP3 file already has exactly the tags that `set_on_mp3` would set.
 
     Args:
-      file_path (str): The path to the FLAC file.
+      file_path (str): The path to the MP3 file.
+
+    Returns:
+      bool: True if the tags match, False otherwise.
     """
-    
-    audio = FLAC(file_path)
-    audio.delete()
 
-    audio["TITLE"] = self.track_name
-    audio["ARTIST"] = self.artist_names.data
+    try:
+      tags = ID3(file_path, translate=False)
+    except ID3NoHeaderError:
+      return False
+
+    expected = Counter(self._get_id3_frame_key(f) for f in self._get_id3_frames())
+
+    return Counter(self._get_id3_frame_key(f) for f in tags.values()) == expected
+  # END is_set_on_mp3
+
+
+  def _get_vorbis_comments(self) -> dict[str, str | list[str]]:
+    """Gets the Vorbis comments that hold the metadata in FLAC files, other than the cover.
+
+    Returns:
+      dict[str, str | list[str]]: The comments by name.
+    """
+
+    comments = {
+      "TITLE": self.track_name,
+      "ARTIST": self.artist_names.data
+    }
     
     if self.album_name:
-      audio["ALBUM"] = self.album_name
+      comments["ALBUM"] = self.album_name
 
     if self.track_number is not None:      
-      audio["TRACKNUMBER"] = str(self.track_number)
+      comments["TRACKNUMBER"] = str(self.track_number)
 
     if self.disc_number is not None:      
-      audio["DISCNUMBER"] = str(self.disc_number)
+      comments["DISCNUMBER"] = str(self.disc_number)
     
     if self.release_date is not None:
-      audio["DATE"] = str(self.release_date)
+      comments["DATE"] = str(self.release_date)
     
     if self.album_artist:
-      audio["ALBUMARTIST"] = self.album_artist
+      comments["ALBUMARTIST"] = self.album_artist
     
     if self.genre:
-      audio["GENRE"] = self.genre
+      comments["GENRE"] = self.genre
+
+    return comments
+  # END _get_vorbis_comments
+
+
+  def set_on_flac(self, file_path: str):
+    """Sets the metadata onto a FLAC file.
+
+    Args:
+      file_path (str): The path to the FLAC file.
+    """
+    
+    audio = FLAC(file_path)
+    audio.delete()
+
+    for name, value in self._get_vorbis_comments().items():
+      audio[name] = value
 
-    if self.album_cover_path:
+    cover = self._get_cover()
+
+    if cover is not None:
       p = Picture()
-      cover = AlbumCover(self.album_cover_path)
-      mimetype = cover.get_mimetype()
-
-      try:
-        p.data = cover.read()
-        p.type = 3
-        p.mime = mimetype
-
-        audio.clear_pictures()
-        audio.add_picture(p)
-      except OSError:
-        pass
+      p.data, p.mime = cover
+      p.type = 3
+
+      audio.clear_pictures()
+      audio.add_picture(p)
       
     audio.save()
   # END set_on_flac
 
+
+  def is_set_on_flac(self, file_path: str) -> bool:
+    """Checks whether a FLAC file already has exactly the tags and cover that `set_on_flac` would set.
+
+    Args:
+      file_path (str): The path to the FLAC file.
+
+    Returns:
+      bool: True if the tags and cover match, False otherwise.
+    """
+
+    audio = FLAC(file_path)
+    expected = {
+      name.lower(): value if isinstance(value, list) else [value]
+      for name, value in self._get_vorbis_comments().items()
+    }
+
+    if (audio.tags.as_dict() if audio.tags is not None else {}) != expected:
+      return False
+
+    cover = self._get_cover()
+
+    return cover is None or [(p.data, p.mime, p.type) for p in audio.pictures] == [(cover[0], cover[1], 3)]
+  # END is_set_on_flac
+
 # END class Metadata
\ No newline at end of file
@@ -0,0 +1,67 @@
+import os, json
+from .cache import Cache
+
+class SearchCache:
+  """A model class for interfacing with the file that persists cached search results in the application cache.
+
+  Attributes:
+    PATH (str): The default path of the search cache file.
+    path (str): The path of the search cache file.
+  """
+
+  PATH = os.path.join(Cache.DIR, "search_cache.json")
+
+  path: str
+
+
+  def __init__(self, path: str | None = None):
+    self.path = path or self.PATH
+  # END __init__
+
+
+  def read(self) -> list | None:
+    """Reads and parses the search cache file.
+
+    Returns:
+      list | None: The cached entries, or None if the file doesn't exist or is invalid.
+    """
+
+    try:
+      with open(self.path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+      if not isinstance(data, list):
+        return None
+
+      return data
+    except Exception:
+      return None
+  # END read
+
+
+  def write(self, data: list) -> bool:
+    """Overwrites the search cache file, replacing it atomically so that a crash never leaves a partial file.
+
+    Args:
+      data (list): The entries to cache.
+
+    Returns:
+      bool: True if the write was a success, False otherwise.
+    """
+
+    tmp_path = self.path + ".tmp"
+
+    try:
+      os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+      with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+      os.replace(tmp_path, self.path)
+
+      return True
+    except Exception:
+      return False
+  # END write
+
+# END class SearchCache
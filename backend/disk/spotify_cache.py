@@ -0,0 +1,129 @@
+import os, re, json, shutil, threading
+from .cache import Cache
+
+class SpotifyCache:
+  """A model class for interfacing with the files that persist fetched Spotify data in the application cache, one file per entry.
+
+  Each entry holds the fetched items along with what is needed to tell whether they are still current, i.e the `snapshot_id` of a playlist and/or the `ETag` of a response.
+
+  Attributes:
+    DIR (str): The default path of the directory the entries are stored in.
+    dir (str): The path of the directory the entries are stored in.
+  """
+
+  DIR = os.path.join(Cache.DIR, "spotify")
+
+  dir: str
+
+
+  def __init__(self, dir: str | None = None):
+    self.dir = dir or self.DIR
+  # END __init__
+
+
+  def _get_path(self, key: str) -> str:
+    """Gets the path of the file of an entry.
+
+    Args:
+      key (str): The key of the entry, e.g "playlist_<id>".
+
+    Returns:
+      str: The path.
+
+    Raises:
+      ValueError: If the key isn't safe to use as a filename.
+    """
+
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", key):
+      raise ValueError(f"Invalid cache key: {key!r}")
+
+    return os.path.join(self.dir, f"{key}.json")
+  # END _get_path
+
+
+  def read(self, key: str) -> dict | None:
+    """Reads and parses the file of an entry.
+
+    Args:
+      key (str): The key of the entry.
+
+    Returns:
+      dict | None: The entry, or None if it doesn't exist or is invalid.
+    """
+
+    try:
+      with open(self._get_path(key), "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+      if not isinstance(data, dict) or not isinstance(data.get("items"), list):
+        return None
+
+      return data
+    except Exception:
+      return None
+  # END read
+
+
+  def write(self, key: str, data: dict) -> bool:
+    """Overwrites the file of an entry, replacing it atomically so that a crash never leaves a partial file.
+
+    Args:
+      key (str): The key of the entry.
+      data (dict): The entry, must include `items`.
+
+    Returns:
+      bool: True if the write was a success, False otherwise.
+    """
+
+    try:
+      path = self._get_path(key)
+      # unique per thread so concurrent writes of the same entry don't share a temporary file
+      tmp_path = f"{path}.{threading.get_ident()}.tmp"
+      os.makedirs(self.dir, exist_ok=True)
+
+      with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+      os.replace(tmp_path, path)
+
+      return True
+    except Exception:
+      return False
+  # END write
+
+
+  def delete(self, key: str) -> bool:
+    """Deletes the file of an entry.
+
+    Args:
+      key (str): The key of the entry.
+
+    Returns:
+      bool: True if the entry existed and was deleted, False otherwise.
+    """
+
+    try:
+      os.remove(self._get_path(key))
+      return True
+    except Exception:
+      return False
+  # END delete
+
+
+  def clear(self) -> bool:
+    """Deletes all entries.
+
+    Returns:
+      bool: True if the entries were deleted or there were none, False otherwise.
+    """
+
+    try:
+      shutil.rmtree(self.dir)
+      return True
+    except FileNotFoundError:
+      return True
+    except Exception:
+      return False
+  # END clear
+
+# END class SpotifyCache
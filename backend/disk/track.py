@@ -1,4 +1,4 @@
-import os, mimetypes
+import os, mimetypes, glob, hashlib
 from pathvalidate import sanitize_filename
 from user_types import NewDownload, TrackCodec
 
@@ -13,6 +13,7 @@ class Track:
     ext (str): The extension (including the ".") of the track file associated with the codec in the track info.
     mimetype (str): The mimetype of the track file.
     output_template (str): The output filepath template for `yt_dlp` to know where to download the track to.
+    source_path (str | None): The path of the downloaded audio stream that has yet to be transcoded into the track file, if any.
   """
 
   track_info: NewDownload
@@ -20,6 +21,7 @@ class Track:
   mimetype: str
   path: str
   output_template: str
+  source_path: str | None
 
 
   def __init__(self, track_info: NewDownload):
@@ -33,6 +35,7 @@ class Track:
     self.mimetype = mimetypes.types_map[self.ext]
     self.path = self.build_path(track_info.download_dir, track_info.filename, track_info.codec)
     self.output_template = self._build_output_template()
+    self.source_path = None
 
     os.makedirs(os.path.dirname(self.path), exist_ok=True)
   # END __init__
@@ -58,6 +61,74 @@ class Track:
   # END build_path
     
 
+  @staticmethod
+  def get_part_size(download_dir: str, filename: str) -> int | None:
+    """Gets the size of the partially downloaded audio stream that yt-dlp left behind for a track, which it continues from when the track is downloaded again.
+
+    Args:
+      download_dir (str): The directory where the track will be stored.
+      filename (str): The name of the file for the track.
+
+    Returns:
+      int | None: The size of the part file in bytes, None if there is none.
+    """
+
+    # part files are named after the output template with the stream's extension and a .part suffix
+    pattern = os.path.join(glob.escape(download_dir), glob.escape(sanitize_filename(filename, platform="auto")) + ".*.part")
+    sizes = []
+
+    for path in glob.glob(pattern):
+      try:
+        sizes.append(os.path.getsize(path))
+      except OSError:
+        pass
+
+    return max(sizes) if sizes else None
+  # END get_part_size
+
+
+  @staticmethod
+  def get_content_hash(path: str) -> str:
+    """Hashes the contents of a file.
+
+    Args:
+      path (str): The path of the file.
+
+    Returns:
+      str: The hex SHA-256 digest of the contents.
+    """
+
+    with open(path, "rb") as f:
+      return hashlib.file_digest(f, "sha256").hexdigest()
+  # END get_content_hash
+
+
+  def find_source_path(self) -> str | None:
+    """Finds the downloaded audio stream that yt-dlp left behind for the track, e.g when the application exited while it was being transcoded.
+
+    Files with the extension of a track codec are never taken for the source, since they may be the track file of another download with the same name.
+
+    Returns:
+      str | None: The path of the audio stream, None if there is none.
+    """
+
+    name = sanitize_filename(self.track_info.filename, platform="auto")
+    pattern = os.path.join(glob.escape(self.track_info.download_dir), glob.escape(name) + ".*")
+    codec_exts = { codec.value for codec in TrackCodec }
+
+    for path in sorted(glob.glob(pattern)):
+      # only `<filename>.<ext>`, not part files or other temporary files next to it
+      ext = os.path.basename(path)[len(name) + 1:]
+
+      if not ext.isalnum() or ext.lower() in codec_exts or not os.path.isfile(path):
+        continue
+
+      return path
+
+    return None
+  # END find_source_path
+
+
   def _build_output_template(self) -> str:
     """Builds the output filepath template for `yt_dlp` to know where to download the track to.
 
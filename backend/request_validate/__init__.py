@@ -1,4 +1,7 @@
 from .post_downloads_validator import PostDownloadsValidator
 from .get_downloads_search_validator import GetDownloadsSearchValidator
 from .post_downloads_restart_validator import PostDownloadsRestartValidator
-from .delete_downloads_validator import DeleteDownloadsValidator
\ No newline at end of file
+from .delete_downloads_validator import DeleteDownloadsValidator
+from .get_downloads_validator import GetDownloadsValidator
+from .post_downloads_search_batch_validator import PostDownloadsSearchBatchValidator
+from .post_downloads_retag_validator import PostDownloadsRetagValidator
\ No newline at end of file
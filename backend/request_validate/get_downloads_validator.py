@@ -0,0 +1,168 @@
+from werkzeug.datastructures import MultiDict
+from user_types.reponses import GetDownloadsResponse
+from user_types.requests import GetDownloadsRequest
+from user_types import DownloadStatus, TrackCodec, DownloadsCursor
+from datetime import datetime
+from enum import Enum
+from typing import Literal
+
+class GetDownloadsValidator:
+  """Validator class that validates request parameters of requests made to the GET /downloads endpoint.
+
+  Attributes:
+    DEFAULT_LIMIT (int): The page size used when no `limit` parameter is given.
+    MAX_LIMIT (int): The largest page size that may be requested.
+    _response (GetDownloadsResponse.BadRequest): A response body model instance associated with the endpoint.
+    _request (GetDownloadsRequest): A request parameters model instance associated with the endpoint.
+  """
+
+  DEFAULT_LIMIT = 50
+  MAX_LIMIT = 500
+
+  _response: GetDownloadsResponse.BadRequest
+  _request: GetDownloadsRequest
+
+
+  def __init__(self):
+    self._response = GetDownloadsResponse.BadRequest()
+    self._request = GetDownloadsRequest()
+  # END __init__
+
+
+  def validate(self, params: MultiDict[str, str]) -> tuple[Literal[False], GetDownloadsResponse.BadRequest] | tuple[Literal[True], GetDownloadsRequest]:
+    """Performs full validation on the request parameters.
+
+    Args:
+      params (MultiDict[str, str]): The request parameters.
+
+    Returns:
+      tuple[Literal[False], GetDownloadsResponse.BadRequest] | tuple[Literal[True], GetDownloadsRequest]: A tuple where on successful validation the first element is True and the second are the sanitized params, or on failure the first element is False and the second is the response body to send.
+    """
+
+    bad_request = (False, self._response)
+
+    self._response.parameter = "status"
+    statuses = self._validate_enum_list(DownloadStatus, params)
+
+    if statuses is None:
+      return bad_request
+
+    self._response.parameter = "codec"
+    codecs = self._validate_enum_list(TrackCodec, params)
+
+    if codecs is None:
+      return bad_request
+
+    self._response.parameter = "created_from"
+    is_valid, created_from = self._validate_timestamp(params.get(self._response.parameter), end_of_day=False)
+
+    if not is_valid:
+      return bad_request
+
+    self._response.parameter = "created_to"
+    is_valid, created_to = self._validate_timestamp(params.get(self._response.parameter), end_of_day=True)
+
+    if not is_valid:
+      return bad_request
+
+    self._response.parameter = "order"
+    order = params.get(self._response.parameter) or "desc"
+
+    if order not in ("asc", "desc"):
+      self._response.message = f"Parameter `{self._response.parameter}` must be either `asc` or `desc`."
+      return bad_request
+
+    self._response.parameter = "limit"
+    limit = params.get(self._response.parameter)
+
+    if limit is None or limit == "":
+      limit = self.DEFAULT_LIMIT
+    elif not (limit.isascii() and limit.isdigit()) or not 1 <= int(limit) <= self.MAX_LIMIT:
+      self._response.message = f"Parameter `{self._response.parameter}` must be an integer from 1 to {self.MAX_LIMIT}."
+      return bad_request
+    else:
+      limit = int(limit)
+
+    self._response.parameter = "cursor"
+    raw_cursor = params.get(self._response.parameter)
+    cursor = None
+
+    if raw_cursor:
+      cursor = DownloadsCursor.decode(raw_cursor)
+
+      if cursor is None:
+        self._response.message = f"Parameter `{self._response.parameter}` is invalid."
+        return bad_request
+
+    self._request.statuses = statuses
+    self._request.codecs = codecs
+    self._request.created_from = created_from
+    self._request.created_to = created_to
+    self._request.order = order
+    self._request.limit = limit
+    self._request.cursor = cursor
+
+    return True, self._request
+  # END validate
+
+
+  def _validate_enum_list[T: Enum](self, enum: type[T], params: MultiDict[str, str]) -> list[T] | None:
+    """Validates a parameter that takes a list of enum values, given as repeated and/or comma-separated values.
+
+    Args:
+      enum (type[T]): The enum the values should belong to.
+      params (MultiDict[str, str]): The request parameters.
+
+    Returns:
+      list[T] | None: The enum members, or None if a value is invalid in which case the response message is set.
+    """
+
+    values = [
+      v.strip()
+      for raw in params.getlist(self._response.parameter)
+      for v in raw.split(",")
+      if v.strip()
+    ]
+    members = []
+
+    for value in values:
+      if not any(value == member.value for member in enum):
+        self._response.message = f"Parameter `{self._response.parameter}` has an invalid value `{value}`."
+        return None
+
+      members.append(enum(value))
+
+    return list(dict.fromkeys(members))
+  # END _validate_enum_list
+
+
+  def _validate_timestamp(self, value: str | None, end_of_day: bool) -> tuple[bool, str | None]:
+    """Validates a parameter that takes a date (YYYY-MM-DD) or timestamp (YYYY-MM-DD HH:MM:SS).
+
+    Args:
+      value (str | None): The parameter value.
+      end_of_day (bool): Whether a date should be taken as the end of the day rather than the start, to make date ranges inclusive.
+
+    Returns:
+      tuple[bool, str | None]: Whether the value is valid and the timestamp in the database's format, None if not given. The response message is set on failure.
+    """
+
+    if not value:
+      return True, None
+
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+      try:
+        parsed = datetime.strptime(value, fmt)
+      except ValueError:
+        continue
+
+      if fmt == "%Y-%m-%d" and end_of_day:
+        parsed = parsed.replace(hour=23, minute=59, second=59)
+
+      return True, parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+    self._response.message = f"Parameter `{self._response.parameter}` must be a date (YYYY-MM-DD) or timestamp (YYYY-MM-DD HH:MM:SS)."
+    return False, None
+  # END _validate_timestamp
+
+# END class GetDownloadsValidator
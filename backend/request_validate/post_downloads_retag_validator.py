@@ -0,0 +1,120 @@
+from user_types.reponses import PostDownloadsRetagResponse
+from user_types.requests import PostDownloadsRetagRequest
+from typing import Any, Literal
+from pathvalidate import is_valid_filepath
+
+class PostDownloadsRetagValidator():
+  """Validator class that validates request bodies to the POST /downloads/retag endpoint.
+
+  Attributes:
+    _response (PostDownloadsRetagResponse.BadRequest): A response body model instance associated with the endpoint.
+    _request (PostDownloadsRetagRequest): A request body model instance associated with the endpoint.
+  """
+  
+  _response: PostDownloadsRetagResponse.BadRequest
+  _request: PostDownloadsRetagRequest
+
+
+  def __init__(self):
+    self._response = PostDownloadsRetagResponse.BadRequest()
+    self._request = PostDownloadsRetagRequest()
+  # END __init__
+
+
+  def validate(self, body: Any)-> tuple[Literal[False], PostDownloadsRetagResponse.BadRequest] | tuple[Literal[True], PostDownloadsRetagRequest]:
+    """Performs full validation on the request body, which must have either `download_ids` or `directory`.
+
+    Args:
+      body (Any): A request body to validate.
+
+    Returns:
+      tuple[Literal[False], PostDownloadsRetagResponse.BadRequest] | tuple[Literal[True], PostDownloadsRetagRequest]: A tuple where on successful validation the first element is True and the second is the sanitized request body, or on failure the first element is False and the second is the response body to send.
+    """
+    
+    bad_request = (False, self._response)
+    
+    if body is None or not isinstance(body, dict):
+      self._response.field = ""
+      self._response.message = "Body must be an object."
+      return bad_request
+
+    download_ids = body.get("download_ids")
+    directory = body.get("directory")
+
+    if (download_ids is None) == (directory is None):
+      self._response.field = ""
+      self._response.message = "Exactly one of fields `download_ids` and `directory` is required."
+      return bad_request
+
+    self._request.download_ids = None
+    self._request.directory = None
+
+    if download_ids is not None:
+      return self._validate_download_ids(download_ids)
+
+    return self._validate_directory(directory)
+  # END validate
+
+
+  def _validate_download_ids(self, download_ids: Any) -> tuple[Literal[False], PostDownloadsRetagResponse.BadRequest] | tuple[Literal[True], PostDownloadsRetagRequest]:
+    """Helper that validates the `download_ids` field.
+
+    Args:
+      download_ids (Any): The field's value.
+
+    Returns:
+      tuple[Literal[False], PostDownloadsRetagResponse.BadRequest] | tuple[Literal[True], PostDownloadsRetagRequest]: The validation result, see `validate`.
+    """
+
+    bad_request = (False, self._response)
+    self._response.field = "download_ids"
+    
+    if not isinstance(download_ids, list):
+      self._response.message = f"Field `{self._response.field}` must be an array."
+      return bad_request
+
+    if len(download_ids) == 0:
+      self._response.message = f"Field `{self._response.field}` must be of at least length 1."
+      return bad_request
+
+    if not all(isinstance(id, int) for id in download_ids):
+      self._response.message = f"Field `{self._response.field}` must be an array of integers."
+      return bad_request
+      
+    if not all(id > 0 for id in download_ids):
+      self._response.message = f"Field `{self._response.field}` must be an array of integers greater than 0."
+      return bad_request
+    
+    self._request.download_ids = download_ids
+
+    return True, self._request
+  # END _validate_download_ids
+
+
+  def _validate_directory(self, directory: Any) -> tuple[Literal[False], PostDownloadsRetagResponse.BadRequest] | tuple[Literal[True], PostDownloadsRetagRequest]:
+    """Helper that validates the `directory` field.
+
+    Args:
+      directory (Any): The field's value.
+
+    Returns:
+      tuple[Literal[False], PostDownloadsRetagResponse.BadRequest] | tuple[Literal[True], PostDownloadsRetagRequest]: The validation result, see `validate`.
+    """
+
+    bad_request = (False, self._response)
+    self._response.field = "directory"
+
+    if not isinstance(directory, str):
+      self._response.message = f"Field `{self._response.field}` must be a string."
+      return bad_request
+
+    if directory == "" or not is_valid_filepath(directory, "auto"):
+      self._response.message = f"Field `{self._response.field}` must be a valid directory."
+      return bad_request
+
+    self._request.directory = directory
+
+    return True, self._request
+  # END _validate_directory
+
+# END class PostDownloadsRetagValidator
\ No newline at end of file
@@ -0,0 +1,84 @@
+from user_types.reponses import PostDownloadsSearchBatchResponse
+from user_types.requests import PostDownloadsSearchBatchRequest, GetDownloadsSearchRequest
+from typing import Any, Literal
+
+class PostDownloadsSearchBatchValidator:
+  """Validator class that validates request bodies to the POST /downloads/search/batch endpoint.
+
+  Attributes:
+    MAX_QUERIES (int): The maximum number of queries accepted in one request.
+    _response (PostDownloadsSearchBatchResponse.BadRequest): A response body model instance associated with the endpoint.
+    _request (PostDownloadsSearchBatchRequest): A request body model instance associated with the endpoint.
+  """
+
+  MAX_QUERIES = 1000
+
+  _response: PostDownloadsSearchBatchResponse.BadRequest
+  _request: PostDownloadsSearchBatchRequest
+
+
+  def __init__(self):
+    self._response = PostDownloadsSearchBatchResponse.BadRequest()
+    self._request = PostDownloadsSearchBatchRequest()
+  # END __init__
+
+
+  def validate(self, body: Any) -> tuple[Literal[False], PostDownloadsSearchBatchResponse.BadRequest] | tuple[Literal[True], PostDownloadsSearchBatchRequest]:
+    """Performs full validation on the request body.
+
+    Args:
+      body (Any): A request body to validate.
+
+    Returns:
+      tuple[Literal[False], PostDownloadsSearchBatchResponse.BadRequest] | tuple[Literal[True], PostDownloadsSearchBatchRequest]: A tuple where on successful validation the first element is True and the second is the sanitized request body, or on failure the first element is False and the second is the response body to send.
+    """
+
+    bad_request = (False, self._response)
+    self._response.item_index = None
+
+    if body is None or not isinstance(body, dict):
+      self._response.field = ""
+      self._response.message = "Body must be an object."
+      return bad_request
+
+    self._response.field = "queries"
+    queries = body.get(self._response.field)
+
+    if not isinstance(queries, list) or len(queries) == 0:
+      self._response.message = f"Field `{self._response.field}` must be an array of at least length 1."
+      return bad_request
+
+    if len(queries) > self.MAX_QUERIES:
+      self._response.message = f"Field `{self._response.field}` must contain at most {self.MAX_QUERIES} queries."
+      return bad_request
+
+    validated_queries = []
+
+    for i, query in enumerate(queries):
+      self._response.item_index = i
+
+      if not isinstance(query, dict):
+        self._response.field = "queries"
+        self._response.message = "Query must be an object."
+        return bad_request
+
+      validated_query = GetDownloadsSearchRequest()
+
+      for field in ("main_artist", "track_name"):
+        self._response.field = field
+        value = query.get(field)
+
+        if not isinstance(value, str) or not value.strip():
+          self._response.message = f"Field `{field}` is required and must be a non-empty string."
+          return bad_request
+
+        setattr(validated_query, field, value)
+
+      validated_queries.append(validated_query)
+
+    self._request.queries = validated_queries
+
+    return True, self._request
+  # END validate
+
+# END class PostDownloadsSearchBatchValidator
@@ -63,7 +63,7 @@ class PostDownloadsValidator:
       # (validator function, attribute name on download)
       (self._validate_artist_names, "artist_names"),
       (self._validate_track_name, "track_name"),
-      (lambda download: self._validate_required_string(download, "url"), "url"),
+      (self._validate_url, "url"),
       (lambda download: self._validate_required_string(download, "filename"), "filename"),
       (self._validate_download_dir, "download_dir"),
       (self._validate_album_cover_path, "album_cover_path"),
@@ -243,6 +243,30 @@ class PostDownloadsValidator:
   # END _validate_bitrate
   
 
+  def _validate_url(self, download: dict) -> Literal[False] | str | None:
+    """Helper that validates the `url` field of a download, which may be omitted to have the source found automatically.
+
+    Args:
+      download (dict): The download.
+
+    Returns:
+      Literal[False] | str | None: False if the field is invalid, the URL or None if there is none otherwise.
+    """
+
+    self._response.field = "url"
+    field_value = download.get(self._response.field)
+
+    if field_value is None or field_value == "":
+      return None
+
+    if not isinstance(field_value, str):
+      self._response.message = f"Field `{self._response.field}` must be a string or null."
+      return False
+
+    return field_value
+  # END _validate_url
+
+
   def _validate_string_or_null(self, download: dict, field: str) -> Literal[False] | str | None:
     """Helper that validates a field of a download that should be a string or null.
 
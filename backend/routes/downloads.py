@@ -1,10 +1,11 @@
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 import request_validate as reqv
-from typing import cast, Literal
+from typing import cast, Literal, Generator
+import json
 import user_types.reponses as res
 import user_types.requests as req
 from user_types import DownloadSearchResult
-from services import Downloader, YtDlpClient
+from services import Downloader, Resolver, YtDlpClient
 
 downloads_bp = Blueprint("downloads", __name__)
 
@@ -27,12 +28,37 @@ def post_downloads() -> tuple[Response, Literal[400, 200]]:
   res_body = res.PostDownloadsResponse.Ok()
   res_body.download_ids = Downloader.queue(req_body.downloads)
 
+  Resolver.start()
   Downloader.start()
   
   return jsonify(res_body.__dict__), 200
 # END post_downloads
 
 
+@downloads_bp.route("/downloads", methods=["GET"])
+def get_downloads() -> tuple[Response, Literal[400, 200]]:
+  """Lists a page of downloads, optionally filtered by status, codec and creation date.
+
+  Returns:
+    tuple[Response, Literal[400, 200]]: The response and status code.
+  """
+
+  is_valid, validation_result_data = reqv.GetDownloadsValidator().validate(request.args)
+
+  if not is_valid:
+    res_body = cast(res.GetDownloadsResponse.BadRequest, validation_result_data)
+    return jsonify(res_body.__dict__), 400
+
+  req_body = cast(req.GetDownloadsRequest, validation_result_data)
+
+  res_body = res.GetDownloadsResponse.Ok()
+  res_body.downloads, res_body.next_cursor = Downloader.get_page(req_body)
+  res_body.counts = Downloader.count_by_status()
+
+  return jsonify(res_body.get_serializable()), 200
+# END get_downloads
+
+
 @downloads_bp.route("/downloads/search", methods=["GET"])
 def get_downloads_search() -> tuple[Response, Literal[400, 500, 200]]:
   """Interfaces with yt-dlp to query for search results of YouTube videos to be downloaded.
@@ -62,6 +88,44 @@ def get_downloads_search() -> tuple[Response, Literal[400, 500, 200]]:
 # END get_downloads_search
 
 
+@downloads_bp.route("/downloads/search/batch", methods=["POST"])
+def post_downloads_search_batch() -> tuple[Response, Literal[400, 200]]:
+  """Searches YouTube for several tracks concurrently, streaming each track's results back as NDJSON as soon as they are found.
+
+  Returns:
+    tuple[Response, Literal[400, 200]]: The response and status code.
+  """
+
+  raw_body = request.get_json()
+  is_valid, validation_result_data = reqv.PostDownloadsSearchBatchValidator().validate(raw_body)
+
+  if not is_valid:
+    res_body = cast(res.PostDownloadsSearchBatchResponse.BadRequest, validation_result_data)
+    return jsonify(res_body.__dict__), 400
+
+  req_body = cast(req.PostDownloadsSearchBatchRequest, validation_result_data)
+
+  def generate_lines() -> Generator[str, None, None]:
+    """Generates a line of the response body for each query as its search completes.
+
+    Returns:
+      Generator[str, None, None]: Yields the JSON-encoded lines.
+    """
+
+    for item_index, (is_success, result) in YtDlpClient().query_youtube_many(req_body.queries):
+      item = res.PostDownloadsSearchBatchResponse.Item()
+      item.item_index = item_index
+      item.status = 200 if is_success else 500
+      item.results = cast(list[DownloadSearchResult], result) if is_success else None
+      item.message = None if is_success else cast(str, result)
+
+      yield json.dumps(item.get_serializable()) + "\n"
+  # END generate_lines
+
+  return Response(stream_with_context(generate_lines()), mimetype="application/x-ndjson"), 200
+# END post_downloads_search_batch
+
+
 @downloads_bp.route("/downloads/restart", methods=["POST"])
 def post_downloads_restart() -> tuple[Response, Literal[400, 200]]:
   """Sets tracks to queued for the downloader thread to pick up and restart them.
@@ -83,6 +147,7 @@ def post_downloads_restart() -> tuple[Response, Literal[400, 200]]:
   res_body.restart_count = Downloader.requeue(req_body)
 
   if res_body.restart_count > 0:
+    Resolver.start()
     Downloader.start()
     res_body.message = f"{res_body.restart_count} downloads were queued and should be restarted shortly."
   else:
@@ -92,6 +157,30 @@ def post_downloads_restart() -> tuple[Response, Literal[400, 200]]:
 # END post_downloads_restart
 
 
+@downloads_bp.route("/downloads/retag", methods=["POST"])
+def post_downloads_retag() -> tuple[Response, Literal[400, 202]]:
+  """Queues the re-application of the metadata in the database to the files of completed downloads, by download IDs or by directory.
+  
+  Returns:
+    tuple[Response, Literal[400, 202]]: The response and status code.
+  """
+
+  raw_body = request.get_json()
+  is_valid, validation_result_data = reqv.PostDownloadsRetagValidator().validate(raw_body)
+
+  if not is_valid:
+    res_body = cast(res.PostDownloadsRetagResponse.BadRequest, validation_result_data)
+    return jsonify(res_body.__dict__), 400
+
+  req_body = cast(req.PostDownloadsRetagRequest, validation_result_data)
+  res_body = res.PostDownloadsRetagResponse.Accepted()
+  res_body.retag_id, res_body.track_count = Downloader.retag(req_body)
+  res_body.message = f"{res_body.track_count} tracks were queued to be re-tagged."
+
+  return jsonify(res_body.__dict__), 202
+# END post_downloads_retag
+
+
 @downloads_bp.route("/downloads", methods=["DELETE"])
 def delete_downloads() -> tuple[Response, Literal[400, 200]]:
   """Deletes downloads from the database.
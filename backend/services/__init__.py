@@ -1,4 +1,8 @@
 from .spotify_api_client import SpotifyApiClient
-from .yt_dlp_client import YtDlpClient
+from .cover_prefetcher import CoverPrefetcher
+from .search_result_cache import SearchResultCache
+from .yt_dlp_client import YtDlpClient, DownloadPaused
+from .progress_coalescer import ProgressCoalescer
 from .downloader import Downloader
+from .resolver import Resolver
 from .logger import logger
\ No newline at end of file
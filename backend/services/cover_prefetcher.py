@@ -0,0 +1,153 @@
+import os, mimetypes, threading, requests
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Iterable
+from .spotify_api_client import SpotifyApiClient
+from disk.album_cover import AlbumCover
+from disk.album_cover_index import AlbumCoverIndex
+import config
+
+class CoverPrefetcher:
+  """Service class that downloads album covers from the Spotify CDN in the background ahead of when they're needed.
+
+  Covers are saved as `<album_id><ext>` in the album cover directory and downloaded on a bounded thread pool. Concurrent requests for the same album share a single download, and the album cover index answers whether a cover is already downloaded.
+
+  Attributes:
+    _executor (ThreadPoolExecutor | None): The thread pool covers are downloaded on, None until first used.
+    _in_flight (dict[str, Future]): The downloads in progress by album ID.
+    _lock (threading.Lock): Guards the thread pool and the downloads in progress.
+  """
+
+  _executor: ThreadPoolExecutor | None = None
+  _in_flight: dict[str, Future] = {}
+  _lock: threading.Lock = threading.Lock()
+
+
+  @classmethod
+  def get_path(cls, album_id: str) -> str | None:
+    """Gets the path of an album's cover if it's downloaded.
+
+    Args:
+      album_id (str): The Spotify ID of the album.
+
+    Returns:
+      str | None: The path of the cover, or None if it isn't downloaded.
+    """
+
+    return AlbumCover.find(album_id)
+  # END get_path
+
+
+  @classmethod
+  def prefetch(cls, url: str, album_id: str) -> Future:
+    """Queues the download of an album's cover unless it's already downloaded or being downloaded.
+
+    Args:
+      url (str): The Spotify CDN URL of the cover.
+      album_id (str): The Spotify ID of the album.
+
+    Returns:
+      Future: Resolves to the path of the cover, or None if it couldn't be downloaded.
+    """
+
+    with cls._lock:
+      # checked under the lock so a download finishing in between is either in flight or indexed
+      path = AlbumCover.find(album_id)
+
+      if path is not None:
+        future = Future()
+        future.set_result(path)
+        return future
+
+      future = cls._in_flight.get(album_id)
+
+      if future is None:
+        if cls._executor is None:
+          cls._executor = ThreadPoolExecutor(max_workers=config.COVER_PREFETCH_WORKER_COUNT, thread_name_prefix="cover-prefetch")
+
+        future = cls._executor.submit(cls._download, url, album_id)
+        cls._in_flight[album_id] = future
+
+      return future
+  # END prefetch
+
+
+  @classmethod
+  def prefetch_many(cls, covers: Iterable[tuple[str, str]]) -> dict[str, Future]:
+    """Queues the downloads of many albums' covers, see `prefetch`.
+
+    Args:
+      covers (Iterable[tuple[str, str]]): The Spotify CDN URL and album ID of each cover, albums may repeat.
+
+    Returns:
+      dict[str, Future]: The future of each album's cover by album ID.
+    """
+
+    return { album_id: cls.prefetch(url, album_id) for url, album_id in covers }
+  # END prefetch_many
+
+
+  @classmethod
+  def prefetch_track_items(cls, items: list[dict]) -> dict[str, Future]:
+    """Queues the downloads of the covers of the tracks in playlist items or liked tracks fetched from the Spotify API.
+
+    Args:
+      items (list[dict]): The items, each with a `track` holding its `album`.
+
+    Returns:
+      dict[str, Future]: The future of each album's cover by album ID.
+    """
+
+    covers = []
+
+    for item in items:
+      album = (item.get("track") or {}).get("album") or {}
+      images = album.get("images") or []
+
+      if album.get("id") and images:
+        covers.append((images[0]["url"], album["id"]))
+
+    return cls.prefetch_many(covers)
+  # END prefetch_track_items
+
+
+  @classmethod
+  def _download(cls, url: str, album_id: str) -> str | None:
+    """Downloads an album's cover and adds it to the index.
+
+    Args:
+      url (str): The Spotify CDN URL of the cover.
+      album_id (str): The Spotify ID of the album.
+
+    Returns:
+      str | None: The path of the cover, or None if it couldn't be downloaded.
+    """
+
+    path = None
+
+    try:
+      res = SpotifyApiClient._get_session().get(url, timeout=SpotifyApiClient.REQUEST_TIMEOUT)
+      res.raise_for_status()
+
+      # get ext from content type (including cases with charset specificed, e.g "image/jpeg; charset=UTF-8")
+      content_type = res.headers.get("Content-Type", "")
+      ext = mimetypes.guess_extension(content_type.split(";")[0]) or ".jpg"
+      cover_path = os.path.join(AlbumCover.DIR, f"{album_id}{ext}")
+      # written next to the cover first so that a partial file is never indexed
+      tmp_path = f"{cover_path}.{threading.get_ident()}.tmp"
+
+      AlbumCover(tmp_path).write(res.content)
+      os.replace(tmp_path, cover_path)
+      path = cover_path
+    except (requests.RequestException, OSError):
+      pass
+    finally:
+      with cls._lock:
+        if path is not None:
+          AlbumCoverIndex.instance().add(path)
+
+        cls._in_flight.pop(album_id, None)
+
+    return path
+  # END _download
+
+# END class CoverPrefetcher
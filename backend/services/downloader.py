@@ -1,21 +1,40 @@
-from services import YtDlpClient
+from services import YtDlpClient, ProgressCoalescer, DownloadPaused
 import user_types.requests as req
-from user_types import TrackBitrate, TrackCodec, TrackReleaseDate, DownloadUpdate, DownloadStatus, TrackArtistNames, NewDownload
-import db, disk
-import threading, os
-from typing import cast, Callable
+from user_types import TrackBitrate, TrackCodec, TrackReleaseDate, DownloadUpdate, DownloadStatus, TrackArtistNames, NewDownload, DownloadsCursor
+import db, disk, config
+import threading, os, shutil, time, uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import cast, Callable, Literal
 from sockets import DownloadsSocket
 from pathvalidate import sanitize_filename
+from utils import get_source_id
 
 class Downloader:
   """A singleton class that acts as the controller for track downloads in the application.
 
   Attributes:
-    _thread (threading.Thread | None): The thread where downloads run.
+    WORKER_COUNT (int): The maximum number of worker threads that download concurrently.
+    TRANSCODE_WORKER_COUNT (int): The maximum number of downloads that are transcoded concurrently.
+    TAGGING_WORKER_COUNT (int): The maximum number of downloads that have their metadata set concurrently.
+    RETAG_PROGRESS_INTERVAL (float): The minimum time in seconds between progress broadcasts of a bulk re-tag.
+    _threads (list[threading.Thread]): The worker threads where downloads run.
+    _threads_lock (threading.Lock): Lock that guards starting worker threads.
+    _executors_lock (threading.Lock): Lock that guards creating the transcode and tagging pools.
+    _transcode_executor (ThreadPoolExecutor | None): The pool where downloaded audio is transcoded.
+    _tagging_executor (ThreadPoolExecutor | None): The pool where the metadata of finished track files is set.
     _resume_loop_event (threading.Event): The event which determines whether the downloader loop should be proceed or not.
   """
   
-  _thread: threading.Thread | None = None
+  WORKER_COUNT: int = config.DOWNLOAD_WORKER_COUNT
+  TRANSCODE_WORKER_COUNT: int = config.TRANSCODE_WORKER_COUNT
+  TAGGING_WORKER_COUNT: int = config.TAGGING_WORKER_COUNT
+  RETAG_PROGRESS_INTERVAL: float = 0.5
+
+  _threads: list[threading.Thread] = []
+  _threads_lock: threading.Lock = threading.Lock()
+  _executors_lock: threading.Lock = threading.Lock()
+  _transcode_executor: ThreadPoolExecutor | None = None
+  _tagging_executor: ThreadPoolExecutor | None = None
   _resume_loop_event: threading.Event = threading.Event()
 
 
@@ -59,40 +78,33 @@ class Downloader:
 
 
   @staticmethod
-  def _create_progress_hook(update: DownloadUpdate) -> Callable[[dict], None]:
+  def _create_progress_hook(update: DownloadUpdate, download_model: db.models.Download) -> Callable[[dict], None]:
     """Creates a progress hook function to be passed to the yt-dlp client instance when downloading.
 
     Args:
       update (DownloadUpdate): Static downloaded update data for the download.
+      download_model (db.models.Download): The download model of the worker running the download.
 
     Returns:
       Callable[[dict], None]: The progress hook function.
     """
-    
+
+    coalescer = ProgressCoalescer(update, download_model)
+
     def progress_hook(hook_data: dict):
-      """Updates the database with the updated downloaded data and emits and update to the downloads web socket.
+      """Passes the progress to the coalescer which updates the database and the downloads web socket at a throttled rate, and stops the download if the downloader was paused.
 
       Args:
         hook_data (dict): The progress hook data received from the yt-dlp downloader.
+
+      Raises:
+        DownloadPaused: If the downloader was paused while the download is transferring.
       """
-      
-      with db.connect() as conn:
-        db.models.Download(conn).update(update.download_id, {
-          "status": DownloadStatus.DOWNLOADING.value,
-          "total_bytes": hook_data["total_bytes"],
-          "downloaded_bytes": hook_data["downloaded_bytes"],
-          "speed": hook_data["speed"],
-          "eta": hook_data.get("eta"),
-          "status_msg": "In progress"
-        })
-
-      update.total_bytes = hook_data["total_bytes"]
-      update.downloaded_bytes = hook_data["downloaded_bytes"]
-      update.speed = hook_data["speed"]
-      update.eta = hook_data.get("eta")
-      update.status_msg = "In progress"
 
-      DownloadsSocket.instance().send_download_update(update)
+      coalescer.push(hook_data)
+
+      if hook_data.get("status") == "downloading" and not Downloader.loop_should_proceed():
+        raise DownloadPaused()
     # END progress_hook
 
     return progress_hook
@@ -100,28 +112,24 @@ class Downloader:
 
 
   @classmethod
-  def _thread_target(cls, resume: bool):
-    """Defines the thread target to pass to the downloader thread when it is created.
+  def _thread_target(cls):
+    """Defines the thread target to pass to each downloader worker thread when it is created.
 
-    Args:
-      resume (bool): Whether to resume downloads that were already in progress.
+    Workers claim and download queued downloads until none are left, waiting between downloads while the loop is paused.
     """
 
-    db_conn = db.connect()
-    download_model = db.models.Download(db_conn)
+    download_model = db.models.Download(db.get_connection())
 
-    if resume:
-      while (next_download := download_model.get_next(DownloadStatus.DOWNLOADING)):
-        cls._download(next_download, download_model)
-    
-    while (next_download := download_model.get_next(DownloadStatus.QUEUED)):
+    while True:
       if not cls.loop_should_proceed():
         cls.await_resume_loop()
-        continue
 
-      cls._download(next_download, download_model)
+      next_download = download_model.claim_next("Awaiting download")
 
-    db_conn.close()
+      if next_download is None:
+        break
+
+      cls._download(next_download, download_model)
   # END _thread_target
 
 
@@ -139,20 +147,15 @@ class Downloader:
     track_name = db_download["track_name"]
     codec = TrackCodec(db_download["codec"])
     bitrate = TrackBitrate(db_download["bitrate"])
-    album_name = db_download["album_name"]
     download_dir = db_download["download_dir"]
     filename = db_download["filename"]
     url = db_download["url"]
-    track_number = db_download["track_number"]
-    disc_number = db_download["disc_number"]
-    release_date = TrackReleaseDate.from_string(db_download["release_date"]) if db_download["release_date"] else None
-    album_cover_path = db_download["album_cover_path"]
-    album_artist = db_download["album_artist"]
-    genre = db_download["genre"]
     download_path = disk.Track.build_path(download_dir, filename, codec)
+    # yt-dlp continues from the part file if there is one, so the persisted progress is replaced with what's actually on disk
+    part_size = disk.Track.get_part_size(download_dir, filename)
 
     def _perform_initial_update() -> DownloadUpdate:
-      """Performs the initial download update using the download data.
+      """Performs the initial download update using the download data, with the progress of any partially downloaded file.
 
       Returns:
         DownloadUpdate: The initial update
@@ -168,16 +171,19 @@ class Downloader:
       update.url = url
       update.created_at = db_download["created_at"]
       update.download_path = download_path
-      update.status_msg = "Awaiting download"
+      update.status_msg = "Resuming download" if part_size else "Awaiting download"
       update.terminated_at = None
-      update.downloaded_bytes = None
-      update.total_bytes = None
+      update.downloaded_bytes = part_size
+      update.total_bytes = db_download["total_bytes"] if part_size else None
       update.eta = None
       update.speed = None
 
-      download_model.update(update.download_id, {
-        "status": update.status.value,
-        "status_msg": update.status_msg
+      download_model.update(download_id, {
+        "status_msg": update.status_msg,
+        "downloaded_bytes": update.downloaded_bytes,
+        "total_bytes": update.total_bytes,
+        "eta": None,
+        "speed": None
       })
       DownloadsSocket.instance().send_download_update(update)
 
@@ -185,109 +191,380 @@ class Downloader:
     # END _perform_initial_update
     
     initial_update = _perform_initial_update()
+    track_info = cls._create_track_info(db_download)
 
-    def _create_track_info() -> NewDownload:
-      """Create track info to pass to yt-dlp for download.
+    if cls._reuse_output(track_info, initial_update, download_model):
+      return
 
-      Returns:
-        NewDownload: The track info.
-      """
-      
-      track_info = NewDownload()
-      track_info.album_name = album_name
-      track_info.track_name = track_name
-      track_info.artist_names = artist_names
-      track_info.bitrate = bitrate
-      track_info.codec = codec
-      track_info.disc_number = disc_number
-      track_info.track_number = track_number
-      track_info.url = url
-      track_info.download_dir = download_dir
-      track_info.release_date = release_date
-      track_info.album_cover_path = album_cover_path
-      track_info.album_artist = album_artist
-      track_info.genre = genre
-      track_info.filename = filename
-
-      return track_info
-    # END _create_track_info
-
-    track_info = _create_track_info()
-    progress_hook = cls._create_progress_hook(initial_update)
-
-    is_success, result = YtDlpClient().download_track(track_info, progress_hook)
-    
-    if is_success:
-      def _update_track_metadata(track: disk.Track):
-        """Updates the downloaded audio file with the track metadata.
-
-        Args:
-          track (disk.Track): The track model instance representing the track on disk.
-        """
-        
-        metadata = disk.Metadata()
-        metadata.track_name = track_name
-        metadata.artist_names = artist_names
-        metadata.album_name = album_name
-        metadata.track_number = track_number
-        metadata.disc_number = disc_number
-        metadata.release_date = release_date
-        metadata.album_cover_path = album_cover_path
-        metadata.album_artist = album_artist
-        metadata.genre = genre
-
-        try:
-          if track_info.codec is TrackCodec.MP3:
-            metadata.set_on_mp3(track.path)
-          elif track_info.codec is TrackCodec.FLAC:
-            metadata.set_on_flac(track.path)
-        except Exception:
-          pass
-      # END _update_track_metadata
-
-      track = cast(disk.Track, result)
-
-      _update_track_metadata(track)
-
-      terminated_at = download_model.get_current_timestamp()
-
-      def _perform_completion_update():
-        """Performs the final download update.
-        """
-        
-        initial_update.status = DownloadStatus.COMPLETED
-        initial_update.status_msg = None
-        initial_update.terminated_at = terminated_at
-
-        completion_update = initial_update
-
-        download_model.set_completed(download_id, terminated_at)
-        DownloadsSocket.instance().send_download_update(completion_update)
-      # END _perform_completion_update
-
-      _perform_completion_update()
-    else:
-      terminated_at = download_model.get_current_timestamp()
-      status_msg = cast(str, result)
+    progress_hook = cls._create_progress_hook(initial_update, download_model)
 
-      def _perform_failed_update():
-        initial_update.status = DownloadStatus.FAILED
-        initial_update.status_msg = status_msg
-        initial_update.terminated_at = terminated_at
+    try:
+      is_success, result = YtDlpClient().download_track(track_info, progress_hook)
+    except DownloadPaused:
+      cls._perform_paused_update(initial_update, download_model)
+      return
+    
+    if not is_success:
+      cls._perform_failed_update(initial_update, download_model, cast(str, result))
+      return
 
-        failed_update = initial_update
+    initial_update.status = DownloadStatus.TRANSCODING
+    initial_update.status_msg = "Transcoding"
 
-        download_model.set_failed(download_id, terminated_at, status_msg)
-        DownloadsSocket.instance().send_download_update(failed_update)
-      # END _perform_failed_update
+    download_model.update(download_id, {
+      "status": initial_update.status.value,
+      "status_msg": initial_update.status_msg
+    })
+    DownloadsSocket.instance().send_download_update(initial_update)
 
-      _perform_failed_update()
+    # hand off to the transcode pool so that this worker can start its next download straight away
+    cls._get_transcode_executor().submit(cls._transcode, cast(disk.Track, result), initial_update)
   # END _download
 
 
+  @staticmethod
+  def _create_track_info(db_download: dict) -> NewDownload:
+    """Creates the track info of a download fetched from the database, to pass to yt-dlp for download and to tag the track with.
+
+    Args:
+      db_download (dict): The download data.
+
+    Returns:
+      NewDownload: The track info.
+    """
+
+    track_info = NewDownload()
+    track_info.album_name = db_download["album_name"]
+    track_info.track_name = db_download["track_name"]
+    track_info.artist_names = TrackArtistNames([db_download["main_artist"], *db_download["other_artists"]])
+    track_info.bitrate = TrackBitrate(db_download["bitrate"])
+    track_info.codec = TrackCodec(db_download["codec"])
+    track_info.disc_number = db_download["disc_number"]
+    track_info.track_number = db_download["track_number"]
+    track_info.url = db_download["url"]
+    track_info.download_dir = db_download["download_dir"]
+    track_info.release_date = TrackReleaseDate.from_string(db_download["release_date"]) if db_download["release_date"] else None
+    track_info.album_cover_path = db_download["album_cover_path"]
+    track_info.album_artist = db_download["album_artist"]
+    track_info.genre = db_download["genre"]
+    track_info.filename = db_download["filename"]
+
+    return track_info
+  # END _create_track_info
+
+
+  @classmethod
+  def _get_transcode_executor(cls) -> ThreadPoolExecutor:
+    """Gets the pool where downloaded audio is transcoded, creating it if it doesn't exist yet.
+
+    Returns:
+      ThreadPoolExecutor: The transcode pool.
+    """
+
+    with cls._executors_lock:
+      if cls._transcode_executor is None:
+        cls._transcode_executor = ThreadPoolExecutor(
+          max_workers=cls.TRANSCODE_WORKER_COUNT,
+          thread_name_prefix="transcode"
+        )
+
+    return cls._transcode_executor
+  # END _get_transcode_executor
+
+
+  @classmethod
+  def _get_tagging_executor(cls) -> ThreadPoolExecutor:
+    """Gets the pool where the metadata of finished track files is set, creating it if it doesn't exist yet.
+
+    Returns:
+      ThreadPoolExecutor: The tagging pool.
+    """
+
+    with cls._executors_lock:
+      if cls._tagging_executor is None:
+        cls._tagging_executor = ThreadPoolExecutor(
+          max_workers=cls.TAGGING_WORKER_COUNT,
+          thread_name_prefix="tagging"
+        )
+
+    return cls._tagging_executor
+  # END _get_tagging_executor
+
+
+  @classmethod
+  def _transcode(cls, track: disk.Track, update: DownloadUpdate):
+    """Transcodes a downloaded track and hands it off to be tagged; runs in the transcode pool.
+
+    Args:
+      track (disk.Track): The track model instance returned from the download.
+      update (DownloadUpdate): The download update data for the download.
+    """
+
+    download_model = db.models.Download(db.get_connection())
+
+    try:
+      is_success, result = YtDlpClient().transcode_track(track)
+
+      if is_success:
+        cls._hand_off_to_tagging(track, update, download_model)
+      else:
+        cls._perform_failed_update(update, download_model, cast(str, result))
+    except Exception:
+      cls._perform_failed_update(update, download_model, "An unexpected error ocurred.")
+  # END _transcode
+
+
+  @classmethod
+  def _hand_off_to_tagging(cls, track: disk.Track, update: DownloadUpdate, download_model: db.models.Download):
+    """Marks a download whose track file is ready as tagging and queues it in the tagging pool, so that the calling worker is free straight away.
+
+    Args:
+      track (disk.Track): The track model instance representing the track on disk.
+      update (DownloadUpdate): The download update data for the download.
+      download_model (db.models.Download): A download model for the calling thread.
+    """
+
+    update.status = DownloadStatus.TAGGING
+    update.status_msg = "Tagging"
+
+    download_model.update(update.download_id, {
+      "status": update.status.value,
+      "status_msg": update.status_msg
+    })
+    DownloadsSocket.instance().send_download_update(update)
+
+    cls._get_tagging_executor().submit(cls._tag, track, update)
+  # END _hand_off_to_tagging
+
+
+  @classmethod
+  def _tag(cls, track: disk.Track, update: DownloadUpdate):
+    """Sets the metadata of a finished track file, indexes it as an output and performs the final download update; runs in the tagging pool.
+
+    Args:
+      track (disk.Track): The track model instance representing the track on disk.
+      update (DownloadUpdate): The download update data for the download.
+    """
+
+    download_model = db.models.Download(db.get_connection())
+
+    try:
+      cls._update_track_metadata(track)
+      cls._index_output(track)
+      cls._perform_completion_update(update, download_model)
+    except Exception:
+      cls._perform_failed_update(update, download_model, "An unexpected error ocurred.")
+  # END _tag
+
+
+  @classmethod
+  def _reuse_output(cls, track_info: NewDownload, update: DownloadUpdate, download_model: db.models.Download) -> bool:
+    """Hands a download off to be tagged with an existing output of the same source video, codec and bitrate if there is one, without downloading or transcoding.
+
+    The output is copied to the download's path, unless it's already there, and the download's metadata is set on it in the tagging pool. Outputs are copied rather than hardlinked since metadata is written in place and would change the original file too.
+
+    Args:
+      track_info (NewDownload): Contains all information about the track.
+      update (DownloadUpdate): The download update data for the download.
+      download_model (db.models.Download): A download model for the calling thread.
+
+    Returns:
+      bool: True if an output was reused, False if the track should be downloaded.
+    """
+
+    output_model = db.models.Output(db.get_connection())
+    outputs = output_model.get_by_source(get_source_id(track_info.url), track_info.codec.value, track_info.bitrate.value)
+
+    for output in outputs:
+      if not cls._is_output_intact(output):
+        output_model.delete(output["id"])
+        continue
+
+      try:
+        track = disk.Track(track_info)
+
+        if os.path.abspath(output["path"]) != os.path.abspath(track.path):
+          # copied next to the destination first so a partial copy never takes the track's place
+          tmp_path = track.path + ".copy"
+          shutil.copyfile(output["path"], tmp_path)
+          os.replace(tmp_path, track.path)
+      except OSError:
+        continue
+
+      cls._hand_off_to_tagging(track, update, download_model)
+
+      return True
+
+    return False
+  # END _reuse_output
+
+
+  @staticmethod
+  def _is_output_intact(output: dict) -> bool:
+    """Checks whether an indexed output file still has the contents it was indexed with.
+
+    Args:
+      output (dict): The output row.
+
+    Returns:
+      bool: True if the file is unchanged, False if it was changed or removed.
+    """
+
+    try:
+      stat = os.stat(output["path"])
+
+      if stat.st_size != output["size"]:
+        return False
+
+      # only hash when the modification time doesn't already show the file is untouched
+      return stat.st_mtime == output["mtime"] or disk.Track.get_content_hash(output["path"]) == output["content_hash"]
+    except OSError:
+      return False
+  # END _is_output_intact
+
+
+  @staticmethod
+  def _index_output(track: disk.Track):
+    """Adds a completed track file to the index of outputs so later downloads of the same source video and format can reuse it.
+
+    Args:
+      track (disk.Track): The track model instance representing the track on disk.
+    """
+
+    track_info = track.track_info
+
+    try:
+      stat = os.stat(track.path)
+
+      db.models.Output(db.get_connection()).upsert({
+        "source_id": get_source_id(track_info.url),
+        "codec": track_info.codec.value,
+        "bitrate": track_info.bitrate.value,
+        "path": os.path.abspath(track.path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "content_hash": disk.Track.get_content_hash(track.path)
+      })
+    except Exception:
+      pass
+  # END _index_output
+
+
+  @staticmethod
+  def _create_metadata(track_info: NewDownload) -> disk.Metadata:
+    """Creates the metadata to set on a track file from its track info.
+
+    Args:
+      track_info (NewDownload): Contains all information about the track.
+
+    Returns:
+      disk.Metadata: The metadata.
+    """
+
+    metadata = disk.Metadata()
+    metadata.track_name = track_info.track_name
+    metadata.artist_names = track_info.artist_names
+    metadata.album_name = track_info.album_name
+    metadata.track_number = track_info.track_number
+    metadata.disc_number = track_info.disc_number
+    metadata.release_date = track_info.release_date
+    metadata.album_cover_path = track_info.album_cover_path
+    metadata.album_artist = track_info.album_artist
+    metadata.genre = track_info.genre
+
+    return metadata
+  # END _create_metadata
+
+
+  @classmethod
+  def _update_track_metadata(cls, track: disk.Track):
+    """Updates the downloaded audio file with the track metadata.
+
+    Args:
+      track (disk.Track): The track model instance representing the track on disk.
+    """
+
+    track_info = track.track_info
+    metadata = cls._create_metadata(track_info)
+
+    try:
+      if track_info.codec is TrackCodec.MP3:
+        metadata.set_on_mp3(track.path)
+      elif track_info.codec is TrackCodec.FLAC:
+        metadata.set_on_flac(track.path)
+    except Exception:
+      pass
+  # END _update_track_metadata
+
+
+  @staticmethod
+  def _perform_completion_update(update: DownloadUpdate, download_model: db.models.Download):
+    """Performs the final download update for a download that completed.
+
+    Args:
+      update (DownloadUpdate): The download update data for the download.
+      download_model (db.models.Download): A download model for the calling thread.
+    """
+
+    update.status = DownloadStatus.COMPLETED
+    update.status_msg = None
+    update.terminated_at = download_model.get_current_timestamp()
+
+    download_model.set_completed(update.download_id, update.terminated_at)
+    DownloadsSocket.instance().send_download_update(update)
+  # END _perform_completion_update
+
+
+  @staticmethod
+  def _perform_failed_update(update: DownloadUpdate, download_model: db.models.Download, status_msg: str):
+    """Performs the final download update for a download that failed.
+
+    Args:
+      update (DownloadUpdate): The download update data for the download.
+      download_model (db.models.Download): A download model for the calling thread.
+      status_msg (str): An error message indicating the error that caused the download to fail.
+    """
+
+    update.status = DownloadStatus.FAILED
+    update.status_msg = status_msg
+    update.terminated_at = download_model.get_current_timestamp()
+
+    download_model.set_failed(update.download_id, update.terminated_at, status_msg)
+    DownloadsSocket.instance().send_download_update(update)
+  # END _perform_failed_update
+
+
+  @staticmethod
+  def _perform_paused_update(update: DownloadUpdate, download_model: db.models.Download):
+    """Performs the download update for a download that was stopped by a pause, putting it back in the queue with its progress so far.
+
+    Args:
+      update (DownloadUpdate): The download update data for the download.
+      download_model (db.models.Download): A download model for the calling thread.
+    """
+
+    update.status = DownloadStatus.QUEUED
+    update.status_msg = "Paused"
+    update.speed = None
+    update.eta = None
+
+    download_model.update(update.download_id, {
+      "status": update.status.value,
+      "status_msg": update.status_msg,
+      "downloaded_bytes": update.downloaded_bytes,
+      "total_bytes": update.total_bytes,
+      "speed": None,
+      "eta": None
+    })
+    DownloadsSocket.instance().send_download_update(update)
+  # END _perform_paused_update
+
+
   @staticmethod
   def queue(tracks: list[NewDownload]) -> list[int]:
-    """Inserts the track info into the database and inserts a download row as queued.
+    """Inserts the track info into the database and inserts download rows as queued, in bulk and in a single transaction.
+
+    Broadcasts a single delta for all the new downloads to the socket.
 
     Args:
       tracks (list[NewDownload]): Metadata and details about tracks that are to be downloaded.
@@ -296,21 +573,18 @@ class Downloader:
       list[int]: The IDs of the newly inserted downloads.
     """
 
-    inserted_ids = []
-
-    with db.connect() as conn:
-      artists_table = db.models.Artist(conn)
-      mdata_table = db.models.Metadata(conn)
-      mdata_artists_table = db.models.MetadataArtist(conn)
-      downloads_table = db.models.Download(conn)
+    conn = db.get_connection()
+    created_at = db.models.Download.get_current_timestamp()
 
-      for track in tracks:
-        other_artist_ids = artists_table.insert_many([
-          { "name": n } 
-          for n in track.artist_names.get_other_artists()
-        ])
+    with conn.transaction():
+      other_artist_ids = db.models.Artist(conn).upsert_many([
+        n
+        for track in tracks
+        for n in track.artist_names.get_other_artists()
+      ])
 
-        metadata_id = mdata_table.insert({
+      metadata_ids = db.models.Metadata(conn).insert_many([
+        {
           "track_name": track.track_name,
           "main_artist": track.artist_names.get_main_artist(),
           "album_name": track.album_name,
@@ -320,46 +594,58 @@ class Downloader:
           "album_cover_path": track.album_cover_path,
           "album_artist": track.album_artist,
           "genre": track.genre
-        })
-        metadata_id = cast(int, metadata_id)
+        }
+        for track in tracks
+      ])
+
+      # other artist IDs are in track order so each track's IDs are the next slice
+      metadata_artists = []
+      artist_id_iter = iter(other_artist_ids)
 
-        mdata_artists_table.insert_many([
-          { "metadata_id": metadata_id, "artist_id": aid }
-          for aid in other_artist_ids
-        ])
+      for track, metadata_id in zip(tracks, metadata_ids):
+        track_artist_ids = [next(artist_id_iter) for _ in track.artist_names.get_other_artists()]
 
-        created_at = downloads_table.get_current_timestamp()
+        for artist_id in dict.fromkeys(track_artist_ids):
+          metadata_artists.append({ "metadata_id": metadata_id, "artist_id": artist_id })
 
-        download_id = downloads_table.insert_as_queued({
-          "url": track.url,
+      db.models.MetadataArtist(conn).insert_many(metadata_artists)
+
+      inserted_ids = db.models.Download(conn).insert_many_as_queued([
+        {
+          "url": track.url or "",
           "codec": track.codec.value,
           "bitrate": track.bitrate.value,
           "metadata_id": metadata_id,
           "created_at": created_at,
           "download_dir": track.download_dir,
           "filename": track.filename
-        })
-
-        inserted_ids.append(download_id)
-
-        update = DownloadUpdate()
-        update.status = DownloadStatus.QUEUED
-        update.download_id = download_id
-        update.artist_names = track.artist_names
-        update.track_name = track.track_name
-        update.codec = track.codec
-        update.bitrate = track.bitrate
-        update.url = track.url
-        update.download_path = disk.Track.build_path(track.download_dir, track.filename, track.codec)
-        update.terminated_at = None
-        update.created_at = created_at
-        update.status_msg = None
-        update.eta = None
-        update.speed = None
-        update.downloaded_bytes = None
-        update.total_bytes = None
-
-        DownloadsSocket.instance().send_download_update(update)
+        }
+        for track, metadata_id in zip(tracks, metadata_ids)
+      ])
+
+    updates = []
+
+    for track, download_id in zip(tracks, inserted_ids):
+      update = DownloadUpdate()
+      update.status = DownloadStatus.QUEUED if track.url else DownloadStatus.RESOLVING
+      update.download_id = download_id
+      update.artist_names = track.artist_names
+      update.track_name = track.track_name
+      update.codec = track.codec
+      update.bitrate = track.bitrate
+      update.url = track.url or ""
+      update.download_path = disk.Track.build_path(track.download_dir, track.filename, track.codec)
+      update.terminated_at = None
+      update.created_at = created_at
+      update.status_msg = None
+      update.eta = None
+      update.speed = None
+      update.downloaded_bytes = None
+      update.total_bytes = None
+
+      updates.append(update)
+
+    DownloadsSocket.instance().send_downloads_added(updates)
 
     return inserted_ids
   # END queue
@@ -367,25 +653,141 @@ class Downloader:
 
   @classmethod
   def start(cls, resume: bool = False) -> bool:
-    """Starts the downloader in a new thread if not already running.
+    """Starts the downloader worker threads if not already running, topping up the pool to `WORKER_COUNT` workers.
 
     Args:
-      resume (bool): Whether to resume downloads that were already downloading.
+      resume (bool): Whether to resume downloads that were already downloading, putting them back at the front of the queue.
 
     Returns:
-      bool: True if the downloader thread was freshly started and not already running, False otherwise.
+      bool: True if any downloader worker thread was freshly started, False if the pool was already full.
     """
 
-    if cls._thread is not None and cls._thread.is_alive():
-      return False
+    with cls._threads_lock:
+      cls._threads = [t for t in cls._threads if t.is_alive()]
+
+      if len(cls._threads) >= cls.WORKER_COUNT:
+        return False
 
-    cls._thread = threading.Thread(target=cls._thread_target, args=[resume], daemon=True)
-    cls._thread.start()
+      # only rows left over from a previous run can be interrupted, rows of live workers are in flight
+      if resume and not cls._threads:
+        cls._resume_interrupted()
+
+      for _ in range(cls.WORKER_COUNT - len(cls._threads)):
+        thread = threading.Thread(target=cls._thread_target, daemon=True)
+        thread.start()
+        cls._threads.append(thread)
 
     return True
   # END start
 
 
+  @classmethod
+  def _resume_interrupted(cls):
+    """Picks up the downloads that were interrupted when the application last exited.
+
+    Downloads interrupted while transcoding whose downloaded audio is still on disk are transcoded again, and downloads interrupted while tagging whose track file is still on disk are tagged again. All other interrupted downloads are put back in the queue.
+    """
+
+    download_model = db.models.Download()
+    resumed_ids = []
+
+    interrupted_ids = [
+      *download_model.get_ids_by_status(DownloadStatus.TRANSCODING),
+      *download_model.get_ids_by_status(DownloadStatus.TAGGING)
+    ]
+
+    for download_id in interrupted_ids:
+      db_download = download_model.get_download(download_id)
+
+      if db_download is not None and cls._resume_stage(db_download, download_model):
+        resumed_ids.append(download_id)
+
+    requeued_ids = download_model.requeue_interrupted(resumed_ids)
+
+    if requeued_ids:
+      DownloadsSocket.instance().get_and_send_downloads_changed(requeued_ids)
+  # END _resume_interrupted
+
+
+  @classmethod
+  def _resume_stage(cls, db_download: dict, download_model: db.models.Download) -> bool:
+    """Hands an interrupted download back to the stage it was interrupted at if the files that stage needs are intact.
+
+    Args:
+      db_download (dict): The download data.
+      download_model (db.models.Download): A download model for the calling thread.
+
+    Returns:
+      bool: True if the download was handed back, False if it has to be downloaded again.
+    """
+
+    try:
+      track = disk.Track(cls._create_track_info(db_download))
+      update = DownloadUpdate.from_row(db_download)
+    except Exception:
+      return False
+
+    if update.status == DownloadStatus.TAGGING and os.path.isfile(track.path) and os.path.getsize(track.path) > 0:
+      cls._hand_off_to_tagging(track, update, download_model)
+      return True
+
+    if update.status == DownloadStatus.TRANSCODING:
+      track.source_path = track.find_source_path()
+
+      if track.source_path is not None:
+        cls._get_transcode_executor().submit(cls._transcode, track, update)
+        return True
+
+    return False
+  # END _resume_stage
+
+
+  @staticmethod
+  def get_page(request: req.GetDownloadsRequest) -> tuple[list[DownloadUpdate], DownloadsCursor | None]:
+    """Gets a page of downloads matching the request's filters.
+
+    Args:
+      request (GetDownloadsRequest): The request for downloads containing the filters, order and pagination.
+
+    Returns:
+      tuple[list[DownloadUpdate], DownloadsCursor | None]: The downloads on the page and the cursor of the next page, None if this is the last page.
+    """
+
+    # one extra row tells whether there is a next page
+    rows = db.models.Download().get_page(
+      statuses=request.statuses,
+      codecs=request.codecs,
+      created_from=request.created_from,
+      created_to=request.created_to,
+      after=(request.cursor.created_at, request.cursor.download_id) if request.cursor else None,
+      limit=request.limit + 1,
+      descending=request.order == "desc"
+    )
+
+    has_next_page = len(rows) > request.limit
+    downloads = [DownloadUpdate.from_row(r) for r in rows[:request.limit]]
+    next_cursor = None
+
+    if has_next_page:
+      last = downloads[-1]
+      next_cursor = DownloadsCursor(last.created_at, last.download_id)
+
+    return downloads, next_cursor
+  # END get_page
+
+
+  @staticmethod
+  def count_by_status() -> dict[str, int]:
+    """Counts all downloads by status.
+
+    Returns:
+      dict[str, int]: The number of downloads keyed by status.
+    """
+
+    return db.models.Download().count_by_status()
+  # END count_by_status
+
+
   @staticmethod
   def requeue(request: req.PostDownloadsRestartRequest) -> int:
     """Sets the status of the given downloads to queued in the database if not already queued/downloading and broadcasts the update to the socket.
@@ -397,12 +799,10 @@ class Downloader:
       int: The number of downloads restarted.
     """
 
-    with db.connect() as conn:
-      dl = db.models.Download(conn)
-      restart_count = dl.requeue(request.download_ids)
+    restart_count = db.models.Download().requeue(request.download_ids)
 
     if restart_count > 0:
-      DownloadsSocket.instance().get_and_send_all_downloads()
+      DownloadsSocket.instance().get_and_send_downloads_changed(request.download_ids)
 
     return restart_count
   # END requeue
@@ -410,7 +810,7 @@ class Downloader:
 
   @staticmethod
   def delete(request: req.DeleteDownloadsRequest) -> int :
-    """Deletes downloads and associated data, and broadcasts the update to the socket.
+    """Deletes downloads that aren't being worked on and their associated data, and broadcasts the update to the socket.
 
     Args:
       request (DeleteDownloadsRequest): The request to delete downloads containing the download IDs.
@@ -419,22 +819,136 @@ class Downloader:
       int: The number of downloads deleted.
     """
     
-    with db.connect() as conn:
+    conn = db.get_connection()
+
+    with conn.transaction():
       dl = db.models.Download(conn)
       metadata_ids = dl.get_metadata_ids(request.download_ids)
 
-      delete_count = dl.delete_many(request.download_ids)
+      deleted_ids = dl.delete_many(request.download_ids)
 
-      if delete_count == 0:
+      if not deleted_ids:
         return 0
       
-      artist_ids =  db.models.MetadataArtist(conn).get_many_artist_ids(metadata_ids)
-      db.models.Artist(conn).delete_many(artist_ids)
+      # artists are shared, so only those no other metadata references anymore are deleted
+      mdata_artists_table = db.models.MetadataArtist(conn)
+      artist_ids = mdata_artists_table.get_many_artist_ids(metadata_ids)
+      mdata_artists_table.delete_many_by_metadata_ids(metadata_ids)
+      db.models.Artist(conn).delete_unreferenced(list(set(artist_ids)))
       db.models.Metadata(conn).delete_many(metadata_ids)
 
-    DownloadsSocket.instance().get_and_send_all_downloads()
+    # only what was actually deleted, active and unknown downloads are left alone
+    DownloadsSocket.instance().send_downloads_removed(deleted_ids)
 
-    return delete_count
+    return len(deleted_ids)
   # END delete
+
+
+  @classmethod
+  def retag(cls, request: req.PostDownloadsRetagRequest) -> tuple[str, int]:
+    """Queues the re-application of the metadata in the database to the files of completed downloads in the tagging pool, skipping files whose tags already match.
+
+    Progress is broadcast to the socket as files are processed, at most every `RETAG_PROGRESS_INTERVAL` seconds and once all files are processed.
+
+    Args:
+      request (PostDownloadsRetagRequest): The request to re-tag downloads containing the download IDs or the directory.
+
+    Returns:
+      tuple[str, int]: The ID the re-tag's progress is reported under and the number of tracks queued.
+    """
+
+    start = time.perf_counter()
+    download_model = db.models.Download(db.get_connection())
+
+    if request.download_ids is not None:
+      download_ids = request.download_ids
+    else:
+      download_ids = download_model.get_ids_in_dir(cast(str, request.directory), DownloadStatus.COMPLETED)
+
+    db_downloads = [d for d in download_model.get_downloads(download_ids) if d["status"] == DownloadStatus.COMPLETED.value]
+    retag_id = uuid.uuid4().hex
+    progress = {
+      "retag_id": retag_id,
+      "track_count": len(db_downloads),
+      "retag_count": 0,
+      "skip_count": 0,
+      "fail_count": 0,
+      "is_done": not db_downloads,
+      "duration": 0.0,
+      "tracks_per_second": 0.0
+    }
+    progress_lock = threading.Lock()
+    last_sent_at = start
+
+    def on_track_done(future: Future):
+      """Counts a processed file and broadcasts the progress if it's due.
+
+      Args:
+        future (Future): The future of the processed file, resolves to what was done with it.
+      """
+
+      nonlocal last_sent_at
+      now = time.perf_counter()
+
+      # sent under the lock so that progress is never broadcast out of order
+      with progress_lock:
+        progress[f"{future.result()}_count"] += 1
+        processed_count = progress["retag_count"] + progress["skip_count"] + progress["fail_count"]
+        progress["is_done"] = processed_count == progress["track_count"]
+
+        if not progress["is_done"] and now - last_sent_at < cls.RETAG_PROGRESS_INTERVAL:
+          return
+
+        last_sent_at = now
+        progress["duration"] = now - start
+        progress["tracks_per_second"] = processed_count / progress["duration"] if progress["duration"] > 0 else 0.0
+        DownloadsSocket.instance().send_retag_progress(dict(progress))
+    # END on_track_done
+
+    with progress_lock:
+      DownloadsSocket.instance().send_retag_progress(dict(progress))
+
+    executor = cls._get_tagging_executor()
+
+    for db_download in db_downloads:
+      executor.submit(cls._retag_track, db_download).add_done_callback(on_track_done)
+
+    return retag_id, len(db_downloads)
+  # END retag
+
+
+  @classmethod
+  def _retag_track(cls, db_download: dict) -> Literal["retag", "skip", "fail"]:
+    """Re-applies the metadata of a completed download to its file unless its tags already match; runs in the tagging pool.
+
+    Args:
+      db_download (dict): The download data.
+
+    Returns:
+      Literal["retag", "skip", "fail"]: What was done with the file.
+    """
+
+    try:
+      track_info = cls._create_track_info(db_download)
+      path = disk.Track.build_path(track_info.download_dir, track_info.filename, track_info.codec)
+      metadata = cls._create_metadata(track_info)
+
+      if track_info.codec is TrackCodec.MP3:
+        is_set, set_on = metadata.is_set_on_mp3, metadata.set_on_mp3
+      else:
+        is_set, set_on = metadata.is_set_on_flac, metadata.set_on_flac
+
+      if is_set(path):
+        return "skip"
+
+      set_on(path)
+    except Exception:
+      return "fail"
+
+    # the file changed, so the output index is brought up to date for later reuse
+    cls._index_output(disk.Track(track_info))
+
+    return "retag"
+  # END _retag_track
     
 # END class Downloader
\ No newline at end of file
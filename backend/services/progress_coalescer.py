@@ -0,0 +1,96 @@
+from user_types import DownloadUpdate, DownloadStatus
+from sockets import DownloadsSocket
+import db
+import time
+
+class ProgressCoalescer:
+  """Coalesces the yt-dlp progress hook calls of a download, throttling how often progress is sent to the downloads socket and persisted to the database.
+
+  The latest progress is always kept in memory on the download update, socket updates are sent at most every `EMIT_INTERVAL` seconds and the database is only written to every `PERSIST_INTERVAL` seconds or when the download changes state.
+
+  Attributes:
+    EMIT_INTERVAL (float): The minimum number of seconds between socket updates (4 Hz).
+    PERSIST_INTERVAL (float): The minimum number of seconds between database writes while the download stays in the same state.
+    _update (DownloadUpdate): The download update data that holds the latest progress of the download.
+    _download_model (db.models.Download): A download model for the thread where the download runs.
+    _last_emit (float | None): The monotonic time of the last socket update, None if none was sent yet.
+    _last_persist (float | None): The monotonic time of the last database write, None if none was made yet.
+    _last_hook_status (str | None): The yt-dlp status of the last progress hook call.
+  """
+
+  EMIT_INTERVAL: float = 0.25
+  PERSIST_INTERVAL: float = 5.0
+
+  _update: DownloadUpdate
+  _download_model: db.models.Download
+  _last_emit: float | None
+  _last_persist: float | None
+  _last_hook_status: str | None
+
+
+  def __init__(self, update: DownloadUpdate, download_model: db.models.Download):
+    self._update = update
+    self._download_model = download_model
+    self._last_emit = None
+    self._last_persist = None
+    self._last_hook_status = None
+  # END __init__
+
+
+  def push(self, hook_data: dict):
+    """Records the progress of a progress hook call, emitting and persisting it if due.
+
+    Args:
+      hook_data (dict): The progress hook data received from the yt-dlp downloader.
+    """
+
+    self._update.total_bytes = hook_data.get("total_bytes") or hook_data.get("total_bytes_estimate")
+    self._update.downloaded_bytes = hook_data.get("downloaded_bytes")
+    self._update.speed = hook_data.get("speed")
+    self._update.eta = hook_data.get("eta")
+    self._update.status_msg = "In progress"
+
+    hook_status = hook_data.get("status")
+    is_transition = hook_status != self._last_hook_status
+    self._last_hook_status = hook_status
+    now = time.monotonic()
+
+    if is_transition or self._last_persist is None or now - self._last_persist >= self.PERSIST_INTERVAL:
+      self._persist(now)
+
+    if is_transition or self._last_emit is None or now - self._last_emit >= self.EMIT_INTERVAL:
+      self._emit(now)
+  # END push
+
+
+  def _persist(self, now: float):
+    """Writes the latest progress to the database.
+
+    Args:
+      now (float): The current monotonic time.
+    """
+
+    self._download_model.update(self._update.download_id, {
+      "status": DownloadStatus.DOWNLOADING.value,
+      "total_bytes": self._update.total_bytes,
+      "downloaded_bytes": self._update.downloaded_bytes,
+      "speed": self._update.speed,
+      "eta": self._update.eta,
+      "status_msg": self._update.status_msg
+    })
+    self._last_persist = now
+  # END _persist
+
+
+  def _emit(self, now: float):
+    """Sends the latest progress to the downloads socket.
+
+    Args:
+      now (float): The current monotonic time.
+    """
+
+    DownloadsSocket.instance().send_download_update(self._update)
+    self._last_emit = now
+  # END _emit
+
+# END class ProgressCoalescer
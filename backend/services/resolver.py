@@ -0,0 +1,133 @@
+from services import YtDlpClient, Downloader
+from .logger import logger
+import user_types.requests as req
+from user_types import DownloadStatus
+from sockets import DownloadsSocket
+import db
+import threading
+
+class Resolver:
+  """A singleton class that finds audio sources for downloads that were queued without a URL, ahead of the downloader.
+
+  Resolving downloads are searched for in batches on the search thread pool, the best ranked search result becomes the download's URL and the download is queued for the downloader workers.
+
+  Attributes:
+    BATCH_SIZE (int): The maximum number of resolving downloads searched for at once.
+    NO_MATCH_MSG (str): The status message of downloads that no search result was found for.
+    ERROR_MSG (str): The status message of downloads whose batch failed unexpectedly.
+    _thread (threading.Thread | None): The resolver thread, None if not running.
+    _thread_lock (threading.Lock): Lock that guards starting and stopping the resolver thread.
+  """
+
+  BATCH_SIZE: int = 20
+  NO_MATCH_MSG: str = "No matching YouTube video was found."
+  ERROR_MSG: str = "An unexpected error ocurred."
+
+  _thread: threading.Thread | None = None
+  _thread_lock: threading.Lock = threading.Lock()
+
+
+  @classmethod
+  def start(cls) -> bool:
+    """Starts the resolver thread if not already running.
+
+    Returns:
+      bool: True if the resolver thread was freshly started, False if it was already running.
+    """
+
+    with cls._thread_lock:
+      if cls._thread is not None:
+        return False
+
+      cls._thread = threading.Thread(target=cls._thread_target, daemon=True)
+      cls._thread.start()
+
+    return True
+  # END start
+
+
+  @classmethod
+  def _thread_target(cls):
+    """Defines the thread target of the resolver thread.
+
+    Resolves batches of resolving downloads until none are left. A batch that fails unexpectedly has its downloads failed so the next batch can go ahead, and the thread is always released so that a later `start` can spawn a new one.
+    """
+
+    try:
+      download_model = db.models.Download(db.get_connection())
+
+      while True:
+        # checked under the lock so downloads queued as the thread stops get a new thread
+        with cls._thread_lock:
+          download_ids = download_model.get_ids_by_status(DownloadStatus.RESOLVING, cls.BATCH_SIZE)
+
+          if not download_ids:
+            cls._thread = None
+            break
+
+        try:
+          cls._resolve(download_model.get_downloads(download_ids), download_model)
+        except Exception:
+          logger.exception(f"Resolving downloads {download_ids} failed.")
+          cls._fail_unresolved(download_ids, download_model)
+    finally:
+      with cls._thread_lock:
+        if cls._thread is threading.current_thread():
+          cls._thread = None
+  # END _thread_target
+
+
+  @staticmethod
+  def _fail_unresolved(download_ids: list[int], download_model: db.models.Download):
+    """Fails the downloads of a batch that are still resolving, so that they aren't picked up again in a loop.
+
+    Args:
+      download_ids (list[int]): The IDs of the downloads in the batch.
+      download_model (db.models.Download): A download model for the resolver thread.
+    """
+
+    failed_ids = []
+
+    for download_id in download_ids:
+      download = download_model.get_download(download_id)
+
+      if download is not None and download["status"] == DownloadStatus.RESOLVING.value:
+        download_model.set_failed(download_id, status_msg=Resolver.ERROR_MSG)
+        failed_ids.append(download_id)
+
+    if failed_ids:
+      DownloadsSocket.instance().get_and_send_downloads_changed(failed_ids)
+  # END _fail_unresolved
+
+
+  @staticmethod
+  def _resolve(db_downloads: list[dict], download_model: db.models.Download):
+    """Searches for the audio sources of downloads, queueing the ones that were matched and failing the rest.
+
+    Args:
+      db_downloads (list[dict]): The resolving downloads fetched from the database.
+      download_model (db.models.Download): A download model for the resolver thread.
+    """
+
+    queries = []
+
+    for db_download in db_downloads:
+      query = req.GetDownloadsSearchRequest()
+      query.main_artist = db_download["main_artist"]
+      query.track_name = db_download["track_name"]
+      queries.append(query)
+
+    for i, (success, result) in YtDlpClient().query_youtube_many(queries):
+      download_id = db_downloads[i]["download_id"]
+
+      if success and result:
+        # search results are ranked best first
+        if download_model.set_resolved(download_id, result[0].url):
+          DownloadsSocket.instance().get_and_send_downloads_changed([download_id])
+          Downloader.start()
+      else:
+        download_model.set_failed(download_id, status_msg=result if not success else Resolver.NO_MATCH_MSG)
+        DownloadsSocket.instance().get_and_send_downloads_changed([download_id])
+  # END _resolve
+
+# END class Resolver
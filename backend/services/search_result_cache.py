@@ -0,0 +1,257 @@
+from user_types import DownloadSearchResult
+from user_types.requests import GetDownloadsSearchRequest
+from collections import OrderedDict
+from typing import Self
+import disk, config
+import threading, time, atexit
+
+class SearchResultCache:
+  """A least-recently-used cache of YouTube search results with a time to live, persisted to the application cache so that it stays warm across restarts.
+
+  Results are keyed on the normalized main artist and track name, so searches differing only in case or spacing share an entry. Changes are written to disk shortly after they're made rather than on every search, and any pending changes are written when the app exits.
+
+  Attributes:
+    hits (int): The number of lookups that were served from the cache.
+    misses (int): The number of lookups that were not in the cache or had expired.
+    _instance (SearchResultCache | None): The singleton instance used throughout the app.
+    _instance_lock (threading.Lock): Guards creating the singleton instance, so that searches running at once on a cold cache share one cache.
+    _file (disk.SearchCache): The file the cache is persisted to.
+    _max_size (int): The maximum number of searches kept.
+    _ttl (float): How long in seconds results are kept for.
+    _entries (OrderedDict[tuple[str, str], tuple[float, list[dict]]]): The cached time and results per key, least recently used first.
+    _lock (threading.Lock): Guards the entries and counters.
+    _write_lock (threading.Lock): Keeps writes to the file in order.
+    _persist_delay (float): How long in seconds after a change the entries are written to the file.
+    _dirty (bool): Whether the entries have changed since they were last written to the file.
+    _persist_timer (threading.Timer | None): The pending write to the file, None if there is none.
+  """
+
+  hits: int
+  misses: int
+  _instance: Self | None = None
+  _instance_lock: threading.Lock = threading.Lock()
+  _file: disk.SearchCache
+  _max_size: int
+  _ttl: float
+  _entries: OrderedDict[tuple[str, str], tuple[float, list[dict]]]
+  _lock: threading.Lock
+  _write_lock: threading.Lock
+  _persist_delay: float
+  _dirty: bool
+  _persist_timer: threading.Timer | None
+
+
+  def __init__(
+    self,
+    path: str | None = None,
+    max_size: int = config.SEARCH_CACHE_SIZE,
+    ttl: float = config.SEARCH_CACHE_TTL,
+    persist_delay: float = config.SEARCH_CACHE_PERSIST_DELAY
+  ):
+    """Loads any unexpired entries persisted by a previous run.
+
+    Args:
+      path (str | None): The path of the file to persist to, the default search cache file if None.
+      max_size (int): The maximum number of searches kept.
+      ttl (float): How long in seconds results are kept for.
+      persist_delay (float): How long in seconds after a change the entries are written to the file.
+    """
+
+    self.hits = 0
+    self.misses = 0
+    self._file = disk.SearchCache(path)
+    self._max_size = max_size
+    self._ttl = ttl
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+    self._write_lock = threading.Lock()
+    self._persist_delay = persist_delay
+    self._dirty = False
+    self._persist_timer = None
+
+    self._load()
+  # END __init__
+
+
+  @classmethod
+  def instance(cls) -> Self:
+    """Gets the singleton instance, creating it on first use, its pending changes are written when the app exits.
+
+    Returns:
+      SearchResultCache: The instance.
+    """
+
+    if cls._instance is None:
+      with cls._instance_lock:
+        if cls._instance is None:
+          cls._instance = cls()
+          atexit.register(cls._instance.flush)
+
+    return cls._instance
+  # END instance
+
+
+  @staticmethod
+  def _make_key(query: GetDownloadsSearchRequest) -> tuple[str, str]:
+    """Normalizes a search query into a cache key.
+
+    Args:
+      query (GetDownloadsSearchRequest): The search query.
+
+    Returns:
+      tuple[str, str]: The normalized main artist and track name.
+    """
+
+    return (
+      " ".join(query.main_artist.split()).casefold(),
+      " ".join(query.track_name.split()).casefold()
+    )
+  # END _make_key
+
+
+  def get(self, query: GetDownloadsSearchRequest) -> list[DownloadSearchResult] | None:
+    """Gets the cached results of a search, counting the lookup as a hit or miss.
+
+    Args:
+      query (GetDownloadsSearchRequest): The search query.
+
+    Returns:
+      list[DownloadSearchResult] | None: The results in their original order, or None if not cached or expired.
+    """
+
+    key = self._make_key(query)
+
+    with self._lock:
+      entry = self._entries.get(key)
+
+      if entry is None or time.time() - entry[0] > self._ttl:
+        self._entries.pop(key, None)
+        self.misses += 1
+        return None
+
+      self._entries.move_to_end(key)
+      self.hits += 1
+      results = entry[1]
+
+    return [self._deserialize_result(r) for r in results]
+  # END get
+
+
+  def set(self, query: GetDownloadsSearchRequest, results: list[DownloadSearchResult]):
+    """Caches the results of a search, evicting the least recently used searches if full, and schedules the cache to be persisted.
+
+    Args:
+      query (GetDownloadsSearchRequest): The search query.
+      results (list[DownloadSearchResult]): The ordered search results.
+    """
+
+    if self._max_size <= 0:
+      return
+
+    key = self._make_key(query)
+
+    with self._lock:
+      self._entries[key] = (time.time(), [dict(r.__dict__) for r in results])
+      self._entries.move_to_end(key)
+
+      while len(self._entries) > self._max_size:
+        self._entries.popitem(last=False)
+
+      self._dirty = True
+
+      if self._persist_timer is None:
+        self._persist_timer = threading.Timer(self._persist_delay, self.flush)
+        # pending changes are written at exit instead, so the timer doesn't hold up shutdown
+        self._persist_timer.daemon = True
+        self._persist_timer.start()
+  # END set
+
+
+  def get_stats(self) -> dict:
+    """Gets the cache's counters.
+
+    Returns:
+      dict: The number of `hits`, `misses` and cached searches (`size`).
+    """
+
+    with self._lock:
+      return { "hits": self.hits, "misses": self.misses, "size": len(self._entries) }
+  # END get_stats
+
+
+  def _load(self):
+    """Loads the unexpired entries from the cache file, least recently used first.
+    """
+
+    data = self._file.read() or []
+    now = time.time()
+
+    for item in data:
+      try:
+        main_artist, track_name, cached_at, results = item
+      except (TypeError, ValueError):
+        continue
+
+      if not isinstance(cached_at, int | float) or now - cached_at > self._ttl or not isinstance(results, list):
+        continue
+
+      self._entries[(main_artist, track_name)] = (cached_at, results)
+
+    while len(self._entries) > self._max_size:
+      self._entries.popitem(last=False)
+  # END _load
+
+
+  def flush(self) -> bool:
+    """Writes the entries to the cache file, least recently used first, if they changed since they were last written.
+
+    Returns:
+      bool: True if the entries were written, False if there were no changes or the write failed.
+    """
+
+    with self._write_lock:
+      with self._lock:
+        if self._persist_timer is not None and self._persist_timer is not threading.current_thread():
+          self._persist_timer.cancel()
+
+        self._persist_timer = None
+
+        if not self._dirty:
+          return False
+
+        data = [[*key, cached_at, results] for key, (cached_at, results) in self._entries.items()]
+        self._dirty = False
+
+      is_success = self._file.write(data)
+
+      if not is_success:
+        # retried on the next change or at exit
+        with self._lock:
+          self._dirty = True
+
+      return is_success
+  # END flush
+
+
+  @staticmethod
+  def _deserialize_result(data: dict) -> DownloadSearchResult:
+    """Creates a search result from its cached form.
+
+    Args:
+      data (dict): The cached search result.
+
+    Returns:
+      DownloadSearchResult: The search result.
+    """
+
+    result = DownloadSearchResult()
+    result.title = data.get("title")
+    result.channel = data.get("channel")
+    result.url = data.get("url")
+    result.duration = data.get("duration")
+    result.thumbnail = data.get("thumbnail")
+
+    return result
+  # END _deserialize_result
+
+# END class SearchResultCache
@@ -1,6 +1,40 @@
-import os, requests, mimetypes, string, secrets, base64, hashlib, threading, time
-import disk
-from urllib.parse import urlencode
+import os, requests, string, secrets, base64, hashlib, threading, time
+import disk, config
+from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Generator
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+class RateLimitRetry(Retry):
+  """A urllib3 retry policy that honours `Retry-After` headers of rate limited responses, capped so that a long rate limit fails fast instead of blocking a request for minutes.
+
+  Transient errors are only retried for the allowed (idempotent) methods. Other methods, e.g the POST of the token exchange, are only retried when rate limited with a `Retry-After`, since the server didn't act on the request.
+
+  Attributes:
+    MAX_RETRY_AFTER (float): The longest `Retry-After` in seconds that is waited for.
+  """
+
+  MAX_RETRY_AFTER: float = 30
+
+
+  def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+    if not self._is_method_retryable(method):
+      return bool(self.total and self.respect_retry_after_header and has_retry_after and status_code == 429)
+
+    return super().is_retry(method, status_code, has_retry_after)
+  # END is_retry
+
+
+  def get_retry_after(self, response) -> float | None:
+    retry_after = super().get_retry_after(response)
+
+    return min(retry_after, self.MAX_RETRY_AFTER) if retry_after is not None else None
+  # END get_retry_after
+
+# END class RateLimitRetry
+
 
 class SpotifyApiClient:
   """Service class that interfaces with the Spotify API.
@@ -12,6 +46,14 @@ class SpotifyApiClient:
     CLIENT_ID (str): The Spotify API client ID of the app.
     REDIRECT_URI (str): The redirect URI to use with the Spotify API.
     WANTED_SCOPES (str): The scopes to ask for for when the user authorizes.
+    PAGE_CONCURRENCY (int): The maximum number of pages fetched concurrently.
+    POOL_SIZE (int): The maximum number of kept-alive connections per host.
+    MAX_RETRIES (int): The maximum number of retries of a request that was rate limited, failed to connect or hit a transient server error.
+    REQUEST_TIMEOUT (float): The connect and read timeout of requests in seconds.
+    _session (requests.Session | None): The session shared by all requests so connections are pooled and kept alive, None until first used.
+    _session_lock (threading.Lock): Guards the creation of the session and the page thread pool.
+    _page_executor (ThreadPoolExecutor | None): The thread pool pages are fetched on, shared so the concurrency cap holds across fetches.
+    _spotify_cache (disk.SpotifyCache): The on-disk cache of fetched playlist items and liked tracks.
     _code_verifier (str | None): The code verifier used in the PKCE flow.
     access_token (str | None): The current access token.
     access_token_duration (str | None): The duration of current the access token.
@@ -24,7 +66,15 @@ class SpotifyApiClient:
   CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
   REDIRECT_URI = os.getenv("SPOTIFY_REDIRECT_URI")
   WANTED_SCOPES = "playlist-read-private user-library-read playlist-read-collaborative"
-
+  PAGE_CONCURRENCY = config.SPOTIFY_PAGE_CONCURRENCY
+  POOL_SIZE = max(10, config.SPOTIFY_PAGE_CONCURRENCY)
+  MAX_RETRIES = 5
+  REQUEST_TIMEOUT = 10
+
+  _session: requests.Session | None = None
+  _session_lock: threading.Lock = threading.Lock()
+  _page_executor: ThreadPoolExecutor | None = None
+  _spotify_cache: disk.SpotifyCache = disk.SpotifyCache()
   _code_verifier: str | None = None
   _refresher_thread: threading.Thread | None = None
 
@@ -33,6 +83,39 @@ class SpotifyApiClient:
   current_user_id: int | None
 
 
+  @classmethod
+  def _get_session(cls) -> requests.Session:
+    """Gets the session shared by all requests, creating it on first use.
+
+    Rate limited responses (429) are retried after their `Retry-After`, and transient errors of GET requests are retried with jittered exponential backoff.
+
+    Returns:
+      requests.Session: The session.
+    """
+
+    with cls._session_lock:
+      if cls._session is None:
+        retry = RateLimitRetry(
+          total=cls.MAX_RETRIES,
+          status_forcelist=(429, 502, 503, 504),
+          allowed_methods=frozenset({ "GET" }),
+          backoff_factor=0.5,
+          backoff_jitter=0.5,
+          respect_retry_after_header=True,
+          # the final response is returned so callers handle it like any other failed response
+          raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=cls.POOL_SIZE, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        cls._session = session
+
+      return cls._session
+  # END _get_session
+
+
   @classmethod
   def _get_code_challenge(cls) -> str:
     """
@@ -112,7 +195,7 @@ class SpotifyApiClient:
     }
 
     # make POST request for access token
-    res = requests.post(cls.TOKEN_URL, data=data)
+    res = cls._get_session().post(cls.TOKEN_URL, data=data, timeout=cls.REQUEST_TIMEOUT)
 
     if res.status_code == 200:
       body: dict = res.json()
@@ -146,7 +229,7 @@ class SpotifyApiClient:
       "client_id": cls.CLIENT_ID
     }
 
-    res = requests.post(cls.TOKEN_URL, data=data)
+    res = cls._get_session().post(cls.TOKEN_URL, data=data, timeout=cls.REQUEST_TIMEOUT)
 
     if res.status_code != 200:
       cls.reset_tokens()
@@ -209,7 +292,7 @@ class SpotifyApiClient:
       return False, None
     
     me_url = f"{cls.API_URL}/me"
-    res = requests.get(url=me_url, headers=cls._get_auth_headers())
+    res = cls._get_session().get(url=me_url, headers=cls._get_auth_headers(), timeout=cls.REQUEST_TIMEOUT)
 
     if res.status_code != 200:
       return False, None
@@ -234,23 +317,128 @@ class SpotifyApiClient:
 
   
   @classmethod
-  def _fetch_all_pages(cls, initial: str):
-    next = initial
-    results = []
-    partial = False
+  def _get_page_executor(cls) -> ThreadPoolExecutor:
+    """Gets the thread pool pages are fetched on, creating it on first use.
+
+    Returns:
+      ThreadPoolExecutor: The thread pool.
+    """
+
+    with cls._session_lock:
+      if cls._page_executor is None:
+        cls._page_executor = ThreadPoolExecutor(max_workers=cls.PAGE_CONCURRENCY, thread_name_prefix="spotify-page")
+
+      return cls._page_executor
+  # END _get_page_executor
+
+
+  @classmethod
+  def _fetch_page(cls, url: str) -> dict:
+    """Fetches a page of a paginated endpoint.
+
+    Args:
+      url (str): The URL of the page.
+
+    Returns:
+      dict: The response body.
+
+    Raises:
+      requests.RequestException: If the request failed or wasn't successful.
+    """
 
-    while next:
-      res = requests.get(next, headers=cls._get_auth_headers())
+    res = cls._get_session().get(url, headers=cls._get_auth_headers(), timeout=cls.REQUEST_TIMEOUT)
+    res.raise_for_status()
 
-      if res.status_code == 200:
-        body = res.json()
-        results.extend(body["items"])
-        next = body["next"]
-      else:
-        next = None
-        partial = True
+    return res.json()
+  # END _fetch_page
+
+
+  @staticmethod
+  def _with_offset(url: str, offset: int) -> str:
+    """Sets the `offset` query parameter of a page URL, keeping the others.
+
+    Args:
+      url (str): The URL of a page.
+      offset (int): The offset.
+
+    Returns:
+      str: The URL of the page at the offset.
+    """
+
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    query["offset"] = [str(offset)]
+
+    return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
+  # END _with_offset
+
+
+  @classmethod
+  def iter_all_pages(cls, initial: str, first: dict | None = None) -> Generator[list, None, None]:
+    """Fetches every page of a paginated endpoint, yielding the items of each page in order as soon as it and the pages before it have arrived.
+
+    The `total` of the first page gives the offsets of the remaining pages, which are fetched concurrently, at most `PAGE_CONCURRENCY` at a time. Pages without a `total` are followed through their `next` links one at a time.
+
+    Args:
+      initial (str): The URL of the first page.
+      first (dict | None): The response body of the first page if it was already fetched.
+
+    Returns:
+      Generator[list, None, None]: Yields the items of each page.
+
+    Raises:
+      requests.RequestException: If a page couldn't be fetched, after the items of the pages before it were yielded.
+    """
+
+    body = first if first is not None else cls._fetch_page(initial)
+    yield body["items"]
+
+    if not body.get("next"):
+      return
+
+    total, limit, offset = body.get("total"), body.get("limit"), body.get("offset")
+
+    if not isinstance(total, int) or not limit or not isinstance(offset, int):
+      next = body["next"]
+
+      while next:
+        body = cls._fetch_page(next)
+        yield body["items"]
+        next = body.get("next")
+
+      return
+
+    urls = (cls._with_offset(body["next"], o) for o in range(offset + limit, total, limit))
+    executor = cls._get_page_executor()
+    pending: deque[Future] = deque()
+
+    try:
+      # keeps at most PAGE_CONCURRENCY pages in flight, topping up as pages are yielded in order
+      for url in urls:
+        pending.append(executor.submit(cls._fetch_page, url))
+
+        if len(pending) >= cls.PAGE_CONCURRENCY:
+          yield pending.popleft().result()["items"]
+
+      while pending:
+        yield pending.popleft().result()["items"]
+    finally:
+      for future in pending:
+        future.cancel()
+  # END iter_all_pages
+
+
+  @classmethod
+  def _fetch_all_pages(cls, initial: str, first: dict | None = None):
+    results = []
+
+    try:
+      for items in cls.iter_all_pages(initial, first):
+        results.extend(items)
+    except requests.RequestException:
+      return True, results
 
-    return partial, results
+    return False, results
 
   @classmethod
   def fetch_user_playlists(cls):
@@ -260,46 +448,175 @@ class SpotifyApiClient:
     return cls._fetch_all_pages(initial)
 
   @classmethod
-  def fetch_playlist_items(cls, url: str):
-    fields="next,items(is_local,track(id,name,duration_ms,type,track_number,disc_number,artists(name),album(images(url),release_date,id,name)))"
+  def _playlist_items_initial_url(cls, url: str):
+    fields="next,total,limit,offset,items(is_local,track(id,name,duration_ms,type,track_number,disc_number,artists(name),album(images(url),release_date,id,name)))"
     limit = 50
     offset = 0
-    initial = f"{url}?limit={limit}&offset={offset}&fields={fields}"
-    return cls._fetch_all_pages(initial)
+    return f"{url}?limit={limit}&offset={offset}&fields={fields}"
+
+  @classmethod
+  def fetch_playlist_items(cls, url: str):
+    return cls._fetch_all_pages(cls._playlist_items_initial_url(url))
+
+  @classmethod
+  def iter_playlist_items(cls, url: str):
+    return cls.iter_all_pages(cls._playlist_items_initial_url(url))
   
   @classmethod
-  def fetch_liked_tracks(cls):
+  def _liked_tracks_initial_url(cls):
     limit = 50
     offset = 0
-    initial = f"https://api.spotify.com/v1/me/tracks?limit={limit}&offset={offset}"
-    return cls._fetch_all_pages(initial)
+    return f"{cls.API_URL}/me/tracks?limit={limit}&offset={offset}"
+
+  @classmethod
+  def fetch_liked_tracks(cls):
+    return cls._fetch_all_pages(cls._liked_tracks_initial_url())
+
+  @classmethod
+  def iter_liked_tracks(cls):
+    return cls.iter_all_pages(cls._liked_tracks_initial_url())
   
   @classmethod
   def playlist_items_url(cls, playlist_id):
     return f"{cls.API_URL}/playlists/{playlist_id}/tracks"
+
+
+  @classmethod
+  def _fetch_if_modified(cls, url: str, etag: str | None) -> tuple[dict | None, str | None]:
+    """Fetches a response body unless it still matches the given `ETag`.
+
+    Args:
+      url (str): The URL to fetch.
+      etag (str | None): The `ETag` of the previously fetched response if there is one.
+
+    Returns:
+      tuple[dict | None, str | None]: The response body, or None if it wasn't modified, and the `ETag` of the current response if there is one.
+
+    Raises:
+      requests.RequestException: If the request failed or wasn't successful.
+    """
+
+    headers = cls._get_auth_headers()
+
+    if etag:
+      headers["If-None-Match"] = etag
+
+    res = cls._get_session().get(url, headers=headers, timeout=cls.REQUEST_TIMEOUT)
+
+    if res.status_code == 304:
+      return None, etag
+
+    res.raise_for_status()
+
+    return res.json(), res.headers.get("ETag")
+  # END _fetch_if_modified
+
+
+  @classmethod
+  def fetch_playlist_items_cached(cls, playlist_id: str, snapshot_id: str | None = None) -> tuple[bool, list]:
+    """Gets the items of a playlist from the on-disk cache if the playlist hasn't changed since they were cached, fetching and caching them otherwise.
+
+    Args:
+      playlist_id (str): The Spotify ID of the playlist.
+      snapshot_id (str | None): The current snapshot ID of the playlist, e.g from the user's playlists, fetched with `If-None-Match` if not given.
+
+    Returns:
+      tuple[bool, list]: Whether the items are partial due to a failed request and the items.
+    """
+
+    key = f"playlist_{playlist_id}"
+    cached = cls._spotify_cache.read(key) or {}
+    etag = cached.get("etag")
+
+    if snapshot_id is None:
+      try:
+        body, etag = cls._fetch_if_modified(f"{cls.API_URL}/playlists/{playlist_id}?fields=snapshot_id", etag)
+      except requests.RequestException:
+        return cls.fetch_playlist_items(cls.playlist_items_url(playlist_id))
+
+      snapshot_id = cached.get("snapshot_id") if body is None else body.get("snapshot_id")
+
+    if snapshot_id is not None and cached.get("snapshot_id") == snapshot_id:
+      return False, cached["items"]
+
+    partial, items = cls.fetch_playlist_items(cls.playlist_items_url(playlist_id))
+
+    if not partial:
+      cls._spotify_cache.write(key, { "snapshot_id": snapshot_id, "etag": etag, "items": items })
+
+    return partial, items
+  # END fetch_playlist_items_cached
+
+
+  @classmethod
+  def fetch_liked_tracks_cached(cls) -> tuple[bool, list]:
+    """Gets the user's liked tracks from the on-disk cache if they haven't changed since they were cached, fetching and caching them otherwise.
+
+    Liked tracks have no snapshot ID, so the first page is revalidated with `If-None-Match` instead. It holds the most recently liked tracks and the total, so it changes whenever tracks are liked or unliked.
+
+    Returns:
+      tuple[bool, list]: Whether the tracks are partial due to a failed request and the tracks.
+    """
+
+    key = "liked_tracks"
+    cached = cls._spotify_cache.read(key) or {}
+    initial = cls._liked_tracks_initial_url()
+
+    try:
+      first, etag = cls._fetch_if_modified(initial, cached.get("etag"))
+    except requests.RequestException:
+      return True, []
+
+    if first is None:
+      return False, cached["items"]
+
+    partial, items = cls._fetch_all_pages(initial, first)
+
+    if not partial and etag:
+      cls._spotify_cache.write(key, { "etag": etag, "items": items })
+
+    return partial, items
+  # END fetch_liked_tracks_cached
+
+
+  @classmethod
+  def invalidate_cache(cls, playlist_id: str | None = None, liked_tracks: bool = False) -> bool:
+    """Deletes cached Spotify data so that it's fetched again on next use.
+
+    Args:
+      playlist_id (str | None): The Spotify ID of a playlist whose cached items to delete.
+      liked_tracks (bool): Whether to delete the cached liked tracks.
+
+    Returns:
+      bool: True if anything was deleted or the whole cache was cleared, False otherwise. Everything is cleared if neither a playlist nor the liked tracks are given.
+    """
+
+    if playlist_id is None and not liked_tracks:
+      return cls._spotify_cache.clear()
+
+    deleted = False
+
+    if playlist_id is not None:
+      deleted = cls._spotify_cache.delete(f"playlist_{playlist_id}") or deleted
+
+    if liked_tracks:
+      deleted = cls._spotify_cache.delete("liked_tracks") or deleted
+
+    return deleted
+  # END invalidate_cache
   
   @staticmethod
   def download_cdn_track_cover(url: str, album_id: str):
-    cover = disk.TrackCover(album_id=album_id)
+    from .cover_prefetcher import CoverPrefetcher
 
     # check if the cover is already downloaded
-    path = cover.search_and_get_path()
+    path = CoverPrefetcher.get_path(album_id)
     if path:
       return path, False
 
-    # fetch track cover otherwise
-    r = requests.get(url)
-    r.raise_for_status()
-    
-    # get ext from content type (including cases with charset specificed, e.g "image/jpeg; charset=UTF-8")
-    content_type = r.headers.get("Content-Type", "")
-    ext = mimetypes.guess_extension(content_type.split(";")[0])
+    # fetch track cover otherwise, joining the download if the cover is already being prefetched
+    path = CoverPrefetcher.prefetch(url, album_id).result()
+    if path:
+      return path, True
 
-    # save cover to disk
-    cover.ext = ext
-    cover.path = cover.build_path()
-    try:
-      cover.write(r.content)
-      return cover.path, True
-    except Exception as e:
-      return None, None
\ No newline at end of file
+    return None, None
\ No newline at end of file
@@ -1,15 +1,217 @@
-import yt_dlp
+import yt_dlp, os, threading, weakref
+from yt_dlp.postprocessor import FFmpegExtractAudioPP
+from yt_dlp.extractor import gen_extractor_classes
 from user_types.requests import GetDownloadsSearchRequest
 from user_types import DownloadSearchResult, NewDownload
-from typing import Callable, Literal
-from yt_dlp.utils import DownloadError, ExtractorError, UnsupportedError
+from typing import Callable, Literal, Generator
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from yt_dlp.utils import DownloadError, ExtractorError, UnsupportedError, DownloadCancelled, DEFAULT_OUTTMPL
 from utils import get_bin_dir
-import disk
+import disk, config
+from services import SearchResultCache
+
+class DownloadPaused(DownloadCancelled):
+  """Raised from a progress hook to stop an in-flight download because the downloader was paused, keeping the partially downloaded file so the download can be continued.
+  """
+
+  pass
+
+# END class DownloadPaused
+
+
+class ProgressHookRelay:
+  """A progress hook registered once on a pooled YoutubeDL instance that forwards progress to the hook of the download currently using the instance.
+
+  Attributes:
+    hook (Callable[[dict], None] | None): The hook of the current download, None if the instance is idle.
+  """
+
+  hook: Callable[[dict], None] | None
+
+
+  def __init__(self):
+    self.hook = None
+  # END __init__
+
+
+  def __call__(self, d: dict):
+    if self.hook is not None:
+      self.hook(d)
+  # END __call__
+
+# END class ProgressHookRelay
+
 
 class YtDlpClient:
   """Service class that interfaces with yt-dlp.
+
+  Constructing a `yt_dlp.YoutubeDL` loads every extractor, so instances are kept in small per-purpose pools and reused, with their per-download output template and progress hook swapped in when acquired.
+
+  Attributes:
+    SEARCH_WORKER_COUNT (int): The maximum number of searches run concurrently for batch searches.
+    YDL_OPTS (dict[str, dict]): The base options of the YoutubeDL instances of each pool, the location of ffmpeg is added to those of the download pool when an instance is created.
+    YDL_POOL_SIZES (dict[str, int]): The maximum number of idle YoutubeDL instances kept in each pool.
+    WARM_UP_URLS (tuple[str, ...]): URLs matched against the extractors on warm-up so their patterns are compiled.
+    _search_executor (ThreadPoolExecutor | None): The thread pool batch searches run on, shared by all requests so the bound holds across them.
+    _search_executor_lock (threading.Lock): Guards the creation of the search thread pool.
+    _ydl_pools (dict[str, list[yt_dlp.YoutubeDL]]): The idle YoutubeDL instances of each pool.
+    _ydl_pools_lock (threading.Lock): Guards the YoutubeDL pools.
+    _progress_relays (weakref.WeakKeyDictionary[yt_dlp.YoutubeDL, ProgressHookRelay]): The progress hook relay registered on each YoutubeDL instance of the download pool.
   """
-  
+
+  SEARCH_WORKER_COUNT = config.SEARCH_WORKER_COUNT
+  YDL_OPTS = {
+    "search": { "skip_download": True, "extract_flat": True },
+    # part files are kept and continued with ranged requests when a download is restarted
+    "download": { "format": "bestaudio/best", "continuedl": True, "nopart": False }
+  }
+  YDL_POOL_SIZES = {
+    "search": config.SEARCH_WORKER_COUNT,
+    "download": config.DOWNLOAD_WORKER_COUNT
+  }
+  WARM_UP_URLS = ("ytsearch5:warm up", "https://www.youtube.com/watch?v=azdwsXLmrHE")
+
+  _search_executor: ThreadPoolExecutor | None = None
+  _search_executor_lock = threading.Lock()
+  _ydl_pools: dict[str, list[yt_dlp.YoutubeDL]] = {}
+  _ydl_pools_lock = threading.Lock()
+  _progress_relays: weakref.WeakKeyDictionary[yt_dlp.YoutubeDL, ProgressHookRelay] = weakref.WeakKeyDictionary()
+
+
+  @classmethod
+  def _get_search_executor(cls) -> ThreadPoolExecutor:
+    """Gets the thread pool that batch searches run on, creating it on first use.
+
+    Returns:
+      ThreadPoolExecutor: The thread pool.
+    """
+
+    with cls._search_executor_lock:
+      if cls._search_executor is None:
+        cls._search_executor = ThreadPoolExecutor(
+          max_workers=cls.SEARCH_WORKER_COUNT,
+          thread_name_prefix="search"
+        )
+
+      return cls._search_executor
+  # END _get_search_executor
+
+
+  @classmethod
+  def _create_ydl(cls, pool: str) -> yt_dlp.YoutubeDL:
+    """Creates a YoutubeDL instance for a pool, registering a progress hook relay on instances of the download pool.
+
+    Args:
+      pool (str): The name of the pool, a key of `YDL_OPTS`.
+
+    Returns:
+      yt_dlp.YoutubeDL: The instance.
+    """
+
+    opts = cls.YDL_OPTS[pool]
+
+    if pool == "download":
+      opts = { **opts, "ffmpeg_location": get_bin_dir() }
+
+    ydl = yt_dlp.YoutubeDL(opts)
+
+    if pool == "download":
+      relay = ProgressHookRelay()
+      ydl.add_progress_hook(relay)
+      cls._progress_relays[ydl] = relay
+
+    return ydl
+  # END _create_ydl
+
+
+  @classmethod
+  @contextmanager
+  def _acquire_ydl(cls, pool: str) -> Generator[yt_dlp.YoutubeDL, None, None]:
+    """Context manager that takes an idle YoutubeDL instance from a pool, or creates one if there is none, and gives it back on exit.
+
+    Instances are used by one thread at a time, instances beyond the pool size are closed instead of being given back.
+
+    Args:
+      pool (str): The name of the pool, a key of `YDL_OPTS`.
+
+    Returns:
+      Generator[yt_dlp.YoutubeDL, None, None]: Yields the YoutubeDL instance.
+    """
+
+    with cls._ydl_pools_lock:
+      idle = cls._ydl_pools.setdefault(pool, [])
+      ydl = idle.pop() if idle else None
+
+    if ydl is None:
+      ydl = cls._create_ydl(pool)
+
+    try:
+      yield ydl
+    finally:
+      with cls._ydl_pools_lock:
+        is_kept = len(idle) < cls.YDL_POOL_SIZES[pool]
+
+        if is_kept:
+          idle.append(ydl)
+
+      if not is_kept:
+        ydl.close()
+  # END _acquire_ydl
+
+
+  @classmethod
+  def warm_up(cls):
+    """Fills the YoutubeDL pools and initializes the YouTube extractors so the first searches and downloads don't pay for it.
+    """
+
+    for pool, size in cls.YDL_POOL_SIZES.items():
+      with cls._ydl_pools_lock:
+        missing = size - len(cls._ydl_pools.setdefault(pool, []))
+
+      ydls = [cls._create_ydl(pool) for _ in range(max(missing, 0))]
+      # the same lookup extract_info does, which compiles the patterns of the extractors tried
+      ie_keys = [next(ie.ie_key() for ie in gen_extractor_classes() if ie.suitable(url)) for url in cls.WARM_UP_URLS]
+
+      for ydl in ydls:
+        for ie_key in ie_keys:
+          ydl.get_info_extractor(ie_key)
+
+      with cls._ydl_pools_lock:
+        idle = cls._ydl_pools[pool]
+        idle.extend(ydls[:max(size - len(idle), 0)])
+  # END warm_up
+
+
+  def query_youtube_many(self, queries: list[GetDownloadsSearchRequest]) -> Generator[tuple[int, tuple[Literal[False], str] | tuple[Literal[True], list[DownloadSearchResult]]], None, None]:
+    """Runs several searches concurrently on the search thread pool, yielding each result as soon as its search completes.
+
+    Searches that haven't started are cancelled if the generator is closed early, e.g when the client disconnects.
+
+    Args:
+      queries (list[GetDownloadsSearchRequest]): The search queries.
+
+    Returns:
+      Generator[tuple[int, tuple[Literal[False], str] | tuple[Literal[True], list[DownloadSearchResult]]], None, None]: Yields the index of each query with the result of `query_youtube` for it, in order of completion.
+    """
+
+    executor = self._get_search_executor()
+    futures = { executor.submit(self.query_youtube, query): i for i, query in enumerate(queries) }
+
+    try:
+      for future in as_completed(futures):
+        try:
+          result = future.result()
+        except Exception:
+          result = (False, "An unexpected error occurred.")
+
+        yield futures[future], result
+    finally:
+      for future in futures:
+        future.cancel()
+  # END query_youtube_many
+
+
   def query_youtube(self, query: GetDownloadsSearchRequest) -> tuple[Literal[False], str] | tuple[Literal[True], list[DownloadSearchResult]]:
     """Scrapes and aggregates search results of YouTube videos that may be downloaded as an audio source based on the query.
 
@@ -20,13 +222,17 @@ class YtDlpClient:
       tuple[Literal[False], str] | tuple[Literal[True], list[DownloadSearchResult]]: On failure the first element is False and the second is a user-friendly error message, otherwise the first element is True and the second is the search results.
     """
     
+    cache = SearchResultCache.instance()
+    cached_results = cache.get(query)
+
+    if cached_results is not None:
+      return True, cached_results
+
     search_query = f"ytsearch5:{query.main_artist} {query.track_name}"
     
     try:
-      info = yt_dlp.YoutubeDL({
-        "skip_download": True,
-        "extract_flat": True
-      }).extract_info(search_query, download=False)
+      with self._acquire_ydl("search") as ydl:
+        info = ydl.extract_info(search_query, download=False)
     except DownloadError as e:
       return False, "Unable to fetch video data."
     except ExtractorError as e:
@@ -59,6 +265,8 @@ class YtDlpClient:
 
         search_results.append(result)
 
+    cache.set(query, search_results)
+
     return True, search_results
   # END query_youtube
 
@@ -67,7 +275,9 @@ class YtDlpClient:
     track_info: NewDownload,
     progress_hook: Callable[[dict], None],
   ) -> tuple[Literal[True], disk.Track] | tuple[Literal[False], str]:
-    """Uses the yt-dlp downloader to download a track.
+    """Uses the yt-dlp downloader to download the raw best audio stream of a track without transcoding it.
+
+    The path of the downloaded stream is set as the `source_path` of the returned track, which should then be passed to `transcode_track`.
 
     Args:
       track_info (NewDownload): Contains all information about the track.
@@ -75,6 +285,9 @@ class YtDlpClient:
 
     Returns:
       tuple[Literal[True], disk.Track] | tuple[Literal[False], str]: A tuple where on download success the first element is True and the second is a track model instance, otherwise the first element is False and the second is an error message indicating the error that occurred.
+
+    Raises:
+      DownloadPaused: If the progress hook paused the download.
     """
 
     try:
@@ -86,21 +299,21 @@ class YtDlpClient:
     except Exception as e:
       return False, "An unexpected error ocurred."
     
-    ydl_opts = {
-      "format": "bestaudio/best",
-      "progress_hooks": [progress_hook],
-      "postprocessors": [{
-        "key": "FFmpegExtractAudio",
-        "preferredcodec": track_info.codec.value,
-        "preferredquality": track_info.bitrate.value,
-      }],
-      "outtmpl": track.output_template,
-      "ffmpeg_location": get_bin_dir()
-    }
-    
     try:
-      with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([track_info.url])
+      with self._acquire_ydl("download") as ydl:
+        relay = self._progress_relays[ydl]
+        # swap in the options of this download, with the other output templates in the normalized form the constructor leaves them in
+        ydl.params["outtmpl"] = { **DEFAULT_OUTTMPL, "default": track.output_template }
+        relay.hook = progress_hook
+
+        try:
+          info = ydl.extract_info(track_info.url, download=True)
+          requested_downloads = info.get("requested_downloads") or [info]
+          track.source_path = requested_downloads[0].get("filepath") or ydl.prepare_filename(info)
+        finally:
+          relay.hook = None
+    except DownloadPaused:
+      raise
     except Exception as e:
       return False, "The download started but failed to complete."
       
@@ -108,6 +321,50 @@ class YtDlpClient:
   # END download_track
 
 
+  def transcode_track(self, track: disk.Track) -> tuple[Literal[True], disk.Track] | tuple[Literal[False], str]:
+    """Uses ffmpeg to transcode a track's downloaded source audio stream to the track's codec and bitrate, removing the source file afterwards.
+
+    Args:
+      track (disk.Track): The track model instance returned from `download_track`.
+
+    Returns:
+      tuple[Literal[True], disk.Track] | tuple[Literal[False], str]: A tuple where on success the first element is True and the second is the track model instance, otherwise the first element is False and the second is an error message indicating the error that occurred.
+    """
+
+    if not track.source_path or not os.path.exists(track.source_path):
+      return False, "The downloaded audio could not be found for transcoding."
+
+    _, source_ext = os.path.splitext(track.source_path)
+    info = {
+      "filepath": track.source_path,
+      "ext": source_ext.lstrip("."),
+      "vcodec": "none"
+    }
+
+    try:
+      # only hosts the postprocessor, so the extractors aren't loaded
+      with yt_dlp.YoutubeDL({ "ffmpeg_location": get_bin_dir() }, auto_init=False) as ydl:
+        pp = FFmpegExtractAudioPP(
+          ydl,
+          preferredcodec=track.track_info.codec.value,
+          preferredquality=track.track_info.bitrate.value
+        )
+        files_to_delete, info = pp.run(info)
+    except Exception as e:
+      return False, "The download completed but failed to transcode."
+
+    for path in files_to_delete:
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+
+    track.source_path = None
+
+    return True, track
+  # END transcode_track
+
+
   def _order_entries(self, entries: list, query: GetDownloadsSearchRequest) -> list[dict]:
     """Orders search result entries based on how well they align with the search query.
 
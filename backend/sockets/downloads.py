@@ -1,33 +1,60 @@
+from flask import request
 from flask_socketio import Namespace
-from user_types import DownloadUpdate, DownloadStatus, TrackArtistNames, TrackCodec, TrackBitrate
-import db, disk
+from user_types import DownloadUpdate
+import db
 from typing import Self
-import sqlite3
+from collections import deque
+import sqlite3, threading, uuid
 
 class DownloadsSocket(Namespace):
   """Socket namespace that deals with downloads.
 
+  Every change to the downloads is broadcast as a delta tagged with a monotonic sequence number and the sequence number it follows on from. Clients keep the last sequence number they applied and, when they reconnect or notice a gap, ask for the changes since then instead of the whole downloads history.
+
+  Since every change goes through the socket, it also keeps a write-through snapshot of all serialized downloads so that clients are brought up to date from memory rather than the database.
+
   Attributes:
-    DOWNLOAD_UPDATE_EVENT (str): The name of the event for download upates.
     DOWNLOAD_INIT_EVENT (str): The name of the event for sending all downloads (downloads initialization).
+    DOWNLOADS_DELTA_EVENT (str): The name of the event for sending downloads that were added, changed or removed.
+    DOWNLOADS_SYNC_EVENT (str): The name of the event clients emit to get the changes since a sequence number.
+    RETAG_PROGRESS_EVENT (str): The name of the event for sending the progress of a bulk re-tag.
+    LOG_SIZE (int): The maximum number of changes kept for clients catching up, older clients get all downloads.
     _db_conn (sqlite3.Connection | None): A singleton database connection instance used by the app.
     _instance (DownloadsSocket | None): A singleton instance of the class to use throughout the rest of the app.
+    _epoch (str): Identifies this instance's sequence so sequence numbers from before a restart aren't trusted.
+    _seq (int): The sequence number of the last change sent.
+    _log (deque[tuple[int, int, bool]]): The most recent changes as (sequence number, download ID, whether the download was removed).
+    _snapshot (dict[int, dict] | None): The serialized downloads keyed by ID, None until first loaded from the database.
+    _lock (threading.Lock): Keeps sequence numbers in the order events are emitted and guards the snapshot.
   """
 
-  DOWNLOAD_UPDATE_EVENT = "download_update"
   DOWNLOAD_INIT_EVENT = "download_init"
+  DOWNLOADS_DELTA_EVENT = "downloads_delta"
+  DOWNLOADS_SYNC_EVENT = "downloads_sync"
+  RETAG_PROGRESS_EVENT = "retag_progress"
   NAMESPACE = "/downloads"
+  LOG_SIZE = 10000
 
   _db_conn: sqlite3.Connection | None
   _instance: Self | None = None
+  _epoch: str
+  _seq: int
+  _log: deque[tuple[int, int, bool]]
+  _snapshot: dict[int, dict] | None
+  _lock: threading.Lock
 
 
   def __init__(self, db_conn: sqlite3.Connection | None = None):
     """Stores the database connection as well as the current instance in the class as a singleton instance.
     """
-    
+
     super().__init__(self.NAMESPACE)
     self._db_conn = db_conn
+    self._epoch = uuid.uuid4().hex
+    self._seq = 0
+    self._log = deque(maxlen=self.LOG_SIZE)
+    self._snapshot = None
+    self._lock = threading.Lock()
     DownloadsSocket._instance = self
   # END __init__
 
@@ -42,7 +69,7 @@ class DownloadsSocket(Namespace):
     Raises:
       RuntimeError: If the instance was not yet created.
     """
-    
+
     if cls._instance is None:
       raise RuntimeError("DownloadsSocket instance was accessed before it was created")
 
@@ -50,11 +77,14 @@ class DownloadsSocket(Namespace):
   # END instance
 
 
-  def on_connect(self):
-    """Sends a list of all downloads when a client connects to the namespace.
+  def on_connect(self, auth: dict | None = None):
+    """Brings a connecting client up to date, sending only the changes since its last sequence number if it has one.
+
+    Args:
+      auth (dict | None): The client's auth data, may contain the `epoch` and `seq` it last applied.
     """
 
-    self.get_and_send_all_downloads()
+    self.sync(request.sid, auth)
   # END on_connect
 
 
@@ -63,72 +93,245 @@ class DownloadsSocket(Namespace):
   # END on_disconnect
 
 
-  def get_and_send_all_downloads(self):
+  def on_downloads_sync(self, data: dict | None = None):
+    """Sends a client the changes since its last sequence number, e.g after it missed an event.
+
+    Args:
+      data (dict | None): The `epoch` and `seq` the client last applied.
+    """
+
+    self.sync(request.sid, data)
+  # END on_downloads_sync
+
+
+  def sync(self, to: str, since: dict | None = None):
+    """Sends a client the changes since the given sequence number, or all downloads if they're no longer known.
+
+    Args:
+      to (str): The session ID of the client.
+      since (dict | None): The `epoch` and `seq` the client last applied.
+    """
+
+    since = since if isinstance(since, dict) else {}
+    seq = since.get("seq")
+
+    with self._lock:
+      oldest_seq = self._log[0][0] if self._log else self._seq + 1
+
+      if (
+        since.get("epoch") != self._epoch
+        or not isinstance(seq, int)
+        or seq < oldest_seq - 1
+        or seq > self._seq
+      ):
+        self._send_all_downloads_unlocked(to)
+        return
+
+      # only the latest change per download matters
+      removed_by_id: dict[int, bool] = {}
+
+      for entry_seq, download_id, removed in self._log:
+        if entry_seq > seq:
+          removed_by_id[download_id] = removed
+
+      snapshot = self._get_snapshot_unlocked()
+
+      self.emit(self.DOWNLOADS_DELTA_EVENT, {
+        "epoch": self._epoch,
+        "since": seq,
+        "seq": self._seq,
+        "added": [],
+        "changed": [snapshot[i] for i in removed_by_id if i in snapshot],
+        "removed": [i for i in removed_by_id if i not in snapshot]
+      }, room=to)
+  # END sync
+
+
+  def get_and_send_all_downloads(self, to: str | None = None):
     """Gets and sends a list of all downloads.
+
+    Args:
+      to (str | None): The session ID of the client to send to, all clients if None.
     """
-    
-    db_conn = self._db_conn
-    created_conn = False
-
-    if not db_conn:
-      db_conn = db.connect()
-      created_conn = True
-
-    dl = db.models.Download(db_conn)
-    downloads = dl.get_all_downloads()
-
-    download_updates = []
-
-    for d in downloads:
-      codec = TrackCodec(d["codec"])
-
-      d_update = DownloadUpdate()
-      d_update.download_id = d["download_id"]
-      d_update.status = DownloadStatus(d["status"])
-      d_update.artist_names = TrackArtistNames([d["main_artist"], *d["other_artists"]])
-      d_update.track_name = d["track_name"]
-      d_update.codec = codec
-      d_update.bitrate = TrackBitrate(d["bitrate"])
-      d_update.url = d["url"]
-      d_update.download_path = disk.Track.build_path(d["download_dir"], d["filename"], codec)
-      d_update.created_at = d["created_at"]
-      d_update.total_bytes = d["total_bytes"]
-      d_update.downloaded_bytes = d["downloaded_bytes"]
-      d_update.speed = d["speed"]
-      d_update.eta = d["eta"]
-      d_update.terminated_at = d["terminated_at"]
-      d_update.status_msg = d["status_msg"]
-
-      download_updates.append(d_update)
-
-    self.send_all_downloads(download_updates)
-
-    if created_conn:
-      db_conn.close()
+
+    with self._lock:
+      self._send_all_downloads_unlocked(to)
   # END get_and_send_all_downloads
 
 
-  def send_all_downloads(self, downloads: list[DownloadUpdate]):
-    """Emits the `downloads_init` event sending a list of downloads.
+  def _send_all_downloads_unlocked(self, to: str | None = None):
+    """Sends all downloads from the snapshot along with the current sequence number, the caller must hold the lock.
+
+    Args:
+      to (str | None): The session ID of the client to send to, all clients if None.
+    """
+
+    self._emit_init(list(self._get_snapshot_unlocked().values()), to)
+  # END _send_all_downloads_unlocked
+
+
+  def _get_snapshot_unlocked(self) -> dict[int, dict]:
+    """Gets the snapshot of all serialized downloads, loading it from the database on first use, the caller must hold the lock.
+
+    Returns:
+      dict[int, dict]: The serialized downloads keyed by ID.
+    """
+
+    if self._snapshot is None:
+      dl = db.models.Download(self._db_conn or db.get_connection())
+      self._snapshot = {
+        d["download_id"]: DownloadUpdate.from_row(d).get_serializable()
+        for d in dl.get_all_downloads()
+      }
+
+    return self._snapshot
+  # END _get_snapshot_unlocked
+
+
+  def _get_download_updates(self, download_ids: list[int]) -> list[DownloadUpdate]:
+    """Gets the current state of the given downloads.
+
+    Args:
+      download_ids (list[int]): The IDs of the downloads.
+
+    Returns:
+      list[DownloadUpdate]: The downloads that still exist.
+    """
+
+    dl = db.models.Download(self._db_conn or db.get_connection())
+
+    return [DownloadUpdate.from_row(d) for d in dl.get_downloads(download_ids)]
+  # END _get_download_updates
+
+
+  def send_all_downloads(self, downloads: list[DownloadUpdate], to: str | None = None):
+    """Emits the `download_init` event sending a list of downloads and the sequence number they're current as of.
 
     Args:
       downloads (list[DownloadUpdate]): The list of downloads to send.
+      to (str | None): The session ID of the client to send to, all clients if None.
     """
-    
-    self.emit(self.DOWNLOAD_INIT_EVENT, {
-      "downloads": [d.get_serializable() for d in downloads]
-    })
+
+    self._emit_init([d.get_serializable() for d in downloads], to)
   # END send_all_downloads
 
 
+  def _emit_init(self, downloads: list[dict], to: str | None = None):
+    """Emits the `download_init` event with already serialized downloads.
+
+    Args:
+      downloads (list[dict]): The serialized downloads.
+      to (str | None): The session ID of the client to send to, all clients if None.
+    """
+
+    self.emit(self.DOWNLOAD_INIT_EVENT, {
+      "epoch": self._epoch,
+      "seq": self._seq,
+      "downloads": downloads
+    }, room=to)
+  # END _emit_init
+
+
+  def send_delta(
+    self,
+    added: list[DownloadUpdate] | None = None,
+    changed: list[DownloadUpdate] | None = None,
+    removed: list[int] | None = None
+  ):
+    """Emits the `downloads_delta` event under the next sequence number and records it for clients catching up.
+
+    Args:
+      added (list[DownloadUpdate] | None): The downloads that were added.
+      changed (list[DownloadUpdate] | None): The downloads that changed.
+      removed (list[int] | None): The IDs of the downloads that were removed.
+    """
+
+    added = added or []
+    changed = changed or []
+    removed = removed or []
+
+    with self._lock:
+      snapshot = self._get_snapshot_unlocked()
+      serialized_added = [d.get_serializable() for d in added]
+      # a download may be deleted while a worker is still reporting on it, which must not bring it back
+      serialized_changed = [d.get_serializable() for d in changed if d.download_id in snapshot]
+
+      if not serialized_added and not serialized_changed and not removed:
+        return
+
+      self._seq += 1
+
+      for d in [*serialized_added, *serialized_changed]:
+        snapshot[d["download_id"]] = d
+        self._log.append((self._seq, d["download_id"], False))
+
+      for download_id in removed:
+        snapshot.pop(download_id, None)
+        self._log.append((self._seq, download_id, True))
+
+      self.emit(self.DOWNLOADS_DELTA_EVENT, {
+        "epoch": self._epoch,
+        "since": self._seq - 1,
+        "seq": self._seq,
+        "added": serialized_added,
+        "changed": serialized_changed,
+        "removed": removed
+      })
+  # END send_delta
+
+
+  def send_downloads_added(self, downloads: list[DownloadUpdate]):
+    """Sends a batch of newly queued downloads as a delta.
+
+    Args:
+      downloads (list[DownloadUpdate]): The list of newly queued downloads.
+    """
+
+    self.send_delta(added=downloads)
+  # END send_downloads_added
+
+
   def send_download_update(self, update: DownloadUpdate):
-    """Emits the `download_update` event sending a download update.
+    """Sends a download update as a delta.
 
     Args:
       update (DownloadUpdate): The download update.
     """
 
-    self.emit(self.DOWNLOAD_UPDATE_EVENT, update.get_serializable())
+    self.send_delta(changed=[update])
   # END send_download_update
-  
-# END class DownloadsSocket
\ No newline at end of file
+
+
+  def get_and_send_downloads_changed(self, download_ids: list[int]):
+    """Gets the current state of the given downloads and sends them as a delta.
+
+    Args:
+      download_ids (list[int]): The IDs of the downloads that changed.
+    """
+
+    self.send_delta(changed=self._get_download_updates(download_ids))
+  # END get_and_send_downloads_changed
+
+
+  def send_downloads_removed(self, download_ids: list[int]):
+    """Sends the IDs of deleted downloads as a delta.
+
+    Args:
+      download_ids (list[int]): The IDs of the downloads that were removed.
+    """
+
+    self.send_delta(removed=download_ids)
+  # END send_downloads_removed
+
+
+  def send_retag_progress(self, progress: dict):
+    """Emits the `retag_progress` event with the progress of a bulk re-tag, which isn't a change to the downloads so it's sent outside the sequence of deltas.
+
+    Args:
+      progress (dict): The progress, see `Downloader.retag`.
+    """
+
+    self.emit(self.RETAG_PROGRESS_EVENT, progress)
+  # END send_retag_progress
+
+# END class DownloadsSocket
@@ -3,6 +3,7 @@ import sqlite3, os
 from typing import Generator, Callable
 import db
 from pathlib import Path
+from services import SearchResultCache, YtDlpClient
 
 @pytest.fixture
 def in_memory_db_conn() -> Generator[sqlite3.Connection, None, None]:
@@ -73,4 +74,40 @@ def seeded_app_db(app_db: sqlite3.Connection) -> Generator[Callable[[str], sqlit
   # END _make_seeded_db
   
   yield _make_seeded_db
-# END seeded_app_db
\ No newline at end of file
+# END seeded_app_db
+
+
+@pytest.fixture(autouse=True)
+def search_result_cache(tmp_path: Path) -> Generator[SearchResultCache, None, None]:
+  """Fixture that gives each test an empty search result cache persisted to a temporary directory, so tests neither share results nor touch the user's cache.
+
+  Args:
+    tmp_path (Path): A temporary directory provided by pytest.
+
+  Returns:
+    Generator[SearchResultCache, None, None]: Yields the cache instance used by the app.
+  """
+
+  SearchResultCache._instance = SearchResultCache(str(tmp_path / "search_cache.json"))
+
+  yield SearchResultCache._instance
+
+  SearchResultCache._instance.flush()
+  SearchResultCache._instance = None
+# END search_result_cache
+
+
+@pytest.fixture(autouse=True)
+def ydl_pools() -> Generator[dict, None, None]:
+  """Fixture that gives each test empty YoutubeDL pools, so patches of `yt_dlp.YoutubeDL` aren't bypassed by instances pooled by earlier tests.
+
+  Returns:
+    Generator[dict, None, None]: Yields the pools used by the app.
+  """
+
+  YtDlpClient._ydl_pools = {}
+
+  yield YtDlpClient._ydl_pools
+
+  YtDlpClient._ydl_pools = {}
+# END ydl_pools
\ No newline at end of file
@@ -0,0 +1,112 @@
+import db
+import pytest
+import threading
+from db.connect import PRAGMAS
+from pathlib import Path
+from unittest.mock import patch
+
+class TestConnect:
+  """Contains unit tests for the database connection helpers.
+  """
+
+  def test_connect_applies_pragmas(self, tmp_path: Path):
+    """Verifies that the database is put into WAL mode once and that every connection gets the configured pragmas.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    path = str(tmp_path / "db.sqlite")
+    conn = db.connect(path)
+
+    with patch("db.connect.DATABASE_PRAGMAS", { "journal_mode": "DELETE" }):
+      other_conn = db.connect(path)
+
+    for c in (conn, other_conn):
+      assert c.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+      assert c.execute("PRAGMA synchronous").fetchone()[0] == 1 # NORMAL
+      assert c.execute("PRAGMA busy_timeout").fetchone()[0] == PRAGMAS["busy_timeout"]
+      c.close()
+  # END test_connect_applies_pragmas
+
+
+  def test_get_connection_is_pooled_per_thread(self, tmp_path: Path):
+    """Verifies that a thread always gets the same pooled connection and that different threads get different ones.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    path = str(tmp_path / "db.sqlite")
+    conn = db.get_connection(path)
+    other_thread_conns = []
+
+    thread = threading.Thread(target=lambda: other_thread_conns.append(db.get_connection(path)))
+    thread.start()
+    thread.join()
+
+    assert db.get_connection(path) is conn
+    assert other_thread_conns[0] is not conn
+  # END test_get_connection_is_pooled_per_thread
+
+
+  def test_get_connection_closes_on_thread_exit(self, tmp_path: Path):
+    """Verifies that a thread's pooled connection is closed once the thread exits.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    path = str(tmp_path / "db.sqlite")
+    thread_conns = []
+    closed_conns = []
+    closed = threading.Event()
+
+    def close(conn: db.Connection):
+      closed_conns.append(conn)
+      closed.set()
+    # END close
+
+    # the thread's data is released as it exits, which may be just after it's joined
+    with patch.object(db.Connection, "close", close):
+      thread = threading.Thread(target=lambda: thread_conns.append(db.get_connection(path)))
+      thread.start()
+      thread.join()
+
+      assert closed.wait(timeout=5)
+
+    assert closed_conns == thread_conns
+  # END test_get_connection_closes_on_thread_exit
+
+
+  def test_transaction_defers_commits(self, app_db: db.Connection):
+    """Verifies that model commits inside a transaction are deferred to the end of it and rolled back on an exception.
+
+    Args:
+      app_db (db.Connection): Fixture value that provides a database connection to an in-memory database set up with application's schema.
+    """
+
+    artists = db.models.Artist(app_db)
+
+    with app_db.transaction():
+      artists.insert({ "name": "Queen" })
+
+      assert app_db.in_transaction
+
+    assert not app_db.in_transaction
+
+    with pytest.raises(RuntimeError):
+      with app_db.transaction():
+        artists.insert({ "name": "Daft Punk" })
+
+        with app_db.transaction():
+          artists.insert({ "name": "Led Zeppelin" })
+
+        raise RuntimeError()
+
+    names = [row["name"] for row in app_db.execute("SELECT name FROM artists")]
+
+    assert names == ["Queen"]
+  # END test_transaction_defers_commits
+
+# END class TestConnect
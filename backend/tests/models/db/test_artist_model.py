@@ -0,0 +1,105 @@
+import db
+import sqlite3
+import pytest
+from pathlib import Path
+
+class TestArtist:
+  """Contains unit tests for the Artist database model.
+  """
+
+  def test_upsert_many(self, app_db: sqlite3.Connection):
+    """Verifies that artist names are inserted once and that IDs are returned in input order, including for existing and repeated names.
+
+    Args:
+      app_db (sqlite3.Connection): A connection to an in-memory database set up with the application's schema.
+    """
+
+    artist_table = db.models.Artist(app_db)
+    existing_ids = artist_table.upsert_many(["Queen"])
+
+    ids = artist_table.upsert_many(["Paul McCartney", "Queen", "Paul McCartney"])
+
+    assert ids[1] == existing_ids[0]
+    assert ids[0] == ids[2]
+    assert app_db.execute("SELECT COUNT(*) FROM artists").fetchone()[0] == 2
+    assert artist_table.upsert_many([]) == []
+  # END test_upsert_many
+
+
+  def test_delete_unreferenced(self, app_db: sqlite3.Connection):
+    """Verifies that only artists no longer referenced by any metadata are deleted.
+
+    Args:
+      app_db (sqlite3.Connection): A connection to an in-memory database set up with the application's schema.
+    """
+
+    shared_id, orphan_id = db.models.Artist(app_db).upsert_many(["Queen", "Paul McCartney"])
+    app_db.execute("INSERT INTO metadata_artists (metadata_id, artist_id) VALUES (1, ?)", (shared_id,))
+
+    deleted = db.models.Artist(app_db).delete_unreferenced([shared_id, orphan_id])
+
+    assert deleted == 1
+    assert [row["id"] for row in app_db.execute("SELECT id FROM artists")] == [shared_id]
+  # END test_delete_unreferenced
+
+
+  def test_upsert_many_caches_ids(self, tmp_path: Path):
+    """Verifies that IDs of upserted names are served from the cache, that rolled back names aren't cached and that deleted artists are dropped from it.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    conn = db.connect(str(tmp_path / "db.sqlite"))
+    db.setup(conn)
+    artist_table = db.models.Artist(conn)
+    statements = []
+    queen_id, = artist_table.upsert_many(["Queen"])
+
+    conn.set_trace_callback(statements.append)
+
+    assert artist_table.upsert_many(["Queen"]) == [queen_id]
+    assert not any(f"FROM {artist_table.TABLE}" in sql for sql in statements)
+
+    conn.set_trace_callback(None)
+
+    with pytest.raises(RuntimeError):
+      with conn.transaction():
+        artist_table.upsert_many(["Daft Punk"])
+        raise RuntimeError()
+
+    assert (conn.path, "Daft Punk") not in db.models.Artist._id_cache
+    assert artist_table.delete_unreferenced([queen_id]) == 1
+    assert (conn.path, "Queen") not in db.models.Artist._id_cache
+
+    new_queen_id, = artist_table.upsert_many(["Queen"])
+
+    assert conn.execute("SELECT name FROM artists WHERE id = ?", (new_queen_id,)).fetchone()["name"] == "Queen"
+
+    conn.close()
+  # END test_upsert_many_caches_ids
+
+
+  def test_setup_dedupes_existing_artists(self, in_memory_db_conn: sqlite3.Connection):
+    """Verifies that setting up a database created before artist names were unique merges the duplicate artists.
+
+    Args:
+      in_memory_db_conn (sqlite3.Connection): A connection to an in-memory database.
+    """
+
+    in_memory_db_conn.executescript("""
+CREATE TABLE artists (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE metadata_artists (metadata_id INTEGER, artist_id INTEGER, PRIMARY KEY (metadata_id, artist_id));
+INSERT INTO artists (id, name) VALUES (1, 'Queen'), (2, 'Queen'), (3, 'Queen');
+INSERT INTO metadata_artists (metadata_id, artist_id) VALUES (1, 1), (2, 2), (2, 3);
+""")
+
+    db.setup(in_memory_db_conn)
+
+    assert [tuple(row) for row in in_memory_db_conn.execute("SELECT id, name FROM artists")] == [(1, "Queen")]
+    assert [tuple(row) for row in in_memory_db_conn.execute(
+      "SELECT metadata_id, artist_id FROM metadata_artists ORDER BY metadata_id"
+    )] == [(1, 1), (2, 1)]
+  # END test_setup_dedupes_existing_artists
+
+# END class TestArtist
@@ -1,5 +1,5 @@
 import db
-from user_types import DownloadStatus
+from user_types import DownloadStatus, TrackCodec
 import sqlite3
 import pytest
 from typing import Callable
@@ -93,4 +93,193 @@ class TestDownloadModel:
       assert included_data.items() <= next_in_queue.items()
   # END test_get_next
 
+
+  def test_requeue_interrupted(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that the requeue_interrupted method sets only active rows that aren't excluded back to queued, clearing their status message.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    dl = db.models.Download(seeded_app_db("next_in_queue_1"))
+    dl.update(1, { "status": DownloadStatus.DOWNLOADING.value, "status_msg": "Awaiting download" })
+    dl.update(2, { "status": DownloadStatus.TAGGING.value })
+
+    assert dl.get_next(DownloadStatus.DOWNLOADING)["download_id"] == 1
+    assert dl.get_ids_by_status(DownloadStatus.TAGGING) == [2]
+    assert dl.requeue_interrupted([2]) == [1]
+    assert dl.get_next(DownloadStatus.DOWNLOADING) is None
+    assert dl.get_download(1)["status"] == DownloadStatus.QUEUED.value
+    assert dl.get_download(1)["status_msg"] is None
+    assert dl.get_download(2)["status"] == DownloadStatus.TAGGING.value
+    assert dl.requeue_interrupted() == [2]
+  # END test_requeue_interrupted
+
+
+  def test_claim_next(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that the claim_next method claims queued downloads one at a time in queue order, tie-breaking on ID.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    dl = db.models.Download(seeded_app_db("next_in_queue_1"))
+    first = dl.claim_next("Awaiting download")
+
+    assert first["download_id"] == 1
+    assert first["status"] == DownloadStatus.DOWNLOADING.value
+    assert first["status_msg"] == "Awaiting download"
+    assert first["other_artists"] == ["Paul McCartney"]
+    assert dl.claim_next()["download_id"] == 2
+    assert dl.claim_next() is None
+    assert dl.get_next(DownloadStatus.QUEUED) is None
+  # END test_claim_next
+
+
+  def test_insert_many_as_queued(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that the insert_many_as_queued method inserts all rows as queued and returns their IDs in order.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    dl = db.models.Download(seeded_app_db("next_in_queue_1"))
+    ids = dl.insert_many_as_queued([
+      {
+        "url": f"https://www.youtube.com/watch?v={i}",
+        "codec": "mp3",
+        "bitrate": "192",
+        "metadata_id": None,
+        "download_dir": "/home/user/music",
+        "filename": f"track_{i}"
+      }
+      for i in range(3)
+    ])
+
+    assert ids == [3, 4, 5]
+    assert all(dl.get_download(id)["status"] == DownloadStatus.QUEUED.value for id in ids)
+    assert [dl.get_download(id)["filename"] for id in ids] == ["track_0", "track_1", "track_2"]
+    assert dl.insert_many_as_queued([]) == []
+  # END test_insert_many_as_queued
+
+
+  def test_set_resolved(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that downloads inserted without a URL are resolving until set_resolved queues them, and are resolving again when requeued before that.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    dl = db.models.Download(seeded_app_db("next_in_queue_1"))
+    resolving_id, failed_id = dl.insert_many_as_queued([
+      {
+        "url": None,
+        "codec": "mp3",
+        "bitrate": "192",
+        "metadata_id": None,
+        "download_dir": "/home/user/music",
+        "filename": f"track_{i}"
+      }
+      for i in range(2)
+    ])
+
+    assert dl.get_ids_by_status(DownloadStatus.RESOLVING, 10) == [resolving_id, failed_id]
+    assert dl.get_download(resolving_id)["url"] == ""
+
+    dl.set_failed(failed_id, status_msg="No match")
+    assert dl.requeue([failed_id]) == 1
+    assert dl.get_download(failed_id)["status"] == DownloadStatus.RESOLVING.value
+
+    assert dl.set_resolved(resolving_id, "https://www.youtube.com/watch?v=a") is True
+    assert dl.set_resolved(resolving_id, "https://www.youtube.com/watch?v=b") is False
+
+    download = dl.get_download(resolving_id)
+    assert download["status"] == DownloadStatus.QUEUED.value
+    assert download["url"] == "https://www.youtube.com/watch?v=a"
+    assert dl.get_ids_by_status(DownloadStatus.RESOLVING, 10) == [failed_id]
+  # END test_set_resolved
+
+
+  def test_get_downloads(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that the get_downloads method selects only the existing downloads of the given IDs with their metadata.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    dl = db.models.Download(seeded_app_db("next_in_queue_1"))
+    downloads = dl.get_downloads([1, 99])
+
+    assert [d["download_id"] for d in downloads] == [1]
+    assert downloads[0]["other_artists"] == ["Paul McCartney"]
+    assert dl.get_downloads([]) == []
+  # END test_get_downloads
+
+
+  def test_get_ids_in_dir(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that the get_ids_in_dir method selects the downloads of a status in a directory and its subdirectories only, matching case.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    dl = db.models.Download(seeded_app_db("next_in_queue_1"))
+    ids = dl.insert_many_as_queued([
+      {
+        "url": f"https://www.youtube.com/watch?v={i}",
+        "codec": "mp3",
+        "bitrate": "192",
+        "metadata_id": None,
+        "download_dir": download_dir,
+        "filename": f"track_{i}"
+      }
+      for i, download_dir in enumerate(["/home/user/music/queen/", "/home/user/music_2", "/home/user/musicx", "/home/user/MUSIC/queen"])
+    ])
+
+    assert dl.get_ids_in_dir("/home/user/music", DownloadStatus.QUEUED) == [1, 2, ids[0]]
+    assert dl.get_ids_in_dir("/home/user/music/", DownloadStatus.QUEUED) == [1, 2, ids[0]]
+    assert dl.get_ids_in_dir("/home/user/music/queen", DownloadStatus.QUEUED) == [ids[0]]
+    assert dl.get_ids_in_dir("/home/user/MUSIC", DownloadStatus.QUEUED) == [ids[3]]
+    assert dl.get_ids_in_dir("/home/user/music_", DownloadStatus.QUEUED) == []
+    assert dl.get_ids_in_dir("/home/user/music", DownloadStatus.COMPLETED) == []
+  # END test_get_ids_in_dir
+
+
+  def test_get_page(self, app_db: sqlite3.Connection):
+    """Verifies that the get_page method filters downloads and paginates them by creation time then ID.
+
+    Args:
+      app_db (sqlite3.Connection): A connection to an in-memory database set up with the application's schema.
+    """
+
+    dl = db.models.Download(app_db)
+    metadata_id = db.models.Metadata(app_db).insert({ "track_name": "Radio Ga Ga", "main_artist": "Queen" })
+    dl.insert_many([
+      {
+        "url": f"https://www.youtube.com/watch?v={i}",
+        "codec": "mp3" if i % 2 else "flac",
+        "bitrate": "320",
+        "metadata_id": metadata_id,
+        "status": DownloadStatus.COMPLETED.value if i < 3 else DownloadStatus.QUEUED.value,
+        "download_dir": "/home/user/music",
+        "filename": f"track_{i}",
+        "created_at": f"2025-10-0{1 + i // 2} 12:00:00"
+      }
+      for i in range(5)
+    ]) # ids 1-5, ids 1 & 2 and 3 & 4 share a creation time
+
+    first_page = dl.get_page(limit=2)
+    last = first_page[-1]
+    second_page = dl.get_page(limit=2, after=(last["created_at"], last["download_id"]))
+
+    assert [d["download_id"] for d in first_page] == [5, 4]
+    assert [d["download_id"] for d in second_page] == [3, 2]
+    assert first_page[0]["other_artists"] == []
+    assert [d["download_id"] for d in dl.get_page(descending=False, after=("2025-10-02 12:00:00", 3))] == [4, 5]
+    assert [d["download_id"] for d in dl.get_page(statuses=[DownloadStatus.COMPLETED], codecs=[TrackCodec.MP3])] == [2]
+    assert [d["download_id"] for d in dl.get_page(created_from="2025-10-02 00:00:00", created_to="2025-10-02 23:59:59")] == [4, 3]
+    assert dl.count_by_status()[DownloadStatus.QUEUED.value] == 2
+    assert dl.count_by_status()[DownloadStatus.FAILED.value] == 0
+  # END test_get_page
+
 # END class TestDownloadModel
\ No newline at end of file
@@ -0,0 +1,99 @@
+import subprocess, threading
+from disk.album_cover import AlbumCover
+from unittest.mock import patch
+from pathlib import Path
+import config
+
+class TestAlbumCover:
+  """Contains unit tests for the AlbumCover class.
+  """
+
+  def test_normalize(self, tmp_path: Path):
+    """Verifies that the normalize method converts large covers once, keeps small covers as they are and falls back to the cover when it can't be converted.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    small_path = tmp_path / "small.png"
+    small_path.write_bytes(b"\0" * config.COVER_NORMALIZE_MIN_BYTES)
+    large_path = tmp_path / "large.png"
+    large_path.write_bytes(b"\0" * (config.COVER_NORMALIZE_MIN_BYTES + 1))
+
+    def run(args: list[str], **kwargs) -> subprocess.CompletedProcess:
+      Path(args[-1]).write_bytes(b"jpeg data")
+      return subprocess.CompletedProcess(args, 0)
+
+    with (
+      patch.object(AlbumCover, "NORMALIZED_DIR", str(tmp_path / "normalized")),
+      patch("disk.album_cover.shutil.which", return_value="ffmpeg"),
+      patch("disk.album_cover.subprocess.run", side_effect=run) as mock_run
+    ):
+      assert AlbumCover(str(small_path)).normalize() == str(small_path)
+
+      normalized_path = AlbumCover(str(large_path)).normalize()
+
+      assert normalized_path != str(large_path)
+      assert normalized_path.endswith(".jpg")
+      assert Path(normalized_path).read_bytes() == b"jpeg data"
+      assert AlbumCover(str(large_path)).normalize() == normalized_path
+      assert mock_run.call_count == 1
+
+    large_path.write_bytes(b"\0" * (config.COVER_NORMALIZE_MIN_BYTES + 2))
+
+    with (
+      patch.object(AlbumCover, "NORMALIZED_DIR", str(tmp_path / "normalized")),
+      patch("disk.album_cover.shutil.which", return_value=None)
+    ):
+      assert AlbumCover(str(large_path)).normalize() == str(large_path)
+  # END test_normalize
+
+
+  def test_normalize_concurrently(self, tmp_path: Path):
+    """Verifies that the normalize method converts different covers in parallel and the same cover once when called from several threads.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    cover_paths = []
+
+    for i in range(2):
+      cover_path = tmp_path / f"cover{i}.png"
+      cover_path.write_bytes(b"\0" * (config.COVER_NORMALIZE_MIN_BYTES + 1))
+      cover_paths.append(str(cover_path))
+
+    # only passed once a conversion of each cover is running at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def run(args: list[str], **kwargs) -> subprocess.CompletedProcess:
+      barrier.wait()
+      Path(args[-1]).write_bytes(b"jpeg data")
+      return subprocess.CompletedProcess(args, 0)
+
+    results = []
+
+    def normalize(cover_path: str):
+      results.append(AlbumCover(cover_path).normalize())
+
+    with (
+      patch.object(AlbumCover, "NORMALIZED_DIR", str(tmp_path / "normalized")),
+      patch("disk.album_cover.shutil.which", return_value="ffmpeg"),
+      patch("disk.album_cover.subprocess.run", side_effect=run) as mock_run
+    ):
+      threads = [threading.Thread(target=normalize, args=(cover_path,)) for cover_path in cover_paths * 2]
+
+      for thread in threads:
+        thread.start()
+
+      for thread in threads:
+        thread.join()
+
+    assert not barrier.broken
+    assert mock_run.call_count == 2
+    assert len(set(results)) == 2
+    assert all(result not in cover_paths for result in results)
+    assert AlbumCover._normalize_locks == {}
+  # END test_normalize_concurrently
+
+# END class TestAlbumCover
@@ -0,0 +1,92 @@
+import os, threading, time
+from disk import AlbumCoverCache
+from unittest.mock import patch
+from pathlib import Path
+
+class TestAlbumCoverCache:
+  """Contains unit tests for the AlbumCoverCache class.
+  """
+
+  def test_get(self, tmp_path: Path):
+    """Verifies that the get method serves repeated lookups from memory and reads a cover again once the file changes.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    cover_path = tmp_path / "cover.jpg"
+    cover_path.write_bytes(b"jpeg data")
+    cache = AlbumCoverCache(max_bytes=1024, max_entries=8)
+
+    assert cache.get(str(cover_path)) == (b"jpeg data", "image/jpeg")
+    assert cache.get(str(cover_path)) == (b"jpeg data", "image/jpeg")
+    assert cache.get_stats() == { "hits": 1, "misses": 1, "size": 1, "bytes": 9 }
+
+    cover_path.write_bytes(b"new jpeg data")
+    os.utime(cover_path, ns=(0, 0))
+
+    assert cache.get(str(cover_path)) == (b"new jpeg data", "image/jpeg")
+    assert cache.get_stats()["bytes"] == 13
+  # END test_get
+
+
+  def test_get_evicts_least_recently_used(self, tmp_path: Path):
+    """Verifies that covers are evicted least recently used first to stay within the size bound and that covers larger than it aren't cached.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    paths = []
+
+    for i, size in enumerate([400, 400, 400, 2000]):
+      path = tmp_path / f"cover_{i}.png"
+      path.write_bytes(b"\0" * size)
+      paths.append(str(path))
+
+    cache = AlbumCoverCache(max_bytes=1000, max_entries=8)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+    cache.get(paths[3])
+
+    assert list(cache._entries) == [paths[0], paths[2]]
+    assert cache.get_stats()["bytes"] == 800
+  # END test_get_evicts_least_recently_used
+
+
+  def test_instance(self):
+    """Verifies that threads getting the singleton instance for the first time at once share one instance.
+    """
+
+    init = AlbumCoverCache.__init__
+
+    def slow_init(self: AlbumCoverCache):
+      time.sleep(0.05)
+      init(self)
+
+    instances = []
+    barrier = threading.Barrier(4)
+
+    def get_instance():
+      barrier.wait()
+      instances.append(AlbumCoverCache.instance())
+
+    with (
+      patch.object(AlbumCoverCache, "_instance", None),
+      patch.object(AlbumCoverCache, "__init__", slow_init)
+    ):
+      threads = [threading.Thread(target=get_instance) for _ in range(4)]
+
+      for thread in threads:
+        thread.start()
+
+      for thread in threads:
+        thread.join()
+
+    assert len(instances) == 4
+    assert all(instance is instances[0] for instance in instances)
+  # END test_instance
+
+# END class TestAlbumCoverCache
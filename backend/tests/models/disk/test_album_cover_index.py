@@ -0,0 +1,72 @@
+import threading, time
+from disk import AlbumCoverIndex
+from unittest.mock import patch
+from pathlib import Path
+
+class TestAlbumCoverIndex:
+  """Contains unit tests for the AlbumCoverIndex class.
+  """
+
+  def test_get(self, tmp_path: Path):
+    """Verifies that covers are found from the scanned directory and from writes, and that other files are left out.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    (tmp_path / "a1.jpg").write_bytes(b"jpeg data")
+    (tmp_path / "a2.jpg.123.tmp").write_bytes(b"partial")
+    (tmp_path / "normalized").mkdir()
+    index = AlbumCoverIndex(str(tmp_path))
+
+    assert index.get("a1") == str(tmp_path / "a1.jpg")
+    assert index.get("a2") is None
+    assert index.get("normalized") is None
+
+    (tmp_path / "a2.png").write_bytes(b"png data")
+
+    assert index.get("a2") is None
+    assert index.add(str(tmp_path / "a2.png")) is True
+    assert index.add(str(tmp_path / "normalized" / "a3.jpg")) is False
+    assert index.get("a2") == str(tmp_path / "a2.png")
+    assert index.contains(str(tmp_path / "a2.png")) is True
+    assert index.contains(str(tmp_path / "a3.png")) is False
+    assert index.contains(str(tmp_path / "elsewhere" / "a1.jpg")) is None
+    assert index.build() == 2
+  # END test_get
+
+
+  def test_instance(self):
+    """Verifies that threads getting the singleton instance for the first time at once share one instance.
+    """
+
+    init = AlbumCoverIndex.__init__
+
+    def slow_init(self: AlbumCoverIndex, dir: str):
+      time.sleep(0.05)
+      init(self, dir)
+
+    instances = []
+    barrier = threading.Barrier(4)
+
+    def get_instance():
+      barrier.wait()
+      instances.append(AlbumCoverIndex.instance())
+
+    with (
+      patch.object(AlbumCoverIndex, "_instance", None),
+      patch.object(AlbumCoverIndex, "__init__", slow_init)
+    ):
+      threads = [threading.Thread(target=get_instance) for _ in range(4)]
+
+      for thread in threads:
+        thread.start()
+
+      for thread in threads:
+        thread.join()
+
+    assert len(instances) == 4
+    assert all(instance is instances[0] for instance in instances)
+  # END test_instance
+
+# END class TestAlbumCoverIndex
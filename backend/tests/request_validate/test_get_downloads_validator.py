@@ -0,0 +1,86 @@
+from request_validate import GetDownloadsValidator
+from werkzeug.datastructures import MultiDict
+from user_types.reponses import GetDownloadsResponse
+from user_types.requests import GetDownloadsRequest
+from user_types import DownloadStatus, TrackCodec, DownloadsCursor
+import pytest
+
+class TestGetDownloadsValidator:
+  """Unit tests for methods of the GetDownloadsValidator class.
+  """
+
+  @pytest.mark.parametrize("params, parameter", [
+    (MultiDict({ "status": "queued,paused" }), "status"),
+    (MultiDict({ "codec": "wav" }), "codec"),
+    (MultiDict({ "created_from": "06/10/2025" }), "created_from"),
+    (MultiDict({ "created_to": "2025-13-01" }), "created_to"),
+    (MultiDict({ "order": "newest" }), "order"),
+    (MultiDict({ "limit": "0" }), "limit"),
+    (MultiDict({ "limit": str(GetDownloadsValidator.MAX_LIMIT + 1) }), "limit"),
+    (MultiDict({ "limit": "ten" }), "limit"),
+    (MultiDict({ "cursor": "not-a-cursor" }), "cursor"),
+  ])
+  def test_validate_bad_request(self, params: MultiDict, parameter: str):
+    """Verifies that invalid parameters are rejected and the offending parameter is reported.
+
+    Args:
+      params (MultiDict): The request parameters.
+      parameter (str): The parameter expected to fail validation.
+    """
+
+    is_valid, result = GetDownloadsValidator().validate(params)
+
+    assert is_valid is False
+    assert isinstance(result, GetDownloadsResponse.BadRequest)
+    assert result.parameter == parameter
+    assert isinstance(result.message, str)
+  # END test_validate_bad_request
+
+
+  def test_validate_defaults(self):
+    """Verifies that missing parameters fall back to the first page of all downloads, newest first.
+    """
+
+    is_valid, result = GetDownloadsValidator().validate(MultiDict())
+
+    assert is_valid is True
+    assert isinstance(result, GetDownloadsRequest)
+    assert result.statuses == []
+    assert result.codecs == []
+    assert result.created_from is None
+    assert result.created_to is None
+    assert result.order == "desc"
+    assert result.limit == GetDownloadsValidator.DEFAULT_LIMIT
+    assert result.cursor is None
+  # END test_validate_defaults
+
+
+  def test_validate_good_request(self):
+    """Verifies that list, date and cursor parameters are parsed.
+    """
+
+    cursor = DownloadsCursor("2025-10-06 14:32:15", 42)
+    params = MultiDict([
+      ("status", "completed,failed"),
+      ("status", "failed"),
+      ("codec", "mp3"),
+      ("created_from", "2025-10-01"),
+      ("created_to", "2025-10-06"),
+      ("order", "asc"),
+      ("limit", "20"),
+      ("cursor", cursor.encode())
+    ])
+
+    is_valid, result = GetDownloadsValidator().validate(params)
+
+    assert is_valid is True
+    assert result.statuses == [DownloadStatus.COMPLETED, DownloadStatus.FAILED]
+    assert result.codecs == [TrackCodec.MP3]
+    assert result.created_from == "2025-10-01 00:00:00"
+    assert result.created_to == "2025-10-06 23:59:59"
+    assert result.order == "asc"
+    assert result.limit == 20
+    assert (result.cursor.created_at, result.cursor.download_id) == (cursor.created_at, cursor.download_id)
+  # END test_validate_good_request
+
+# END class TestGetDownloadsValidator
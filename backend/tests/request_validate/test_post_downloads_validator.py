@@ -71,6 +71,29 @@ def validate_required_string_fixture(request: pytest.FixtureRequest) -> tuple[di
 # END validate_required_string_fixture
 
 
+@pytest.fixture(params=[
+  # (download test value, assertion type)
+  ({}, ValidationCase.VALID),
+  ({ "url": None }, ValidationCase.VALID),
+  ({ "url": "" }, ValidationCase.VALID),
+  ({ "url": 343 }, ValidationCase.INVALID),
+  ({ "url": ["abcd"] }, ValidationCase.INVALID),
+  ({ "url": "abcd" }, ValidationCase.VALID)
+])
+def validate_url_fixture(request: pytest.FixtureRequest) -> tuple[dict, ValidationCase]:
+  """Parametrized fixture providing test cases for the test__validate_url method.
+  
+  Args:
+    request (pytest.FixtureRequest): Provides the current parameter.
+
+  Returns:
+    tuple[dict, ValidationCase]: The parameter; is a tuple containing the mock download and the assertion type of the test case.
+  """
+  
+  return request.param
+# END validate_url_fixture
+
+
 @pytest.fixture(params=[
   # (download test value, assertion type)
   ({}, ValidationCase.VALID),
@@ -199,6 +222,30 @@ class TestPostDownloadsValidator:
     elif assertion is ValidationCase.VALID:
       assert isinstance(validation_result, str)
           
+    else:
+      raise ValueError("Unknown assertion type")
+  # test__validate_required_string
+
+
+  def test__validate_url(self, validate_url_fixture: tuple[dict, ValidationCase]):
+    """Verifies that the _validate_url method validates the HTTP request body correctly with respect to an optional URL field.
+
+    Args:
+      validate_url_fixture (tuple[dict, ValidationCase]): The parametrized fixture value containing the request body test case and the assertion type.
+    """
+    
+    body_test_value, assertion = validate_url_fixture
+    validator = PostDownloadsValidator()
+    validation_result = validator._validate_url(body_test_value)
+
+    if assertion is ValidationCase.INVALID:
+      assert validation_result is False
+      assert validator._response.field == "url"
+      assert isinstance(validator._response.message, str)
+
+    elif assertion is ValidationCase.VALID:
+      assert validation_result is None or isinstance(validation_result, str)
+          
     else:
       raise ValueError("Unknown assertion type")
   # test__validate_url
@@ -1,4 +1,12 @@
 from flask.testing import FlaskClient
+from services import SearchResultCache, Downloader
+from user_types import DownloadSearchResult
+from user_types.requests import GetDownloadsSearchRequest
+from unittest.mock import patch, MagicMock
+from concurrent.futures import Future
+from typing import Callable
+from pathlib import Path
+import json, sqlite3, db
 
 def test_get_downloads_search_400(flask_app_test_client: FlaskClient):
   """Integration test that tests that a bad request to the GET /downloads/search endpoint responds correctly.
@@ -30,3 +38,129 @@ def test_get_downloads_search_200(flask_app_test_client: FlaskClient):
   assert "results" in res.json
   assert isinstance(res.json["results"], list)
 # END test_get_downloads_search_200
+
+
+
+def test_get_downloads_400(flask_app_test_client: FlaskClient):
+  """Integration test that tests that a bad request to the GET /downloads endpoint responds correctly.
+
+  Args:
+    flask_app_test_client (FlaskClient): The Flask test client provided by the respective fixture.
+  """
+
+  res = flask_app_test_client.get("/downloads?status=paused")
+
+  assert res.status_code == 400
+  assert res.json["parameter"] == "status"
+  assert isinstance(res.json["message"], str)
+# END test_get_downloads_400
+
+def test_post_downloads_search_batch_400(flask_app_test_client: FlaskClient):
+  """Integration test that tests that a bad request to the POST /downloads/search/batch endpoint responds correctly.
+
+  Args:
+    flask_app_test_client (FlaskClient): The Flask test client provided by the respective fixture.
+  """
+
+  res = flask_app_test_client.post("/downloads/search/batch", json={
+    "queries": [{ "main_artist": "Queen", "track_name": "Radio Ga Ga" }, { "main_artist": "Queen" }]
+  })
+
+  assert res.status_code == 400
+  assert res.json["field"] == "track_name"
+  assert res.json["item_index"] == 1
+  assert isinstance(res.json["message"], str)
+# END test_post_downloads_search_batch_400
+
+
+def test_post_downloads_retag_400(flask_app_test_client: FlaskClient):
+  """Integration test that tests that bad requests to the POST /downloads/retag endpoint respond correctly.
+
+  Args:
+    flask_app_test_client (FlaskClient): The Flask test client provided by the respective fixture.
+  """
+
+  res = flask_app_test_client.post("/downloads/retag", json={ "download_ids": [1], "directory": "/home/user/music" })
+
+  assert res.status_code == 400
+  assert res.json["field"] == ""
+  assert isinstance(res.json["message"], str)
+
+  res = flask_app_test_client.post("/downloads/retag", json={ "download_ids": [0] })
+
+  assert res.status_code == 400
+  assert res.json["field"] == "download_ids"
+# END test_post_downloads_retag_400
+
+
+def test_post_downloads_retag_202(flask_app_test_client: FlaskClient, seeded_app_db: Callable[[str | None], sqlite3.Connection], tmp_path: Path):
+  """Integration test that tests that a good request to the POST /downloads/retag endpoint queues the files in the tagging pool and is accepted without waiting for the re-tag.
+
+  Args:
+    flask_app_test_client (FlaskClient): The Flask test client provided by the respective fixture.
+    seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    tmp_path (Path): A temporary directory provided by pytest.
+  """
+
+  conn = seeded_app_db("next_in_queue_1")
+  download_model = db.models.Download(conn)
+  download_model.update(1, { "download_dir": str(tmp_path) })
+  download_model.set_completed(1, download_model.get_current_timestamp())
+
+  # the re-tag is left pending, the in-memory database can't be used from the pool's threads
+  executor = MagicMock()
+  executor.submit.return_value = Future()
+
+  with (
+    patch("db.get_connection", return_value=conn),
+    patch("services.downloader.DownloadsSocket.instance", return_value=MagicMock()),
+    patch.object(Downloader, "_get_tagging_executor", return_value=executor)
+  ):
+    res = flask_app_test_client.post("/downloads/retag", json={ "directory": str(tmp_path) })
+
+  assert res.status_code == 202
+  assert isinstance(res.json["retag_id"], str)
+  assert res.json["track_count"] == 1
+  assert isinstance(res.json["message"], str)
+  assert executor.submit.call_count == 1
+# END test_post_downloads_retag_202
+
+
+def test_post_downloads_search_batch_200(flask_app_test_client: FlaskClient, search_result_cache: SearchResultCache):
+  """Integration test that tests that a good request to the POST /downloads/search/batch endpoint streams a line per query.
+
+  Args:
+    flask_app_test_client (FlaskClient): The Flask test client provided by the respective fixture.
+    search_result_cache (SearchResultCache): The app's search result cache, seeded so that no searches hit YouTube.
+  """
+
+  queries = [
+    { "main_artist": "Queen", "track_name": "Radio Ga Ga" },
+    { "main_artist": "Daft Punk", "track_name": "One More Time" }
+  ]
+
+  for i, q in enumerate(queries):
+    query = GetDownloadsSearchRequest()
+    query.main_artist = q["main_artist"]
+    query.track_name = q["track_name"]
+
+    result = DownloadSearchResult()
+    result.title = q["track_name"]
+    result.channel = None
+    result.url = f"https://www.youtube.com/watch?v={i}"
+    result.duration = None
+    result.thumbnail = None
+
+    search_result_cache.set(query, [result])
+
+  res = flask_app_test_client.post("/downloads/search/batch", json={ "queries": queries })
+
+  assert res.status_code == 200
+  assert res.mimetype == "application/x-ndjson"
+
+  items = sorted((json.loads(line) for line in res.get_data(as_text=True).splitlines()), key=lambda i: i["item_index"])
+
+  assert [i["item_index"] for i in items] == [0, 1]
+  assert all(i["status"] == 200 for i in items)
+  assert [i["results"][0]["url"] for i in items] == ["https://www.youtube.com/watch?v=0", "https://www.youtube.com/watch?v=1"]
+# END test_post_downloads_search_batch_200
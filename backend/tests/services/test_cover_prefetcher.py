@@ -0,0 +1,100 @@
+import threading, time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Generator
+from pathlib import Path
+from services import CoverPrefetcher, SpotifyApiClient
+from disk.album_cover import AlbumCover
+from disk import AlbumCoverIndex
+
+class StubCdnHandler(BaseHTTPRequestHandler):
+  """A stub of the Spotify CDN serving a JPEG per path, slowly so that concurrent requests overlap.
+
+  Attributes:
+    requests (list[str]): The paths of the requests received.
+  """
+
+  protocol_version = "HTTP/1.1"
+  requests: list[str] = []
+
+
+  def do_GET(self):
+    StubCdnHandler.requests.append(self.path)
+    time.sleep(0.1)
+    data = self.path.encode()
+    self.send_response(200)
+    self.send_header("Content-Type", "image/jpeg")
+    self.send_header("Content-Length", str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+  # END do_GET
+
+
+  def log_message(self, format, *args):
+    pass
+  # END log_message
+
+# END class StubCdnHandler
+
+
+@pytest.fixture
+def stub_cdn_url(tmp_path: Path) -> Generator[str, None, None]:
+  """Fixture that runs the stub CDN on a free local port, with a fresh prefetcher saving covers to a temporary directory.
+
+  Args:
+    tmp_path (Path): A temporary directory provided by pytest.
+
+  Returns:
+    Generator[str, None, None]: Yields the base URL of the stub.
+  """
+
+  StubCdnHandler.requests = []
+  server = ThreadingHTTPServer(("127.0.0.1", 0), StubCdnHandler)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  SpotifyApiClient._session = None
+  (tmp_path / "existing.png").write_bytes(b"existing")
+
+  with pytest.MonkeyPatch.context() as mp:
+    mp.setattr(AlbumCover, "DIR", str(tmp_path))
+    mp.setattr(CoverPrefetcher, "_in_flight", {})
+    mp.setattr(AlbumCoverIndex, "_instance", AlbumCoverIndex(str(tmp_path)))
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+  server.shutdown()
+  server.server_close()
+  SpotifyApiClient._session = None
+# END stub_cdn_url
+
+
+class TestCoverPrefetcher:
+  """Contains integration tests for the CoverPrefetcher class against a local stub CDN.
+  """
+
+  def test_prefetch_many(self, stub_cdn_url: str, tmp_path: Path):
+    """Verifies that covers are downloaded once per album however often they're requested, and that covers already on disk aren't downloaded.
+
+    Args:
+      stub_cdn_url (str): The base URL of the stub CDN.
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    futures = CoverPrefetcher.prefetch_track_items([
+      { "track": { "album": { "id": album_id, "images": [{ "url": f"{stub_cdn_url}/{album_id}" }] } } }
+      for album_id in ["a1", "a2", "a1", "existing", "a2", "a1"]
+    ])
+    joined_path, downloaded = SpotifyApiClient.download_cdn_track_cover(f"{stub_cdn_url}/a1", "a1")
+
+    assert { album_id: future.result() for album_id, future in futures.items() } == {
+      "a1": str(tmp_path / "a1.jpg"),
+      "a2": str(tmp_path / "a2.jpg"),
+      "existing": str(tmp_path / "existing.png")
+    }
+    assert (joined_path, downloaded) == (str(tmp_path / "a1.jpg"), True)
+    assert sorted(StubCdnHandler.requests) == ["/a1", "/a2"]
+    assert (tmp_path / "a1.jpg").read_bytes() == b"/a1"
+    assert SpotifyApiClient.download_cdn_track_cover(f"{stub_cdn_url}/a1", "a1") == (str(tmp_path / "a1.jpg"), False)
+    assert CoverPrefetcher._in_flight == {}
+  # END test_prefetch_many
+
+# END class TestCoverPrefetcher
@@ -0,0 +1,301 @@
+import sqlite3, struct
+import db
+from services import Downloader, YtDlpClient
+import disk
+from user_types import DownloadStatus, TrackCodec, TrackBitrate
+from user_types.requests import PostDownloadsRetagRequest, DeleteDownloadsRequest
+from mutagen.id3 import ID3
+from mutagen.flac import FLAC
+from unittest.mock import patch, MagicMock
+from typing import Callable
+from concurrent.futures import Future
+from pathlib import Path
+
+class TestDownloader:
+  """Contains unit and/or integration tests for the Downloader class.
+  """
+
+  def test__download_paused(self, seeded_app_db: Callable[[str | None], sqlite3.Connection], tmp_path: Path):
+    """Verifies that a download continues from its part file and that pausing the downloader stops it in flight, putting it back in the queue with its progress.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    conn = seeded_app_db("next_in_queue_1")
+    download_model = db.models.Download(conn)
+    download_model.update(1, { "download_dir": str(tmp_path), "downloaded_bytes": 10, "total_bytes": 5000 })
+    db_download = download_model.claim_next()
+    (tmp_path / f"{db_download["filename"]}.webm.part").write_bytes(b"\0" * 1000)
+    socket = MagicMock()
+    initial_downloaded_bytes = []
+
+    def download_track(self, track_info, progress_hook):
+      initial_downloaded_bytes.append(download_model.get_download(1)["downloaded_bytes"])
+      Downloader.pause_loop()
+      progress_hook({ "status": "downloading", "total_bytes": 5000, "downloaded_bytes": 1500, "speed": 1.0, "eta": 5 })
+
+    try:
+      with (
+        patch("db.get_connection", return_value=conn),
+        patch("services.downloader.DownloadsSocket.instance", return_value=socket),
+        patch("services.progress_coalescer.DownloadsSocket.instance", return_value=socket),
+        patch.object(YtDlpClient, "download_track", download_track)
+      ):
+        Downloader._download(db_download, download_model)
+    finally:
+      Downloader.resume_loop()
+
+    row = download_model.get_download(1)
+
+    assert initial_downloaded_bytes == [1000]
+    assert row["status"] == DownloadStatus.QUEUED.value
+    assert row["status_msg"] == "Paused"
+    assert row["downloaded_bytes"] == 1500
+    assert row["total_bytes"] == 5000
+  # END test__download_paused
+
+
+  def test__download_reuses_output(self, seeded_app_db: Callable[[str | None], sqlite3.Connection], tmp_path: Path):
+    """Verifies that a download of an already downloaded source video and format copies the indexed output instead of downloading, and that changed outputs are dropped from the index.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    conn = seeded_app_db("next_in_queue_1")
+    download_model = db.models.Download(conn)
+    output_model = db.models.Output(conn)
+    original_path = tmp_path / "original.flac"
+    original_path.write_bytes(b"flac data")
+    output_model.upsert({
+      "source_id": "youtube:8GB9BULxZ8c",
+      "codec": "flac",
+      "bitrate": "320",
+      "path": str(original_path),
+      "size": original_path.stat().st_size,
+      "mtime": original_path.stat().st_mtime,
+      "content_hash": disk.Track.get_content_hash(str(original_path))
+    })
+    download_model.update(1, { "download_dir": str(tmp_path / "copies") })
+    db_download = download_model.claim_next()
+
+    with (
+      patch("db.get_connection", return_value=conn),
+      patch("services.downloader.DownloadsSocket.instance", return_value=MagicMock()),
+      patch.object(YtDlpClient, "download_track", side_effect=AssertionError("downloaded")),
+      patch.object(Downloader, "_update_track_metadata"),
+      patch.object(Downloader, "_get_tagging_executor", return_value=MagicMock(submit=lambda fn, *args: fn(*args)))
+    ):
+      Downloader._download(db_download, download_model)
+
+      copy_path = tmp_path / "copies" / "the_girl_is_mine.flac"
+
+      assert download_model.get_download(1)["status"] == DownloadStatus.COMPLETED.value
+      assert copy_path.read_bytes() == b"flac data"
+      assert len(output_model.get_by_source("youtube:8GB9BULxZ8c", "flac", "320")) == 2
+
+      original_path.write_bytes(b"other data")
+      copy_path.unlink()
+
+      assert Downloader._reuse_output(MagicMock(url="https://youtu.be/8GB9BULxZ8c", codec=TrackCodec.FLAC, bitrate=TrackBitrate._320), MagicMock(), download_model) is False
+      assert output_model.get_by_source("youtube:8GB9BULxZ8c", "flac", "320") == []
+  # END test__download_reuses_output
+
+
+  def test__transcode_hands_off_tagging(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that a transcoded download is marked as tagging and queued in the tagging pool, and completes once tagged there.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    conn = seeded_app_db("next_in_queue_1")
+    download_model = db.models.Download(conn)
+    download_model.claim_next()
+    track = MagicMock()
+    update = MagicMock(download_id=1)
+    socket = MagicMock()
+    executor = MagicMock()
+    statuses = []
+    socket.send_download_update.side_effect = lambda u: statuses.append(u.status)
+
+    with (
+      patch("db.get_connection", return_value=conn),
+      patch("services.downloader.DownloadsSocket.instance", return_value=socket),
+      patch.object(YtDlpClient, "transcode_track", return_value=(True, None)),
+      patch.object(Downloader, "_get_tagging_executor", return_value=executor),
+      patch.object(Downloader, "_update_track_metadata") as update_track_metadata,
+      patch.object(Downloader, "_index_output")
+    ):
+      Downloader._transcode(track, update)
+
+      assert download_model.get_download(1)["status"] == DownloadStatus.TAGGING.value
+      update_track_metadata.assert_not_called()
+
+      executor.submit.assert_called_once_with(Downloader._tag, track, update)
+      Downloader._tag(track, update)
+
+    update_track_metadata.assert_called_once_with(track)
+    assert download_model.get_download(1)["status"] == DownloadStatus.COMPLETED.value
+    assert statuses == [DownloadStatus.TAGGING, DownloadStatus.COMPLETED]
+  # END test__transcode_hands_off_tagging
+
+
+  def test__resume_interrupted(self, seeded_app_db: Callable[[str | None], sqlite3.Connection], tmp_path: Path):
+    """Verifies that interrupted downloads whose files are intact are handed back to the stage they were interrupted at, and that the others are queued again with their status message cleared.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    conn = seeded_app_db("next_in_queue_1")
+    conn.execute("UPDATE metadata SET release_date = '1984-02-20' WHERE id = 2")
+    download_model = db.models.Download(conn)
+    download_model.update(1, { "status": DownloadStatus.TAGGING.value, "status_msg": "Tagging", "download_dir": str(tmp_path) })
+    download_model.update(2, { "status": DownloadStatus.TRANSCODING.value, "status_msg": "Transcoding", "download_dir": str(tmp_path) })
+    tagged_filename = download_model.get_download(1)["filename"]
+    transcoded_filename = download_model.get_download(2)["filename"]
+    (tmp_path / f"{tagged_filename}.flac").write_bytes(b"flac")
+    # neither another download's track file nor a part file is taken for the downloaded audio
+    (tmp_path / f"{transcoded_filename}.flac").write_bytes(b"flac")
+    (tmp_path / f"{transcoded_filename}.webm.part").write_bytes(b"part")
+    socket = MagicMock()
+    transcode_executor = MagicMock()
+    tagging_executor = MagicMock()
+
+    with (
+      patch("db.get_connection", return_value=conn),
+      patch("services.downloader.DownloadsSocket.instance", return_value=socket),
+      patch.object(Downloader, "_get_transcode_executor", return_value=transcode_executor),
+      patch.object(Downloader, "_get_tagging_executor", return_value=tagging_executor)
+    ):
+      Downloader._resume_interrupted()
+
+      tagged_track = tagging_executor.submit.call_args.args[1]
+
+      assert tagged_track.path == str(tmp_path / f"{tagged_filename}.flac")
+      assert download_model.get_download(1)["status"] == DownloadStatus.TAGGING.value
+      assert download_model.get_download(2)["status"] == DownloadStatus.QUEUED.value
+      assert download_model.get_download(2)["status_msg"] is None
+      transcode_executor.submit.assert_not_called()
+      socket.get_and_send_downloads_changed.assert_called_once_with([2])
+
+      download_model.update(2, { "status": DownloadStatus.TRANSCODING.value })
+      (tmp_path / f"{transcoded_filename}.webm").write_bytes(b"webm")
+      Downloader._resume_interrupted()
+
+    transcoded_track = transcode_executor.submit.call_args.args[1]
+
+    assert transcoded_track.source_path == str(tmp_path / f"{transcoded_filename}.webm")
+    assert download_model.get_download(2)["status"] == DownloadStatus.TRANSCODING.value
+  # END test__resume_interrupted
+
+
+  def test_retag(self, seeded_app_db: Callable[[str | None], sqlite3.Connection], tmp_path: Path):
+    """Verifies that re-tagging applies the stored metadata to completed downloads' files in the tagging pool, skips files whose tags already match, counts missing files as failed and broadcasts its progress.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    conn = seeded_app_db("next_in_queue_1")
+    download_model = db.models.Download(conn)
+
+    # the seeded release date isn't in the format downloads are queued with
+    conn.execute("UPDATE metadata SET release_date = '1984-02-20' WHERE id = 2")
+
+    for download_id in [1, 2]:
+      download_model.update(download_id, { "download_dir": str(tmp_path) })
+      download_model.set_completed(download_id, download_model.get_current_timestamp())
+
+    # a bare FLAC stream info block and silent MPEG frames are enough for mutagen to tag
+    stream_info = struct.pack(">HH", 4096, 4096) + bytes(6) + bytes([0x0A, 0xC4, 0x40, 0xF0]) + bytes(20)
+    flac_path = tmp_path / "the_girl_is_mine.flac"
+    flac_path.write_bytes(b"fLaC" + bytes([0x80]) + len(stream_info).to_bytes(3, "big") + stream_info)
+    mp3_path = tmp_path / "radio_ga_ga.mp3"
+    mp3_path.write_bytes((bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)) * 20)
+
+    by_ids = PostDownloadsRetagRequest()
+    by_ids.download_ids = [1, 2, 99]
+    by_ids.directory = None
+    by_dir = PostDownloadsRetagRequest()
+    by_dir.download_ids = None
+    by_dir.directory = str(tmp_path)
+
+    socket = MagicMock()
+    executor = MagicMock()
+
+    def submit(fn: Callable, *args) -> Future:
+      future = Future()
+      future.set_result(fn(*args))
+      return future
+    # END submit
+
+    executor.submit.side_effect = submit
+
+    def retag(request: PostDownloadsRetagRequest) -> dict:
+      socket.reset_mock()
+      retag_id, track_count = Downloader.retag(request)
+      progress = socket.send_retag_progress.call_args.args[0]
+
+      assert progress["retag_id"] == retag_id
+      assert progress["track_count"] == track_count
+      assert progress["is_done"] is True
+
+      return progress
+    # END retag
+
+    with (
+      patch("db.get_connection", return_value=conn),
+      patch("services.downloader.DownloadsSocket.instance", return_value=socket),
+      patch.object(Downloader, "_get_tagging_executor", return_value=executor)
+    ):
+      first = retag(by_ids)
+      flac_tags = FLAC(str(flac_path)).tags.as_dict()
+      mp3_tags = ID3(str(mp3_path))
+      second = retag(by_dir)
+      flac_path.unlink()
+      third = retag(by_dir)
+
+    assert (first["track_count"], first["retag_count"], first["skip_count"], first["fail_count"]) == (2, 2, 0, 0)
+    assert flac_tags["title"] == ["The Girl Is Mine"]
+    assert flac_tags["artist"] == ["Michael Jackson", "Paul McCartney"]
+    assert str(mp3_tags["TIT2"]) == "Radio Ga Ga"
+    assert (second["retag_count"], second["skip_count"], second["fail_count"]) == (0, 2, 0)
+    assert (third["retag_count"], third["skip_count"], third["fail_count"]) == (0, 1, 1)
+    assert first["tracks_per_second"] > 0
+  # END test_retag
+
+
+  def test_delete(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that deleting skips active and unknown downloads and broadcasts only the IDs that were deleted.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    conn = seeded_app_db("next_in_queue_1")
+    download_model = db.models.Download(conn)
+    active_id = download_model.claim_next()["download_id"]
+    queued_id = 2 if active_id == 1 else 1
+    request = DeleteDownloadsRequest()
+    request.download_ids = [active_id, queued_id, 99]
+    socket = MagicMock()
+
+    with (
+      patch("db.get_connection", return_value=conn),
+      patch("services.downloader.DownloadsSocket.instance", return_value=socket)
+    ):
+      assert Downloader.delete(request) == 1
+
+    socket.send_downloads_removed.assert_called_once_with([queued_id])
+    assert download_model.get_download(active_id)["status"] == DownloadStatus.DOWNLOADING.value
+    assert download_model.get_download(queued_id) is None
+  # END test_delete
+
+# END class TestDownloader
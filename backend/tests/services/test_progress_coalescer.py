@@ -0,0 +1,52 @@
+import sqlite3
+import db
+from services import ProgressCoalescer
+from user_types import DownloadUpdate, DownloadStatus
+from unittest.mock import patch, MagicMock
+from typing import Callable
+
+class TestProgressCoalescer:
+  """Unit tests for the ProgressCoalescer class.
+  """
+
+  def test_push_throttles_and_flushes_on_transition(self, seeded_app_db: Callable[[str | None], sqlite3.Connection]):
+    """Verifies that rapid progress hook calls are coalesced into a single socket update and database write until the interval passes or the download changes state.
+
+    Args:
+      seeded_app_db (Callable[[str | None], sqlite3.Connection]): The factory function to create the seeded application database and return the connection provided by the fixture.
+    """
+
+    download_model = db.models.Download(seeded_app_db("next_in_queue_1"))
+    update = DownloadUpdate()
+    update.download_id = 1
+    socket = MagicMock()
+
+    with patch("services.progress_coalescer.DownloadsSocket.instance", return_value=socket), \
+      patch("services.progress_coalescer.time.monotonic", return_value=100.0) as monotonic:
+      coalescer = ProgressCoalescer(update, download_model)
+
+      for i in range(10):
+        coalescer.push({ "status": "downloading", "total_bytes": 100, "downloaded_bytes": i, "speed": 1.0, "eta": 5 })
+
+      assert socket.send_download_update.call_count == 1
+      assert download_model.get_download(1)["downloaded_bytes"] == 0
+      assert update.downloaded_bytes == 9
+
+      monotonic.return_value = 100.0 + ProgressCoalescer.EMIT_INTERVAL
+      coalescer.push({ "status": "downloading", "total_bytes": 100, "downloaded_bytes": 50, "speed": 1.0, "eta": 5 })
+
+      assert socket.send_download_update.call_count == 2
+      assert download_model.get_download(1)["downloaded_bytes"] == 0
+
+      coalescer.push({ "status": "finished", "total_bytes": 100, "downloaded_bytes": 100, "speed": None, "eta": None })
+
+      assert socket.send_download_update.call_count == 3
+
+    row = download_model.get_download(1)
+
+    assert row["status"] == DownloadStatus.DOWNLOADING.value
+    assert row["downloaded_bytes"] == 100
+    assert row["total_bytes"] == 100
+  # END test_push_throttles_and_flushes_on_transition
+
+# END class TestProgressCoalescer
@@ -0,0 +1,102 @@
+from services import Resolver, YtDlpClient, Downloader
+from sockets import DownloadsSocket
+from user_types import DownloadSearchResult, DownloadStatus
+from unittest.mock import patch, MagicMock
+import db
+import sqlite3, threading
+
+class TestResolver:
+  """Contains unit and/or integration tests for the Resolver class.
+  """
+
+  def test__resolve(self, app_db: sqlite3.Connection):
+    """Verifies that the _resolve method queues downloads with the top search result as their URL and fails downloads without a match.
+
+    Args:
+      app_db (sqlite3.Connection): The application database connection provided by the fixture.
+    """
+
+    metadata_ids = db.models.Metadata(app_db).insert_many([
+      { "track_name": track_name, "main_artist": "Queen" }
+      for track_name in ["Radio Ga Ga", "Not A Song"]
+    ])
+    dl = db.models.Download(app_db)
+    matched_id, unmatched_id = dl.insert_many_as_queued([
+      {
+        "url": None,
+        "codec": "mp3",
+        "bitrate": "192",
+        "metadata_id": metadata_id,
+        "download_dir": "/home/user/music",
+        "filename": f"track_{metadata_id}"
+      }
+      for metadata_id in metadata_ids
+    ])
+
+    top_result = DownloadSearchResult()
+    top_result.url = "https://www.youtube.com/watch?v=azdwsXLmrHE"
+    other_result = DownloadSearchResult()
+    other_result.url = "https://www.youtube.com/watch?v=other"
+
+    def query_youtube_many(queries):
+      for i, query in enumerate(queries):
+        yield i, (True, [top_result, other_result] if query.track_name == "Radio Ga Ga" else [])
+
+    with (
+      patch.object(YtDlpClient, "query_youtube_many", side_effect=query_youtube_many),
+      patch.object(DownloadsSocket, "instance", return_value=MagicMock()),
+      patch.object(Downloader, "start") as start
+    ):
+      Resolver._resolve(dl.get_downloads([matched_id, unmatched_id]), dl)
+
+    matched = dl.get_download(matched_id)
+    unmatched = dl.get_download(unmatched_id)
+
+    assert matched["status"] == DownloadStatus.QUEUED.value
+    assert matched["url"] == top_result.url
+    assert unmatched["status"] == DownloadStatus.FAILED.value
+    assert unmatched["status_msg"] == Resolver.NO_MATCH_MSG
+    start.assert_called_once()
+  # END test__resolve
+
+
+  def test_start_after_failed_batch(self, app_db: sqlite3.Connection):
+    """Verifies that a batch failing unexpectedly fails its downloads and releases the resolver thread, so that a later start spawns a new one.
+
+    Args:
+      app_db (sqlite3.Connection): The application database connection provided by the fixture.
+    """
+
+    dl = db.models.Download(app_db)
+    [download_id] = dl.insert_many_as_queued([{
+      "url": None,
+      "codec": "mp3",
+      "bitrate": "192",
+      "metadata_id": None,
+      "download_dir": "/home/user/music",
+      "filename": "track"
+    }])
+
+    with (
+      patch("db.get_connection", return_value=app_db),
+      patch.object(DownloadsSocket, "instance", return_value=MagicMock()),
+      patch.object(Resolver, "_resolve", side_effect=RuntimeError("search failed")) as resolve
+    ):
+      # run on this thread since the in-memory database can't be shared with the resolver thread
+      Resolver._thread = threading.current_thread()
+      Resolver._thread_target()
+
+    resolve.assert_called_once()
+    assert Resolver._thread is None
+    assert dl.get_download(download_id)["status"] == DownloadStatus.FAILED.value
+    assert dl.get_download(download_id)["status_msg"] == Resolver.ERROR_MSG
+
+    with patch.object(Resolver, "_thread_target") as thread_target:
+      assert Resolver.start() is True
+      Resolver._thread.join(5)
+
+    thread_target.assert_called_once()
+    Resolver._thread = None
+  # END test_start_after_failed_batch
+
+# END class TestResolver
@@ -0,0 +1,194 @@
+from services import SearchResultCache, YtDlpClient
+from user_types import DownloadSearchResult
+from user_types.requests import GetDownloadsSearchRequest
+from unittest.mock import patch
+from pathlib import Path
+import threading, time
+
+def make_query(main_artist: str, track_name: str) -> GetDownloadsSearchRequest:
+  """Creates a search query.
+
+  Args:
+    main_artist (str): The main artist of the track.
+    track_name (str): The name of the track.
+
+  Returns:
+    GetDownloadsSearchRequest: The search query.
+  """
+
+  query = GetDownloadsSearchRequest()
+  query.main_artist = main_artist
+  query.track_name = track_name
+  return query
+# END make_query
+
+
+def make_result(url: str) -> DownloadSearchResult:
+  """Creates a search result.
+
+  Args:
+    url (str): The URL of the result.
+
+  Returns:
+    DownloadSearchResult: The search result.
+  """
+
+  result = DownloadSearchResult()
+  result.title = "Queen - Radio Ga Ga"
+  result.channel = "Queen - Topic"
+  result.url = url
+  result.duration = 348
+  result.thumbnail = None
+  return result
+# END make_result
+
+
+class TestSearchResultCache:
+  """Unit tests for methods of the SearchResultCache class.
+  """
+
+  def test_get_normalizes_key_and_counts(self, tmp_path: Path):
+    """Verifies that results are found regardless of case and spacing, keep their order and that lookups are counted.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    cache = SearchResultCache(str(tmp_path / "cache.json"))
+
+    assert cache.get(make_query("Queen", "Radio Ga Ga")) is None
+
+    cache.set(make_query("Queen", "Radio Ga Ga"), [make_result("a"), make_result("b")])
+    results = cache.get(make_query("  queen ", "radio  GA ga"))
+
+    assert [r.url for r in results] == ["a", "b"]
+    assert cache.get_stats() == { "hits": 1, "misses": 1, "size": 1 }
+  # END test_get_normalizes_key_and_counts
+
+
+  def test_expiry_and_eviction(self, tmp_path: Path):
+    """Verifies that expired results are not returned and that the least recently used search is evicted when full.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    cache = SearchResultCache(str(tmp_path / "cache.json"), max_size=2, ttl=60)
+
+    with patch("services.search_result_cache.time.time", return_value=1000):
+      cache.set(make_query("Queen", "Radio Ga Ga"), [make_result("a")])
+      cache.set(make_query("Queen", "Under Pressure"), [make_result("b")])
+      cache.get(make_query("Queen", "Radio Ga Ga"))
+      cache.set(make_query("Queen", "Bohemian Rhapsody"), [make_result("c")])
+
+      assert cache.get(make_query("Queen", "Under Pressure")) is None
+      assert cache.get(make_query("Queen", "Radio Ga Ga")) is not None
+
+    with patch("services.search_result_cache.time.time", return_value=1061):
+      assert cache.get(make_query("Queen", "Radio Ga Ga")) is None
+  # END test_expiry_and_eviction
+
+
+  def test_persists_across_instances(self, tmp_path: Path):
+    """Verifies that cached results are loaded by a new instance using the same file.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    path = str(tmp_path / "cache.json")
+    cache = SearchResultCache(path)
+    cache.set(make_query("Queen", "Radio Ga Ga"), [make_result("a")])
+    cache.flush()
+
+    results = SearchResultCache(path).get(make_query("Queen", "Radio Ga Ga"))
+
+    assert [r.url for r in results] == ["a"]
+  # END test_persists_across_instances
+
+
+  def test_persist_is_debounced(self, tmp_path: Path):
+    """Verifies that caching results doesn't write the file, and that searches cached before the delay elapses are written together once.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    path = tmp_path / "cache.json"
+    cache = SearchResultCache(str(path), persist_delay=0.2)
+
+    with patch.object(cache._file, "write", wraps=cache._file.write) as mock_write:
+      cache.set(make_query("Queen", "Radio Ga Ga"), [make_result("a")])
+      cache.set(make_query("Queen", "Under Pressure"), [make_result("b")])
+      timer = cache._persist_timer
+
+      assert not path.exists()
+
+      timer.join(timeout=5)
+
+      assert mock_write.call_count == 1
+      assert cache.flush() is False
+
+    assert SearchResultCache(str(path)).get_stats()["size"] == 2
+  # END test_persist_is_debounced
+
+
+  def test_instance(self, tmp_path: Path):
+    """Verifies that threads getting the singleton instance for the first time at once share one instance, registered once to be flushed on exit.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    init = SearchResultCache.__init__
+
+    def slow_init(self: SearchResultCache):
+      time.sleep(0.05)
+      init(self, str(tmp_path / "cache.json"))
+
+    instances = []
+    barrier = threading.Barrier(4)
+
+    def get_instance():
+      barrier.wait()
+      instances.append(SearchResultCache.instance())
+
+    with (
+      patch.object(SearchResultCache, "_instance", None),
+      patch.object(SearchResultCache, "__init__", slow_init),
+      patch("services.search_result_cache.atexit.register") as mock_register
+    ):
+      threads = [threading.Thread(target=get_instance) for _ in range(4)]
+
+      for thread in threads:
+        thread.start()
+
+      for thread in threads:
+        thread.join()
+
+    assert len(instances) == 4
+    assert all(instance is instances[0] for instance in instances)
+    mock_register.assert_called_once_with(instances[0].flush)
+  # END test_instance
+
+
+  def test_query_youtube_uses_cache(self, search_result_cache: SearchResultCache):
+    """Verifies that YtDlpClient.query_youtube serves cached results without searching YouTube.
+
+    Args:
+      search_result_cache (SearchResultCache): The app's cache instance provided by the fixture.
+    """
+
+    query = make_query("Queen", "Radio Ga Ga")
+    search_result_cache.set(query, [make_result("a")])
+
+    with patch("yt_dlp.YoutubeDL") as mock_ytdl_class:
+      is_success, results = YtDlpClient().query_youtube(query)
+
+      mock_ytdl_class.assert_not_called()
+
+    assert is_success is True
+    assert [r.url for r in results] == ["a"]
+  # END test_query_youtube_uses_cache
+
+# END class TestSearchResultCache
@@ -0,0 +1,270 @@
+import json, threading, time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Generator, Callable
+from pathlib import Path
+from services import SpotifyApiClient
+import disk
+
+class StubSpotifyHandler(BaseHTTPRequestHandler):
+  """A stub of the Spotify API serving two pages of items, rate limiting the first request.
+
+  Attributes:
+    requests (list[str]): The paths of the requests received.
+    client_ports (set[int]): The client ports of the requests received, one per connection.
+  """
+
+  protocol_version = "HTTP/1.1"
+  requests: list[str] = []
+  client_ports: set[int] = set()
+
+
+  def do_GET(self):
+    StubSpotifyHandler.requests.append(self.path)
+    StubSpotifyHandler.client_ports.add(self.client_address[1])
+    host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+
+    if len(StubSpotifyHandler.requests) == 1:
+      self._send(429, {}, { "Retry-After": "0" })
+    elif self.path == "/page1":
+      self._send(200, { "items": [1, 2], "next": f"{host}/page2" })
+    else:
+      self._send(200, { "items": [3], "next": None })
+  # END do_GET
+
+
+  def _send(self, status: int, body: dict, headers: dict | None = None):
+    data = json.dumps(body).encode()
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(data)))
+
+    for k, v in (headers or {}).items():
+      self.send_header(k, v)
+
+    self.end_headers()
+    self.wfile.write(data)
+  # END _send
+
+
+  def log_message(self, format, *args):
+    pass
+  # END log_message
+
+# END class StubSpotifyHandler
+
+
+class StubPagedSpotifyHandler(StubSpotifyHandler):
+  """A stub of the Spotify API serving `TOTAL` items by `offset` and `limit`, slowly so that concurrent requests overlap.
+
+  Attributes:
+    TOTAL (int): The total number of items.
+    in_flight (int): The number of requests being handled.
+    max_in_flight (int): The highest number of requests handled at once.
+  """
+
+  TOTAL = 7
+  in_flight: int = 0
+  max_in_flight: int = 0
+  _lock = threading.Lock()
+
+
+  def do_GET(self):
+    with StubPagedSpotifyHandler._lock:
+      StubPagedSpotifyHandler.requests.append(self.path)
+      StubPagedSpotifyHandler.in_flight += 1
+      StubPagedSpotifyHandler.max_in_flight = max(StubPagedSpotifyHandler.max_in_flight, StubPagedSpotifyHandler.in_flight)
+
+    time.sleep(0.05)
+    url = urlparse(self.path)
+    query = parse_qs(url.query)
+    offset, limit = int(query["offset"][0]), int(query["limit"][0])
+    next_offset = offset + limit
+    host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+
+    with StubPagedSpotifyHandler._lock:
+      StubPagedSpotifyHandler.in_flight -= 1
+
+    self._send(200, {
+      "items": list(range(offset, min(next_offset, self.TOTAL))),
+      "total": self.TOTAL,
+      "limit": limit,
+      "offset": offset,
+      "next": f"{host}{url.path}?offset={next_offset}&limit={limit}" if next_offset < self.TOTAL else None
+    })
+  # END do_GET
+
+# END class StubPagedSpotifyHandler
+
+
+class StubPlaylistSpotifyHandler(StubSpotifyHandler):
+  """A stub of the Spotify API serving a playlist's snapshot ID with an `ETag` and its items.
+
+  Attributes:
+    snapshot_id (str): The current snapshot ID of the playlist.
+  """
+
+  snapshot_id: str = "s1"
+
+
+  def do_GET(self):
+    StubPlaylistSpotifyHandler.requests.append(self.path)
+    etag = f'"{self.snapshot_id}"'
+
+    if self.path.startswith("/playlists/p1?"):
+      if self.headers.get("If-None-Match") == etag:
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.end_headers()
+      else:
+        self._send(200, { "snapshot_id": self.snapshot_id }, { "ETag": etag })
+    else:
+      self._send(200, { "items": [self.snapshot_id], "next": None })
+  # END do_GET
+
+# END class StubPlaylistSpotifyHandler
+
+
+class StubTokenSpotifyHandler(StubSpotifyHandler):
+  """A stub of the Spotify token endpoint that fails with a server error, then rate limits, then succeeds.
+  """
+
+  def do_POST(self):
+    self.rfile.read(int(self.headers.get("Content-Length") or 0))
+    StubTokenSpotifyHandler.requests.append(self.path)
+
+    if len(StubTokenSpotifyHandler.requests) == 1:
+      self._send(503, {})
+    elif len(StubTokenSpotifyHandler.requests) == 2:
+      self._send(429, {}, { "Retry-After": "0" })
+    else:
+      self._send(200, { "access_token": "token" })
+  # END do_POST
+
+# END class StubTokenSpotifyHandler
+
+
+@pytest.fixture
+def stub_spotify_url() -> Generator[Callable[[type[StubSpotifyHandler]], str], None, None]:
+  """Fixture that runs a stub Spotify API on a free local port with a fresh client session.
+
+  Returns:
+    Generator[Callable[[type[StubSpotifyHandler]], str], None, None]: Yields a function that starts the stub with the given handler and returns its base URL.
+  """
+
+  servers = []
+
+  def _start(handler: type[StubSpotifyHandler]) -> str:
+    handler.requests = []
+    handler.client_ports = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    servers.append(server)
+
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+  SpotifyApiClient._session = None
+
+  yield _start
+
+  for server in servers:
+    server.shutdown()
+    server.server_close()
+
+  SpotifyApiClient._session = None
+# END stub_spotify_url
+
+
+class TestSpotifyApiClient:
+  """Contains integration tests for the SpotifyApiClient class against a local stub server.
+  """
+
+  def test__fetch_all_pages(self, stub_spotify_url: Callable[[type[StubSpotifyHandler]], str]):
+    """Verifies that pages are fetched over one kept-alive connection and that a rate limited request is retried after its `Retry-After`.
+
+    Args:
+      stub_spotify_url (Callable[[type[StubSpotifyHandler]], str]): Starts the stub Spotify API.
+    """
+
+    partial, results = SpotifyApiClient._fetch_all_pages(f"{stub_spotify_url(StubSpotifyHandler)}/page1")
+
+    assert partial is False
+    assert results == [1, 2, 3]
+    assert StubSpotifyHandler.requests == ["/page1", "/page1", "/page2"]
+    assert len(StubSpotifyHandler.client_ports) == 1
+  # END test__fetch_all_pages
+
+
+  def test_iter_all_pages(self, stub_spotify_url: Callable[[type[StubSpotifyHandler]], str]):
+    """Verifies that the pages after the first are fetched concurrently by offset, up to the concurrency cap, and yielded in order.
+
+    Args:
+      stub_spotify_url (Callable[[type[StubSpotifyHandler]], str]): Starts the stub Spotify API.
+    """
+
+    StubPagedSpotifyHandler.max_in_flight = 0
+    base_url = stub_spotify_url(StubPagedSpotifyHandler)
+
+    with pytest.MonkeyPatch.context() as mp:
+      mp.setattr(SpotifyApiClient, "PAGE_CONCURRENCY", 2)
+      pages = SpotifyApiClient.iter_all_pages(f"{base_url}/items?offset=0&limit=2")
+
+      assert next(pages) == [0, 1]
+      assert list(pages) == [[2, 3], [4, 5], [6]]
+
+    assert sorted(StubPagedSpotifyHandler.requests) == sorted(f"/items?offset={o}&limit=2" for o in [0, 2, 4, 6])
+    assert StubPagedSpotifyHandler.max_in_flight == 2
+  # END test_iter_all_pages
+
+
+  def test_post_retries_only_rate_limits(self, stub_spotify_url: Callable[[type[StubSpotifyHandler]], str]):
+    """Verifies that a POST, e.g the token exchange, isn't retried on a server error but is retried when rate limited.
+
+    Args:
+      stub_spotify_url (Callable[[type[StubSpotifyHandler]], str]): Starts the stub Spotify API.
+    """
+
+    token_url = f"{stub_spotify_url(StubTokenSpotifyHandler)}/api/token"
+    session = SpotifyApiClient._get_session()
+
+    assert session.post(token_url, data={ "code": "c" }, timeout=SpotifyApiClient.REQUEST_TIMEOUT).status_code == 503
+    assert len(StubTokenSpotifyHandler.requests) == 1
+    assert session.post(token_url, data={ "code": "c" }, timeout=SpotifyApiClient.REQUEST_TIMEOUT).status_code == 200
+    assert len(StubTokenSpotifyHandler.requests) == 3
+  # END test_post_retries_only_rate_limits
+
+
+  def test_fetch_playlist_items_cached(self, stub_spotify_url: Callable[[type[StubSpotifyHandler]], str], tmp_path: Path):
+    """Verifies that a playlist's items are fetched again only when its snapshot ID changes or its cached items are invalidated.
+
+    Args:
+      stub_spotify_url (Callable[[type[StubSpotifyHandler]], str]): Starts the stub Spotify API.
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    StubPlaylistSpotifyHandler.snapshot_id = "s1"
+    base_url = stub_spotify_url(StubPlaylistSpotifyHandler)
+
+    def fetched_items() -> int:
+      return sum("/tracks?" in path for path in StubPlaylistSpotifyHandler.requests)
+
+    with pytest.MonkeyPatch.context() as mp:
+      mp.setattr(SpotifyApiClient, "API_URL", base_url)
+      mp.setattr(SpotifyApiClient, "_spotify_cache", disk.SpotifyCache(str(tmp_path)))
+
+      assert SpotifyApiClient.fetch_playlist_items_cached("p1") == (False, ["s1"])
+      assert SpotifyApiClient.fetch_playlist_items_cached("p1") == (False, ["s1"])
+      assert SpotifyApiClient.fetch_playlist_items_cached("p1", "s1") == (False, ["s1"])
+      assert fetched_items() == 1
+
+      StubPlaylistSpotifyHandler.snapshot_id = "s2"
+
+      assert SpotifyApiClient.fetch_playlist_items_cached("p1") == (False, ["s2"])
+      assert fetched_items() == 2
+      assert SpotifyApiClient.invalidate_cache("p1") is True
+      assert SpotifyApiClient.fetch_playlist_items_cached("p1", "s2") == (False, ["s2"])
+      assert fetched_items() == 3
+  # END test_fetch_playlist_items_cached
+
+# END class TestSpotifyApiClient
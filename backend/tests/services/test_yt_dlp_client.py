@@ -1,9 +1,12 @@
-import pytest
+import pytest, yt_dlp, os, sys, subprocess
 from user_types.requests import GetDownloadsSearchRequest
-from user_types import DownloadSearchResult
+from user_types import DownloadSearchResult, NewDownload, TrackArtistNames, TrackCodec, TrackBitrate
 from services import YtDlpClient
+from utils import get_bin_dir
 from yt_dlp.utils import DownloadError, ExtractorError, UnsupportedError
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import disk
 
 @pytest.fixture(params=[
   # (main artist, track name)
@@ -111,4 +114,129 @@ class TestYtDlpClient:
       assert isinstance(result, str)
   # END test_query_youtube_with_error
 
+
+  def test_transcode_track_without_source(self, tmp_path: Path):
+    """Verifies that the transcode_track method fails gracefully when the downloaded source audio does not exist.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    track_info = NewDownload()
+    track_info.artist_names = TrackArtistNames(["Queen"])
+    track_info.track_name = "Radio Ga Ga"
+    track_info.codec = TrackCodec.MP3
+    track_info.bitrate = TrackBitrate._192
+    track_info.download_dir = str(tmp_path)
+    track_info.filename = "radio_ga_ga"
+
+    track = disk.Track(track_info)
+    track.source_path = str(tmp_path / "radio_ga_ga.webm")
+    is_success, result = YtDlpClient().transcode_track(track)
+
+    assert is_success is False
+    assert isinstance(result, str)
+  # END test_transcode_track_without_source
+
+
+  def test_download_track_reuses_pooled_instance(self, tmp_path: Path):
+    """Verifies that consecutive downloads on a pooled YoutubeDL instance each get their own output template and progress hook.
+
+    Args:
+      tmp_path (Path): A temporary directory provided by pytest.
+    """
+
+    def extract_info(self, url, download=False):
+      # yt-dlp calls the registered progress hooks as it downloads
+      YtDlpClient._progress_relays[self]({ "status": "downloading", "url": url })
+      return { "id": url, "title": "Title", "ext": "webm" }
+    # END extract_info
+
+    progress = { "radio_ga_ga": [], "under_pressure": [] }
+    source_paths = []
+    ydls = []
+
+    with (
+      patch.object(yt_dlp.YoutubeDL, "extract_info", extract_info),
+      patch.dict(YtDlpClient.YDL_POOL_SIZES, { "download": 1 })
+    ):
+      for filename in progress:
+        track_info = NewDownload()
+        track_info.artist_names = TrackArtistNames(["Queen"])
+        track_info.track_name = filename
+        track_info.codec = TrackCodec.MP3
+        track_info.bitrate = TrackBitrate._192
+        track_info.download_dir = str(tmp_path)
+        track_info.filename = filename
+        track_info.url = filename
+
+        is_success, track = YtDlpClient().download_track(track_info, progress[filename].append)
+
+        assert is_success is True
+        source_paths.append(track.source_path)
+
+      ydls = YtDlpClient._ydl_pools["download"]
+
+    assert source_paths == [str(tmp_path / "radio_ga_ga.webm"), str(tmp_path / "under_pressure.webm")]
+    assert progress == {
+      "radio_ga_ga": [{ "status": "downloading", "url": "radio_ga_ga" }],
+      "under_pressure": [{ "status": "downloading", "url": "under_pressure" }]
+    }
+    assert len(ydls) == 1
+    assert ydls[0].params["ffmpeg_location"] == get_bin_dir()
+    assert YtDlpClient._progress_relays[ydls[0]].hook is None
+  # END test_download_track_reuses_pooled_instance
+
+
+
+  def test_import_without_bin_dir(self):
+    """Verifies that the services can be imported without the binaries directory being resolvable, it's only needed once a download starts.
+    """
+
+    env = { key: value for key, value in os.environ.items() if key not in ("APP_ENV", "RESOURCES_PATH") }
+    backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+    result = subprocess.run([sys.executable, "-c", "import services"], cwd=backend_dir, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+  # END test_import_without_bin_dir
+
+
+  def test__acquire_ydl(self):
+    """Verifies that the _acquire_ydl method reuses idle YoutubeDL instances and keeps no more idle instances than the pool size.
+    """
+
+    with (
+      patch("yt_dlp.YoutubeDL", side_effect=lambda opts: MagicMock()) as mock_ytdl_class,
+      patch.dict(YtDlpClient.YDL_POOL_SIZES, { "search": 1 })
+    ):
+      with YtDlpClient._acquire_ydl("search") as first:
+        with YtDlpClient._acquire_ydl("search") as second:
+          assert first is not second
+
+      with YtDlpClient._acquire_ydl("search") as reused:
+        assert reused is second
+
+      assert mock_ytdl_class.call_count == 2
+      assert YtDlpClient._ydl_pools["search"] == [second]
+  # END test__acquire_ydl
+
+
+  def test_warm_up(self):
+    """Verifies that the warm_up method fills the YoutubeDL pools with instances that have the YouTube extractors loaded.
+    """
+
+    with patch.object(yt_dlp.YoutubeDL, "get_info_extractor", autospec=True) as mock_get_info_extractor:
+      YtDlpClient.warm_up()
+
+    for pool, size in YtDlpClient.YDL_POOL_SIZES.items():
+      assert len(YtDlpClient._ydl_pools[pool]) == size
+
+      for ydl in YtDlpClient._ydl_pools[pool]:
+        mock_get_info_extractor.assert_any_call(ydl, "YoutubeSearch")
+        mock_get_info_extractor.assert_any_call(ydl, "Youtube")
+
+    with YtDlpClient._acquire_ydl("search") as ydl:
+      assert ydl.params["extract_flat"] is True
+  # END test_warm_up
+
 # END class TestYtDlpClient
\ No newline at end of file
@@ -42,7 +42,7 @@ class TestDownloadsSocket:
     socketio_test_client: Callable[[str], SocketIOTestClient], 
     download_update: DownloadUpdate
   ):
-    """Validates that the send_download_update method emits the correct event and download update data to the socket.
+    """Validates that the send_download_update method emits a delta with the download update data as a change to the socket.
 
     Args:
       socketio_test_client (Callable[[str], SocketIOTestClient]): Fixture which provides a callable to create a SocketIO test client under the given namespace.
@@ -51,14 +51,24 @@ class TestDownloadsSocket:
     
     client = socketio_test_client(DownloadsSocket.NAMESPACE)
     namespace: DownloadsSocket = client.socketio.server.namespace_handlers[DownloadsSocket.NAMESPACE]
+    namespace.send_downloads_added([download_update])
+    client.get_received(DownloadsSocket.NAMESPACE)
     namespace.send_download_update(download_update)
 
     received = client.get_received(DownloadsSocket.NAMESPACE)
 
-    assert any(p["name"] == DownloadsSocket.DOWNLOAD_UPDATE_EVENT for p in received)
+    assert any(p["name"] == DownloadsSocket.DOWNLOADS_DELTA_EVENT for p in received)
 
-    event = next(p for p in received if p["name"] == DownloadsSocket.DOWNLOAD_UPDATE_EVENT)
-    data = event["args"][0]
+    event = next(p for p in received if p["name"] == DownloadsSocket.DOWNLOADS_DELTA_EVENT)
+    delta = event["args"][0]
+
+    assert delta["since"] == 1
+    assert delta["seq"] == 2
+    assert delta["added"] == []
+    assert delta["removed"] == []
+    assert len(delta["changed"]) == 1
+
+    data = delta["changed"][0]
 
     assert isinstance(data, dict)
     assert data["download_id"] == download_update.download_id
@@ -103,6 +113,7 @@ class TestDownloadsSocket:
     data = event["args"][0]
 
     assert isinstance(data, dict)
+    assert data["seq"] == 0
     assert isinstance(data["downloads"], list)
     assert len(data["downloads"]) == 1
 
@@ -124,4 +135,100 @@ class TestDownloadsSocket:
     assert dl["status_msg"] is None
   # END test_send_all_downloads
 
+
+  def test_send_downloads_added(
+    self,
+    socketio_test_client: Callable[[str], SocketIOTestClient], 
+    download_update: DownloadUpdate
+  ):
+    """Validates that the send_downloads_added method emits a single delta containing the whole batch of downloads.
+
+    Args:
+      socketio_test_client (Callable[[str], SocketIOTestClient]): Fixture which provides a callable to create a SocketIO test client under the given namespace.
+      download_update (DownloadUpdate): A mock download update.
+    """
+
+    client = socketio_test_client(DownloadsSocket.NAMESPACE)
+    client.get_received(DownloadsSocket.NAMESPACE)
+
+    namespace: DownloadsSocket = client.socketio.server.namespace_handlers[DownloadsSocket.NAMESPACE]
+    namespace.send_downloads_added([download_update, download_update])
+
+    received = client.get_received(DownloadsSocket.NAMESPACE)
+    events = [p for p in received if p["name"] == DownloadsSocket.DOWNLOADS_DELTA_EVENT]
+
+    assert len(events) == 1
+
+    data = events[0]["args"][0]
+
+    assert isinstance(data["added"], list)
+    assert len(data["added"]) == 2
+    assert data["added"][0]["download_id"] == download_update.download_id
+    assert data["added"][0]["status"] == download_update.status.value
+  # END test_send_downloads_added
+
+
+  def test_sync_sends_changes_since_seq(self, socketio_test_client: Callable[[str], SocketIOTestClient]):
+    """Validates that a client syncing from a known sequence number only gets the changes since then, and that an unknown epoch gets all downloads.
+
+    Args:
+      socketio_test_client (Callable[[str], SocketIOTestClient]): Fixture which provides a callable to create a SocketIO test client under the given namespace.
+    """
+
+    client = socketio_test_client(DownloadsSocket.NAMESPACE)
+    init = next(p for p in client.get_received(DownloadsSocket.NAMESPACE) if p["name"] == DownloadsSocket.DOWNLOAD_INIT_EVENT)
+    epoch, seq = init["args"][0]["epoch"], init["args"][0]["seq"]
+
+    namespace: DownloadsSocket = client.socketio.server.namespace_handlers[DownloadsSocket.NAMESPACE]
+    namespace.send_downloads_removed([3])
+    namespace.send_downloads_removed([4])
+    client.get_received(DownloadsSocket.NAMESPACE)
+
+    client.emit(DownloadsSocket.DOWNLOADS_SYNC_EVENT, { "epoch": epoch, "seq": seq + 1 }, namespace=DownloadsSocket.NAMESPACE)
+    received = client.get_received(DownloadsSocket.NAMESPACE)
+
+    assert [p["name"] for p in received] == [DownloadsSocket.DOWNLOADS_DELTA_EVENT]
+    assert received[0]["args"][0]["since"] == seq + 1
+    assert received[0]["args"][0]["seq"] == seq + 2
+    assert received[0]["args"][0]["removed"] == [4]
+
+    client.emit(DownloadsSocket.DOWNLOADS_SYNC_EVENT, { "epoch": "stale", "seq": seq }, namespace=DownloadsSocket.NAMESPACE)
+    received = client.get_received(DownloadsSocket.NAMESPACE)
+
+    assert [p["name"] for p in received] == [DownloadsSocket.DOWNLOAD_INIT_EVENT]
+    assert received[0]["args"][0]["seq"] == seq + 2
+  # END test_sync_sends_changes_since_seq
+
+
+  def test_snapshot_is_write_through(
+    self,
+    socketio_test_client: Callable[[str], SocketIOTestClient],
+    download_update: DownloadUpdate
+  ):
+    """Validates that connecting clients are sent downloads from the snapshot kept current by deltas, and that updates for removed downloads are dropped.
+
+    Args:
+      socketio_test_client (Callable[[str], SocketIOTestClient]): Fixture which provides a callable to create a SocketIO test client under the given namespace.
+      download_update (DownloadUpdate): A mock download update.
+    """
+
+    client = socketio_test_client(DownloadsSocket.NAMESPACE)
+    namespace: DownloadsSocket = client.socketio.server.namespace_handlers[DownloadsSocket.NAMESPACE]
+    namespace.send_downloads_added([download_update])
+
+    download_update.status = DownloadStatus.COMPLETED
+    namespace.send_download_update(download_update)
+
+    second_client = socketio_test_client(DownloadsSocket.NAMESPACE)
+    init = next(p for p in second_client.get_received(DownloadsSocket.NAMESPACE) if p["name"] == DownloadsSocket.DOWNLOAD_INIT_EVENT)
+
+    assert [d["status"] for d in init["args"][0]["downloads"]] == [DownloadStatus.COMPLETED.value]
+
+    namespace.send_downloads_removed([download_update.download_id])
+    second_client.get_received(DownloadsSocket.NAMESPACE)
+    namespace.send_download_update(download_update)
+
+    assert second_client.get_received(DownloadsSocket.NAMESPACE) == []
+  # END test_snapshot_is_write_through
+
 # END class TestDownloadsSocket
\ No newline at end of file
@@ -0,0 +1,20 @@
+import pytest
+from utils import get_source_id
+
+@pytest.mark.parametrize("url, expected", [
+  ("https://www.youtube.com/watch?v=azdwsXLmrHE", "youtube:azdwsXLmrHE"),
+  ("https://music.youtube.com/watch?v=azdwsXLmrHE&list=abc", "youtube:azdwsXLmrHE"),
+  ("https://youtu.be/azdwsXLmrHE?t=10", "youtube:azdwsXLmrHE"),
+  ("https://www.youtube.com/shorts/azdwsXLmrHE", "youtube:azdwsXLmrHE"),
+  ("https://soundcloud.com/queen/radio-ga-ga", "https://soundcloud.com/queen/radio-ga-ga")
+])
+def test_get_source_id(url: str, expected: str):
+  """Verifies that the get_source_id function maps the URL forms of a YouTube video to the same ID and leaves other URLs as they are.
+
+  Args:
+    url (str): The source URL.
+    expected (str): The expected source ID.
+  """
+
+  assert get_source_id(url) == expected
+# END test_get_source_id
@@ -6,6 +6,7 @@ from .track_bitrate import TrackBitrate
 from .track_codec import TrackCodec
 from .track_release_date import TrackReleaseDate
 from .enum_validate import enum_validate
+from .downloads_cursor import DownloadsCursor
 from . import reponses
 from . import requests
 from .new_download import NewDownload
\ No newline at end of file
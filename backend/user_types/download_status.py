@@ -4,13 +4,19 @@ class DownloadStatus(Enum):
   """Represents the possible statuses of a download.
 
   Attributes:
+    RESOLVING: Represents a download queued without a URL that is waiting for a YouTube source to be found.
     DOWNLOADING: Represents a download in progress.
+    TRANSCODING: Represents a download whose audio has been downloaded and is being transcoded to its codec and bitrate.
+    TAGGING: Represents a download whose file is ready and is having its metadata set.
     FAILED: Represents a failed download.
     QUEUED: Represents a download in the download queue.
     COMPLETED: Represents a completed download.
   """
 
+  RESOLVING = "resolving"
   DOWNLOADING = "downloading"
+  TRANSCODING = "transcoding"
+  TAGGING = "tagging"
   FAILED = "failed"
   QUEUED = "queued"
   COMPLETED = "completed"
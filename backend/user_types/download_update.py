@@ -2,6 +2,7 @@ from .download_status import DownloadStatus
 from .track_artist_names import TrackArtistNames
 from .track_codec import TrackCodec
 from .track_bitrate import TrackBitrate
+from typing import Self
 
 class DownloadUpdate:
   """A class that contains download update data for a track download.
@@ -41,6 +42,43 @@ class DownloadUpdate:
   status_msg: str | None
 
 
+  @classmethod
+  def from_row(cls, row: dict) -> Self:
+    """Creates a download update from a download selected from the database with its metadata.
+
+    Args:
+      row (dict): The download's row data, as returned by the `Download` database model.
+
+    Returns:
+      DownloadUpdate: The download update.
+    """
+
+    # imported here since the disk package depends on these types
+    import disk
+
+    codec = TrackCodec(row["codec"])
+
+    update = cls()
+    update.download_id = row["download_id"]
+    update.status = DownloadStatus(row["status"])
+    update.artist_names = TrackArtistNames([row["main_artist"], *row["other_artists"]])
+    update.track_name = row["track_name"]
+    update.codec = codec
+    update.bitrate = TrackBitrate(row["bitrate"])
+    update.url = row["url"]
+    update.download_path = disk.Track.build_path(row["download_dir"], row["filename"], codec)
+    update.created_at = row["created_at"]
+    update.total_bytes = row["total_bytes"]
+    update.downloaded_bytes = row["downloaded_bytes"]
+    update.speed = row["speed"]
+    update.eta = row["eta"]
+    update.terminated_at = row["terminated_at"]
+    update.status_msg = row["status_msg"]
+
+    return update
+  # END from_row
+
+
   def get_serializable(self) -> dict:
     """Returns the class attributes as a serializable dictionary.
 
@@ -0,0 +1,64 @@
+import base64, binascii, json
+from typing import Self
+
+class DownloadsCursor:
+  """A keyset pagination cursor pointing at the last download of a page of downloads, ordered by creation time then ID.
+
+  Attributes:
+    created_at (str): The creation timestamp of the last download on the page.
+    download_id (int): The ID of the last download on the page.
+  """
+
+  created_at: str
+  download_id: int
+
+
+  def __init__(self, created_at: str, download_id: int):
+    self.created_at = created_at
+    self.download_id = download_id
+  # END __init__
+
+
+  def encode(self) -> str:
+    """Encodes the cursor as an opaque URL-safe string to send to clients.
+
+    Returns:
+      str: The encoded cursor.
+    """
+
+    data = json.dumps([self.created_at, self.download_id], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+  # END encode
+
+
+  @classmethod
+  def decode(cls, value: str) -> Self | None:
+    """Decodes a cursor that was previously sent to a client.
+
+    Args:
+      value (str): The encoded cursor.
+
+    Returns:
+      DownloadsCursor | None: The cursor, or None if the value is not a valid cursor.
+    """
+
+    try:
+      padded = value + "=" * (-len(value) % 4)
+      data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+      return None
+
+    if (
+      not isinstance(data, list)
+      or len(data) != 2
+      or not isinstance(data[0], str)
+      or not isinstance(data[1], int)
+      or isinstance(data[1], bool)
+    ):
+      return None
+
+    return cls(data[0], data[1])
+  # END decode
+
+# END class DownloadsCursor
@@ -15,7 +15,7 @@ class NewDownload:
     track_number (int | None): Track number metadata.
     disc_number (int | None): Disc number metadata.
     release_date (TrackReleaseDate | None): Track release date metadata.
-    url (str): The URL to use as the audio source for the track download.
+    url (str | None): The URL to use as the audio source for the track download, None to have the best YouTube search result used.
     download_dir (str): The directory where the associated audio file should be saved to.
     filename (str): The name of the file for the track.
     album_cover_path (str | None): The path to an album cover image file.
@@ -31,7 +31,7 @@ class NewDownload:
   track_number: int | None
   disc_number: int | None
   release_date: TrackReleaseDate | None
-  url: str
+  url: str | None
   download_dir: str
   album_cover_path: str | None
   genre: str | None
@@ -4,4 +4,7 @@ from .post_downloads_restart_response import PostDownloadsRestartResponse
 from .delete_downloads_response import DeleteDownloadsResponse
 from .get_spotify_api_auth_url import GetSpotifyApiAuthUrl
 from .post_spotify_api_auth_code_response import PostSpotifyApiAuthCodeResponse
-from .get_downloads_is_paused_response import GetDownloadsIsPausedResponse
\ No newline at end of file
+from .get_downloads_is_paused_response import GetDownloadsIsPausedResponse
+from .get_downloads_response import GetDownloadsResponse
+from .post_downloads_search_batch_response import PostDownloadsSearchBatchResponse
+from .post_downloads_retag_response import PostDownloadsRetagResponse
\ No newline at end of file
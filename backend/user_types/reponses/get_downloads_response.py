@@ -0,0 +1,52 @@
+from ..download_update import DownloadUpdate
+from ..downloads_cursor import DownloadsCursor
+
+class GetDownloadsResponse:
+  """Class that contains nested classes to be used as models for responses to the GET /downloads endpoint.
+  """
+
+  class BadRequest:
+    """Represents the response body for a 400 status code response to a GET /downloads request.
+
+    Attributes:
+      parameter (str): The first parameter that failed validation; will match one of the request parameter names.
+      message (str): A user-friendly message indicating the validation error.
+    """
+
+    parameter: str
+    message: str
+
+  # END class BadRequest
+
+
+  class Ok:
+    """Represents the response body for a 200 status code response to a GET /downloads request.
+
+    Attributes:
+      downloads (list[DownloadUpdate]): The page of downloads.
+      next_cursor (DownloadsCursor | None): The cursor to get the next page with, None if this is the last page.
+      counts (dict[str, int]): The total number of downloads per status.
+    """
+
+    downloads: list[DownloadUpdate]
+    next_cursor: DownloadsCursor | None
+    counts: dict[str, int]
+
+
+    def get_serializable(self):
+      """Returns the class attributes as a serializable dictionary.
+
+      Returns:
+        dict: The dictionary of class attributes.
+      """
+
+      return {
+        "downloads": [d.get_serializable() for d in self.downloads],
+        "next_cursor": self.next_cursor.encode() if self.next_cursor else None,
+        "counts": self.counts
+      }
+    # END get_serializable
+
+  # END class Ok
+
+# END class GetDownloadsResponse
@@ -0,0 +1,31 @@
+class PostDownloadsRetagResponse():
+  class BadRequest:
+    """Represents the response body for a 400 status code response to a POST /downloads/retag request.
+
+    Attributes:
+      field (str): The first field that failed request validation; will match a key in the JSON request body.
+      message (str): A user-friendly message indicating the validation error.
+    """
+  
+    field: str
+    message: str
+
+  # END class BadRequest
+
+
+  class Accepted:
+    """Represents the response body for a 202 status code response to a POST /downloads/retag request.
+
+    Attributes:
+      message (str): A user-friendly message.
+      retag_id (str): The ID the re-tag's progress is reported under over the socket.
+      track_count (int): The number of tracks queued to be re-tagged.
+    """
+
+    message: str
+    retag_id: str
+    track_count: int
+    
+  # END class Accepted
+
+# END class PostDownloadsRetagResponse
\ No newline at end of file
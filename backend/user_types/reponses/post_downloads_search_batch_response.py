@@ -0,0 +1,56 @@
+from ..download_search_result import DownloadSearchResult
+
+class PostDownloadsSearchBatchResponse:
+  """Class that contains nested classes to be used as models for responses to the POST /downloads/search/batch endpoint.
+  """
+
+  class BadRequest:
+    """Represents the response body for a 400 status code response to a POST /downloads/search/batch request.
+
+    Attributes:
+      field (str): The first field that failed request validation; will match a key in a query in the query list.
+      message (str): A user-friendly message indicating the validation error.
+      item_index (int | None): The index of the first query that caused validation to fail.
+    """
+
+    field: str
+    message: str
+    item_index: int | None
+
+  # END class BadRequest
+
+
+  class Item:
+    """Represents one line of the NDJSON body of a 200 status code response to a POST /downloads/search/batch request, sent as soon as the query's search completes.
+
+    Attributes:
+      item_index (int): The index of the query in the request.
+      status (int): 200 if the search succeeded, 500 otherwise.
+      results (list[DownloadSearchResult] | None): The search results if the search succeeded.
+      message (str | None): A user-friendly error message if the search failed.
+    """
+
+    item_index: int
+    status: int
+    results: list[DownloadSearchResult] | None
+    message: str | None
+
+
+    def get_serializable(self):
+      """Returns the class attributes as a serializable dictionary.
+
+      Returns:
+        dict: The dictionary of class attributes.
+      """
+
+      return {
+        "item_index": self.item_index,
+        "status": self.status,
+        "results": [r.__dict__ for r in self.results] if self.results is not None else None,
+        "message": self.message
+      }
+    # END get_serializable
+
+  # END class Item
+
+# END class PostDownloadsSearchBatchResponse
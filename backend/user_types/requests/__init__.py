@@ -2,4 +2,7 @@ from .post_downloads_request import PostDownloadsRequest
 from .get_downloads_search_request import GetDownloadsSearchRequest
 from .post_downloads_restart_request import PostDownloadsRestartRequest
 from .delete_downloads_request import DeleteDownloadsRequest
-from .post_spotify_api_auth_code_request import PostSpotifyApiAuthCodeRequest
\ No newline at end of file
+from .post_spotify_api_auth_code_request import PostSpotifyApiAuthCodeRequest
+from .get_downloads_request import GetDownloadsRequest
+from .post_downloads_search_batch_request import PostDownloadsSearchBatchRequest
+from .post_downloads_retag_request import PostDownloadsRetagRequest
\ No newline at end of file
@@ -0,0 +1,27 @@
+from ..download_status import DownloadStatus
+from ..track_codec import TrackCodec
+from ..downloads_cursor import DownloadsCursor
+from typing import Literal
+
+class GetDownloadsRequest:
+  """Type that represents validated request parameters sent with a request to endpoint GET /downloads.
+
+  Attributes:
+    statuses (list[DownloadStatus]): The statuses to filter downloads by, all statuses if empty.
+    codecs (list[TrackCodec]): The codecs to filter downloads by, all codecs if empty.
+    created_from (str | None): The earliest creation timestamp of downloads to include.
+    created_to (str | None): The latest creation timestamp of downloads to include.
+    order (Literal["asc", "desc"]): The order of downloads by creation time.
+    limit (int): The maximum number of downloads to return.
+    cursor (DownloadsCursor | None): The cursor of the previous page, None for the first page.
+  """
+
+  statuses: list[DownloadStatus]
+  codecs: list[TrackCodec]
+  created_from: str | None
+  created_to: str | None
+  order: Literal["asc", "desc"]
+  limit: int
+  cursor: DownloadsCursor | None
+
+# END class GetDownloadsRequest
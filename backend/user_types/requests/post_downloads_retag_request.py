@@ -0,0 +1,12 @@
+class PostDownloadsRetagRequest:
+  """Type that represents a validated request body to endpoint POST /downloads/retag.
+
+  Attributes:
+    download_ids (list[int] | None): The IDs of the downloads to re-tag, None if re-tagging by directory.
+    directory (str | None): The directory whose downloads, including those in subdirectories, to re-tag, None if re-tagging by IDs.
+  """
+  
+  download_ids: list[int] | None
+  directory: str | None
+  
+# END class PostDownloadsRetagRequest
\ No newline at end of file
@@ -0,0 +1,12 @@
+from .get_downloads_search_request import GetDownloadsSearchRequest
+
+class PostDownloadsSearchBatchRequest:
+  """Type that represents a validated request body to endpoint POST /downloads/search/batch.
+
+  Attributes:
+    queries (list[GetDownloadsSearchRequest]): The search queries, one per track.
+  """
+
+  queries: list[GetDownloadsSearchRequest]
+
+# END class PostDownloadsSearchBatchRequest
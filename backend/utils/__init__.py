@@ -1 +1,2 @@
-from .get_bin_dir import get_bin_dir
\ No newline at end of file
+from .get_bin_dir import get_bin_dir
+from .get_source_id import get_source_id
\ No newline at end of file
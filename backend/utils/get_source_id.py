@@ -0,0 +1,29 @@
+from urllib.parse import urlparse, parse_qs
+
+YOUTUBE_HOSTS = ("youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com")
+
+
+def get_source_id(url: str) -> str:
+  """Gets an ID for the video behind a source URL, so that different URLs of the same YouTube video map to the same ID.
+
+  Args:
+    url (str): The source URL.
+
+  Returns:
+    str: The YouTube video ID prefixed with "youtube:" if the URL is a YouTube video URL, the URL itself otherwise.
+  """
+  
+  parsed = urlparse(url.strip())
+  host = parsed.netloc.lower()
+  video_id = None
+
+  if host in YOUTUBE_HOSTS:
+    if parsed.path == "/watch":
+      video_id = (parse_qs(parsed.query).get("v") or [None])[0]
+    elif parsed.path.startswith(("/shorts/", "/embed/", "/live/")):
+      video_id = parsed.path.split("/")[2]
+  elif host == "youtu.be":
+    video_id = parsed.path.lstrip("/").split("/")[0]
+
+  return f"youtube:{video_id}" if video_id else url.strip()
+# END get_source_id
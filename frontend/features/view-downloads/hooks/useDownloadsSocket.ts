@@ -1,6 +1,11 @@
 import { useState, useEffect } from "react";
 import downloadsSocket from "../services/downloadsSocket";
-import type { DownloadUpdate, DownloadInitData } from "../types";
+import type {
+  DownloadUpdate,
+  DownloadInitData,
+  DownloadsDeltaData,
+  DownloadsSyncData,
+} from "../types";
 
 /**
  * Return type for the useDownloadsSocket hook.
@@ -22,7 +27,7 @@ export interface UseDownloadsSocketReturn {
   queued: DownloadUpdate[];
 
   /**
-   * Update data for all downloads currently in progress.
+   * Update data for all downloads currently in progress, including those being transcoded.
    */
   downloading: DownloadUpdate[];
 }
@@ -40,6 +45,12 @@ export default function useDownloadsSocket(): UseDownloadsSocketReturn {
   useEffect(() => {
     const socket = downloadsSocket();
 
+    // the last event applied, sent on reconnect so only missed changes are resent
+    let synced: DownloadsSyncData | null = null;
+    let syncing = false;
+
+    socket.auth = (cb) => cb(synced ?? {});
+
     socket.on("download_init", (data: DownloadInitData) => {
       const downloadsMap: { [key: number]: DownloadUpdate } = {};
 
@@ -47,11 +58,43 @@ export default function useDownloadsSocket(): UseDownloadsSocketReturn {
         downloadsMap[download.download_id] = download;
       });
 
+      synced = { epoch: data.epoch, seq: data.seq };
+      syncing = false;
       setAllDownloads(downloadsMap);
     });
 
-    socket.on("download_update", (data: DownloadUpdate) => {
-      setAllDownloads((v) => ({ ...v, [data.download_id]: data }));
+    socket.on("downloads_delta", (data: DownloadsDeltaData) => {
+      // the connection's initial reply hasn't arrived yet, it will include this delta
+      if (!synced) return;
+
+      if (data.epoch !== synced.epoch || data.since > synced.seq) {
+        // missed events, deltas until the reply are covered by it
+        if (!syncing) {
+          syncing = true;
+          socket.emit("downloads_sync", synced);
+        }
+
+        return;
+      }
+
+      if (data.since < synced.seq) return;
+
+      synced = { epoch: data.epoch, seq: data.seq };
+      syncing = false;
+
+      setAllDownloads((v) => {
+        const downloadsMap = { ...v };
+
+        [...data.added, ...data.changed].forEach((download) => {
+          downloadsMap[download.download_id] = download;
+        });
+
+        data.removed.forEach((downloadId) => {
+          delete downloadsMap[downloadId];
+        });
+
+        return downloadsMap;
+      });
     });
 
     socket.connect();
@@ -74,12 +117,15 @@ export default function useDownloadsSocket(): UseDownloadsSocketReturn {
         completed.push(downloadsList[i]);
         break;
       case "downloading":
+      case "transcoding":
+      case "tagging":
         downloading.push(downloadsList[i]);
         break;
       case "failed":
         failed.push(downloadsList[i]);
         break;
       case "queued":
+      case "resolving":
         queued.push(downloadsList[i]);
         break;
     }
@@ -4,7 +4,14 @@ import type { AudioCodec, AudioBitrate } from "shared/config/audio";
 /**
  * Represents the possible statuses that a download can be in.
  */
-export type DownloadStatus = "failed" | "downloading" | "completed" | "queued";
+export type DownloadStatus =
+  | "failed"
+  | "downloading"
+  | "transcoding"
+  | "tagging"
+  | "completed"
+  | "queued"
+  | "resolving";
 
 /**
  * A download update pertaining to data that may be received from the backend real-time API about a download.
@@ -90,12 +97,72 @@ export interface DownloadUpdate {
  * Represents data emitted from the real-time API for the download_init event.
  */
 export interface DownloadInitData {
+  /**
+   * Identifies the backend's sequence of changes, changes when the backend restarts.
+   */
+  epoch: string;
+
+  /**
+   * The sequence number the downloads are current as of.
+   */
+  seq: number;
+
   /**
    * A list of all downloads in the application and their states.
    */
   downloads: DownloadUpdate[];
 }
 
+/**
+ * Represents data emitted from the real-time API for the downloads_delta event.
+ */
+export interface DownloadsDeltaData {
+  /**
+   * Identifies the backend's sequence of changes, changes when the backend restarts.
+   */
+  epoch: string;
+
+  /**
+   * The sequence number the delta follows on from.
+   */
+  since: number;
+
+  /**
+   * The sequence number of the delta.
+   */
+  seq: number;
+
+  /**
+   * The downloads that were just queued.
+   */
+  added: DownloadUpdate[];
+
+  /**
+   * The latest state of downloads that changed.
+   */
+  changed: DownloadUpdate[];
+
+  /**
+   * The IDs of downloads that were deleted.
+   */
+  removed: number[];
+}
+
+/**
+ * Represents the position in the backend's sequence of changes that a client has applied up to.
+ */
+export interface DownloadsSyncData {
+  /**
+   * The epoch of the last applied event.
+   */
+  epoch: string;
+
+  /**
+   * The sequence number of the last applied event.
+   */
+  seq: number;
+}
+
 /**
  * Represents the request body structure that must be sent with a restart download backend API request.
  */
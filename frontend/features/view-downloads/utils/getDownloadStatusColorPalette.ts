@@ -11,10 +11,13 @@ export default function getDownloadStatusColorPalette(status: DownloadStatus) {
     case "completed":
       return "green";
     case "downloading":
+    case "transcoding":
+    case "tagging":
       return "blue";
     case "failed":
       return "red";
     case "queued":
+    case "resolving":
       return "yellow";
   }
 }
@@ -65,9 +65,9 @@ export interface NewDownload {
   release_date: TrackReleaseDate | null;
 
   /**
-   * The source URL to use for the download.
+   * The source URL to use for the download, null to have the backend use the best YouTube search result.
    */
-  url: string;
+  url: string | null;
 
   /**
    * The target save directory of the download.